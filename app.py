@@ -23,9 +23,9 @@ import random
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import PAGE_TITLE, PAGE_ICON, AGENTS, SMS_TYPES, SIDEBAR_HIDE_CSS
+from config import PAGE_TITLE, PAGE_ICON, AGENT_NAMES, SMS_TYPES, SIDEBAR_HIDE_CSS
 from data_loader import load_all_data, get_date_range
-from channel_data_loader import load_agent_performance_data as load_ptab_data
+from channel_data_loader import load_agent_performance_data as load_ptab_data, clear_team_channel_snapshot
 
 # Custom CSS — Cyberpunk Dark Theme
 st.markdown("""
@@ -242,7 +242,7 @@ def apply_chart_theme(fig, height=350):
 def load_sample_data():
     """Load sample data matching actual Google Sheets structure"""
     dates = pd.date_range(start='2026-01-01', end='2026-01-07', freq='D')
-    agents = [a['name'] for a in AGENTS]
+    agents = list(AGENT_NAMES)
 
     # ============================================================
     # SECTION 1: WITH RUNNING ADS data
@@ -369,6 +369,7 @@ def main():
     # Force refresh button to clear cache and reload data
     if st.sidebar.button("🔄 Force Refresh", type="primary"):
         st.cache_data.clear()
+        clear_team_channel_snapshot()
         st.rerun()
 
     # Send Real-Time Report button
@@ -489,7 +490,7 @@ def main():
     # Agent filter - build from P-tab agents (title case) merged with legacy agents
     st.sidebar.subheader("Agent Filter")
     ptab_agents = sorted(ptab_daily['agent'].unique().tolist()) if not ptab_daily.empty and 'agent' in ptab_daily.columns else []
-    legacy_agents = [a['name'] for a in AGENTS]
+    legacy_agents = AGENT_NAMES
     # Merge: use P-tab names as primary, add any legacy-only agents
     ptab_upper = {a.upper() for a in ptab_agents}
     extra_legacy = [a for a in legacy_agents if a.upper() not in ptab_upper]
@@ -10,6 +10,7 @@ import streamlit as st
 from datetime import datetime, timedelta
 import calendar
 import re
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -71,12 +72,19 @@ from config import (
     UPDATED_BM_TAB,
     UPDATED_BM_COLUMNS,
 )
+from data_loader import PARQUET_CACHE_DIR
+from utils.metrics import safe_ratio
 
 
-def get_google_client():
+def get_google_client(warn=True):
     """
     Get authenticated Google Sheets client using service account.
 
+    Args:
+        warn: show the missing-credentials warning on the page (callers
+            outside a page script, or only probing for credentials, pass
+            False and only log it)
+
     Returns:
         gspread.Client: Authenticated gspread client
     """
@@ -101,7 +109,8 @@ def get_google_client():
             creds_file = os.path.join(os.path.dirname(__file__), FACEBOOK_ADS_CREDENTIALS_FILE)
             if not os.path.exists(creds_file):
                 print(f"[WARNING] Credentials file not found: {creds_file}")
-                st.warning("No Google credentials found. Set GOOGLE_CREDENTIALS env var or add credentials.json file.")
+                if warn:
+                    st.warning("No Google credentials found. Set GOOGLE_CREDENTIALS env var or add credentials.json file.")
                 return None
             creds = Credentials.from_service_account_file(creds_file, scopes=scopes)
             print("[OK] Using local credentials file")
@@ -519,8 +528,8 @@ def aggregate_daily(df):
     }).reset_index()
 
     # Calculate derived metrics
-    agg_df['cpr'] = agg_df.apply(lambda x: x['cost'] / x['register'] if x['register'] > 0 else 0, axis=1)
-    agg_df['roas'] = agg_df.apply(lambda x: x['deposit_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+    agg_df['cpr'] = safe_ratio(agg_df['cost'], agg_df['register'])
+    agg_df['roas'] = safe_ratio(agg_df['deposit_amount'], agg_df['cost'])
 
     agg_df = agg_df.sort_values('date_only')
     return agg_df
@@ -553,8 +562,8 @@ def aggregate_weekly(df):
     }).reset_index()
 
     # Calculate derived metrics
-    agg_df['cpr'] = agg_df.apply(lambda x: x['cost'] / x['register'] if x['register'] > 0 else 0, axis=1)
-    agg_df['roas'] = agg_df.apply(lambda x: x['deposit_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+    agg_df['cpr'] = safe_ratio(agg_df['cost'], agg_df['register'])
+    agg_df['roas'] = safe_ratio(agg_df['deposit_amount'], agg_df['cost'])
 
     agg_df = agg_df.sort_values('week_label')
     return agg_df
@@ -585,8 +594,8 @@ def aggregate_monthly(df):
     }).reset_index()
 
     # Calculate derived metrics
-    agg_df['cpr'] = agg_df.apply(lambda x: x['cost'] / x['register'] if x['register'] > 0 else 0, axis=1)
-    agg_df['roas'] = agg_df.apply(lambda x: x['deposit_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+    agg_df['cpr'] = safe_ratio(agg_df['cost'], agg_df['register'])
+    agg_df['roas'] = safe_ratio(agg_df['deposit_amount'], agg_df['cost'])
 
     # Convert period to string for display
     agg_df['month_str'] = agg_df['month'].astype(str)
@@ -616,8 +625,8 @@ def aggregate_by_channel(df):
     }).reset_index()
 
     # Calculate derived metrics
-    agg_df['cpr'] = agg_df.apply(lambda x: x['cost'] / x['register'] if x['register'] > 0 else 0, axis=1)
-    agg_df['roas'] = agg_df.apply(lambda x: x['deposit_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+    agg_df['cpr'] = safe_ratio(agg_df['cost'], agg_df['register'])
+    agg_df['roas'] = safe_ratio(agg_df['deposit_amount'], agg_df['cost'])
 
     return agg_df
 
@@ -883,8 +892,87 @@ def _build_channel_team_map_from_overall(all_rows):
     return channel_to_team
 
 
-@st.cache_data(ttl=120)  # Cache for 2 minutes (was 600 — caused stale Apr data)
+# Parquet snapshot of the last Team Channel load, shared across processes so a
+# restart (or a second worker) reuses a fresh load instead of re-reading the sheet.
+# A snapshot seeds a cache entry that then lives TEAM_CHANNEL_CACHE_TTL, so the two
+# TTLs together stay at the 2-minute staleness limit.
+TEAM_CHANNEL_SNAPSHOT_TTL = 30  # seconds
+TEAM_CHANNEL_CACHE_TTL = 120 - TEAM_CHANNEL_SNAPSHOT_TTL
+TEAM_CHANNEL_SNAPSHOT_PARTS = ('overall', 'daily', 'team_actual', 'channel_to_team')
+
+
+def _team_channel_snapshot_paths():
+    return {part: os.path.join(PARQUET_CACHE_DIR, f"team_channel_{part}.parquet")
+            for part in TEAM_CHANNEL_SNAPSHOT_PARTS}
+
+
+def _read_team_channel_snapshot():
+    """Team Channel data from the Parquet snapshot, or None if missing/stale/unreadable."""
+    paths = _team_channel_snapshot_paths()
+    now = time.time()
+    if not all(os.path.exists(p) and now - os.path.getmtime(p) < TEAM_CHANNEL_SNAPSHOT_TTL for p in paths.values()):
+        return None
+    try:
+        data = {part: pd.read_parquet(path) for part, path in paths.items()}
+    except Exception as e:
+        print(f"[WARN] Team Channel snapshot read failed: {e}")
+        return None
+    mapping = data['channel_to_team']
+    data['channel_to_team'] = dict(zip(mapping['channel'], mapping['team'])) if not mapping.empty else {}
+    return data
+
+
+def _write_team_channel_snapshot(data):
+    """Persist a successful Team Channel load; failures only cost the next cold start."""
+    frames = dict(data)
+    frames['channel_to_team'] = pd.DataFrame(
+        list(data['channel_to_team'].items()), columns=['channel', 'team'])
+    try:
+        os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+        for part, path in _team_channel_snapshot_paths().items():
+            frames[part].to_parquet(path, index=False, compression='zstd')
+    except Exception as e:
+        print(f"[WARN] Team Channel snapshot write failed: {e}")
+        clear_team_channel_snapshot()
+
+
+def clear_team_channel_snapshot():
+    """Delete the Team Channel Parquet snapshot."""
+    for path in _team_channel_snapshot_paths().values():
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[WARN] Could not remove {path}: {e}")
+
+
+# Set after the first Team Channel load in this process: later loads only run
+# after the in-memory entry expired or was cleared, and must re-read the sheet
+_team_channel_loaded = False
+
+
+@st.cache_data(ttl=TEAM_CHANNEL_CACHE_TTL)  # Snapshot + cache stay within 2 minutes (600 caused stale Apr data)
 def load_team_channel_data():
+    """
+    Load Team Channel data: on the first load in a process, the Parquet
+    snapshot when it is younger than TEAM_CHANNEL_SNAPSHOT_TTL; otherwise
+    a fresh sheet read (then snapshotted).
+
+    Returns:
+        dict: see _fetch_team_channel_data()
+    """
+    global _team_channel_loaded
+    data = None if _team_channel_loaded else _read_team_channel_snapshot()
+    _team_channel_loaded = True
+    if data is None:
+        data = _fetch_team_channel_data()
+        if not data['overall'].empty or not data['daily'].empty:
+            _write_team_channel_snapshot(data)
+    return data
+
+
+def _fetch_team_channel_data():
     """
     Load Team Channel data from Google Sheets.
 
@@ -1081,20 +1169,14 @@ def load_team_channel_data():
 
         if not daily_df.empty:
             daily_df['date'] = pd.to_datetime(daily_df['date'])
-            daily_df['cpr'] = daily_df.apply(
-                lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-            daily_df['cpfd'] = daily_df.apply(
-                lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-            daily_df['roas'] = daily_df.apply(
-                lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+            daily_df['cpr'] = safe_ratio(daily_df['cost'], daily_df['registrations'])
+            daily_df['cpfd'] = safe_ratio(daily_df['cost'], daily_df['first_recharge'])
+            daily_df['roas'] = safe_ratio(daily_df['total_amount'], daily_df['cost'])
 
         if not overall_df.empty:
-            overall_df['cpr'] = overall_df.apply(
-                lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-            overall_df['cpfd'] = overall_df.apply(
-                lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-            overall_df['roas'] = overall_df.apply(
-                lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+            overall_df['cpr'] = safe_ratio(overall_df['cost'], overall_df['registrations'])
+            overall_df['cpfd'] = safe_ratio(overall_df['cost'], overall_df['first_recharge'])
+            overall_df['roas'] = safe_ratio(overall_df['total_amount'], overall_df['cost'])
 
         print(f"[OK] Loaded {len(overall_records)} Team Channel overall records")
         print(f"[OK] Loaded {len(daily_records)} Team Channel daily records")
@@ -1119,8 +1201,9 @@ def load_team_channel_data():
 
 
 def refresh_team_channel_data():
-    """Clear Team Channel data cache."""
+    """Clear Team Channel data cache (in-memory and the Parquet snapshot)."""
     load_team_channel_data.clear()
+    clear_team_channel_snapshot()
 
 
 def refresh_counterpart_data():
@@ -1128,15 +1211,18 @@ def refresh_counterpart_data():
     load_counterpart_data.clear()
 
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
 def load_updated_accounts_data():
     """
     Load Updated Accounts data from separate spreadsheet with 3 tabs.
 
     Tabs: FB accounts, BM, Pages
 
+    Load failures are returned under 'error' for the caller to show, so it can
+    run on a worker thread once credentials are known to be present.
+
     Returns:
-        dict with 3 DataFrames: fb_accounts, bm, pages
+        dict with 3 DataFrames: fb_accounts, bm, pages (+ 'error' message on failure)
     """
     empty = {'fb_accounts': pd.DataFrame(), 'bm': pd.DataFrame(), 'pages': pd.DataFrame()}
     try:
@@ -1213,8 +1299,7 @@ def load_updated_accounts_data():
         print(f"[ERROR] Failed to load Updated Accounts data: {e}")
         import traceback
         traceback.print_exc()
-        st.error(f"Failed to load Updated Accounts: {e}")
-        return empty
+        return {**empty, 'error': f"Failed to load Updated Accounts: {e}"}
 
 
 def refresh_updated_accounts_data():
@@ -1266,7 +1351,7 @@ def refresh_updated_bm_data():
     load_updated_bm_data.clear()
 
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
 def load_created_assets_data():
     """
     Load Created Assets data from Channel ROI sheet.
@@ -1373,9 +1458,35 @@ def load_created_assets_data():
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=600)
+def load_created_assets_filter_options():
+    """
+    Sorted filter options for the Created Assets page, derived once per data load
+    instead of rescanning the creator/country columns on every rerun.
+
+    Returns:
+        dict with 'countries' (from fb_country and bm_country) and 'creators'
+    """
+    assets_df = load_created_assets_data()
+    if assets_df.empty:
+        return {'countries': [], 'creators': []}
+
+    all_countries = set()
+    for col in ['fb_country', 'bm_country']:
+        if col in assets_df.columns:
+            vals = assets_df[col].dropna().str.strip()
+            all_countries.update(v for v in vals.unique() if v)
+
+    return {
+        'countries': sorted(all_countries),
+        'creators': sorted(set(assets_df['creator'].str.strip().unique())),
+    }
+
+
 def refresh_created_assets_data():
     """Clear Created Assets data cache."""
     load_created_assets_data.clear()
+    load_created_assets_filter_options.clear()
     load_country_plan_data.clear()
 
 
@@ -1448,6 +1559,54 @@ def load_country_plan_data():
         return pd.DataFrame()
 
 
+# (count key, value column, condition column) - Gmail shares the FB account's condition
+CREATED_ASSET_ITEMS = [
+    ('gmail', 'gmail', 'fb_condition'),
+    ('fb_accounts', 'fb_username', 'fb_condition'),
+    ('fb_pages', 'fb_page', 'page_condition'),
+    ('bms', 'bm_name', 'bm_condition'),
+]
+
+
+def count_cell_items(values):
+    """Vectorized item count per cell: newline-separated entries that are non-blank and not '----'."""
+    lines = values.astype(str).reset_index(drop=True).str.split('\n').explode().str.strip()
+    valid = (lines != '') & (lines != '----')
+    return valid.groupby(level=0).sum().reindex(range(len(values)), fill_value=0).to_numpy()
+
+
+def _prepare_created_assets(assets_df, date_range=None):
+    """
+    Date-filter Created Assets rows and derive, in one vectorized pass, the
+    normalized creator and conditions plus per-cell item counts shared by
+    count_created_assets and count_assets_by_condition.
+    """
+    # Filter by date range if provided (skip if no valid dates exist)
+    if date_range and 'date' in assets_df.columns:
+        date_dt = pd.to_datetime(assets_df['date'], errors='coerce')
+        if date_dt.notna().any():
+            assets_df = assets_df[(date_dt >= date_range[0]) & (date_dt <= date_range[1])]
+
+    def _text(col):
+        if col in assets_df.columns:
+            return assets_df[col].astype(str).str.strip()
+        return pd.Series('', index=assets_df.index)
+
+    frame = pd.DataFrame({'creator': _text('creator').str.upper()}, index=assets_df.index)
+    for cond_col in ('fb_condition', 'page_condition', 'bm_condition'):
+        frame[cond_col] = _text(cond_col).str.upper()
+    for key, val_col, _ in CREATED_ASSET_ITEMS:
+        values = _text(val_col)
+        frame[key] = count_cell_items(values)
+        frame[f'{key}_present'] = ((values != '') & (values != '----')).to_numpy()
+
+    # Skip blank creators and continuation rows (blank creator in column C)
+    keep = frame['creator'] != ''
+    if 'has_creator' in assets_df.columns:
+        keep &= assets_df['has_creator'].fillna(True).astype(bool)
+    return frame[keep]
+
+
 def count_created_assets(assets_df, date_range=None):
     """Count created assets per agent from Created Assets data.
 
@@ -1462,62 +1621,26 @@ def count_created_assets(assets_df, date_range=None):
     if assets_df is None or assets_df.empty:
         return {}
 
-    # Filter by date range if provided (skip if no valid dates exist)
-    if date_range and 'date' in assets_df.columns:
-        df = assets_df.copy()
-        df['date_dt'] = pd.to_datetime(df['date'], errors='coerce')
-        has_valid_dates = df['date_dt'].notna().any()
-        if has_valid_dates:
-            df = df[(df['date_dt'] >= date_range[0]) & (df['date_dt'] <= date_range[1])]
-            assets_df = df
-
-    result = {}
-
-    for _, row in assets_df.iterrows():
-        creator = str(row.get('creator', '')).strip().upper()
-        if not creator:
-            continue
-
-        # Skip continuation rows (blank creator in column C)
-        if not row.get('has_creator', True):
-            continue
-
-        if creator not in result:
-            result[creator] = {
-                'gmail': 0, 'fb_accounts': 0, 'fb_pages': 0, 'bms': 0,
-                'total_accounts': 0, 'total_assets': 0,
-            }
-
-        # Count non-empty fields — only count if condition is ACTIVE
-        # Split newline-separated values (multiple items in one cell)
-        def count_items(val):
-            return len([v for v in val.split('\n') if v.strip() and v.strip() != '----'])
-
-        fb_cond = str(row.get('fb_condition', '')).strip().upper()
-        page_cond = str(row.get('page_condition', '')).strip().upper()
-        bm_cond = str(row.get('bm_condition', '')).strip().upper()
-
-        # Gmail uses FB condition (same account row)
-        gmail_v = str(row.get('gmail', '')).strip()
-        if gmail_v and gmail_v != '----' and fb_cond == 'ACTIVE':
-            result[creator]['gmail'] += count_items(gmail_v)
-        fb_v = str(row.get('fb_username', '')).strip()
-        if fb_v and fb_v != '----' and fb_cond == 'ACTIVE':
-            result[creator]['fb_accounts'] += count_items(fb_v)
-        page_v = str(row.get('fb_page', '')).strip()
-        if page_v and page_v != '----' and page_cond == 'ACTIVE':
-            result[creator]['fb_pages'] += count_items(page_v)
-        bm_v = str(row.get('bm_name', '')).strip()
-        if bm_v and bm_v != '----' and bm_cond in ('ACTIVE', 'AVAILABLE'):
-            result[creator]['bms'] += count_items(bm_v)
+    frame = _prepare_created_assets(assets_df, date_range)
+    if frame.empty:
+        return {}
 
-    # Calculate totals
-    for name in result:
-        r = result[name]
-        r['total_accounts'] = r['gmail'] + r['fb_accounts']  # for account_dev
-        r['total_assets'] = r['fb_pages'] + r['bms']         # for profile_dev
+    # Only count assets whose condition is ACTIVE (BMs also count AVAILABLE)
+    fb_active = frame['fb_condition'] == 'ACTIVE'
+    active = {
+        'gmail': fb_active,
+        'fb_accounts': fb_active,
+        'fb_pages': frame['page_condition'] == 'ACTIVE',
+        'bms': frame['bm_condition'].isin(('ACTIVE', 'AVAILABLE')),
+    }
+    counts = pd.DataFrame({'creator': frame['creator']})
+    for key, mask in active.items():
+        counts[key] = frame[key].where(mask, 0)
 
-    return result
+    result = counts.groupby('creator', sort=False).sum()
+    result['total_accounts'] = result['gmail'] + result['fb_accounts']  # for account_dev
+    result['total_assets'] = result['fb_pages'] + result['bms']         # for profile_dev
+    return result.astype(int).to_dict('index')
 
 
 def count_assets_by_condition(assets_df, date_range=None):
@@ -1535,54 +1658,20 @@ def count_assets_by_condition(assets_df, date_range=None):
     if assets_df is None or assets_df.empty:
         return {}
 
-    if date_range and 'date' in assets_df.columns:
-        df = assets_df.copy()
-        df['date_dt'] = pd.to_datetime(df['date'], errors='coerce')
-        if df['date_dt'].notna().any():
-            df = df[(df['date_dt'] >= date_range[0]) & (df['date_dt'] <= date_range[1])]
-            assets_df = df
-
-    result = {}
-
-    def _count_items(val):
-        return len([v for v in val.split('\n') if v.strip() and v.strip() != '----'])
-
-    def _ensure(agent):
-        if agent not in result:
-            result[agent] = {
-                'gmail': {}, 'fb_accounts': {}, 'fb_pages': {}, 'bms': {},
-            }
+    frame = _prepare_created_assets(assets_df, date_range)
+    result = {
+        creator: {'gmail': {}, 'fb_accounts': {}, 'fb_pages': {}, 'bms': {}}
+        for creator in frame['creator'].unique()
+    }
 
-    for _, row in assets_df.iterrows():
-        creator = str(row.get('creator', '')).strip().upper()
-        if not creator or not row.get('has_creator', True):
+    for key, _, cond_col in CREATED_ASSET_ITEMS:
+        present = frame[frame[f'{key}_present']]
+        if present.empty:
             continue
-
-        _ensure(creator)
-
-        fb_cond = str(row.get('fb_condition', '')).strip().upper() or 'UNKNOWN'
-        page_cond = str(row.get('page_condition', '')).strip().upper() or 'UNKNOWN'
-        bm_cond = str(row.get('bm_condition', '')).strip().upper() or 'UNKNOWN'
-
-        gmail_v = str(row.get('gmail', '')).strip()
-        if gmail_v and gmail_v != '----':
-            n = _count_items(gmail_v)
-            result[creator]['gmail'][fb_cond] = result[creator]['gmail'].get(fb_cond, 0) + n
-
-        fb_v = str(row.get('fb_username', '')).strip()
-        if fb_v and fb_v != '----':
-            n = _count_items(fb_v)
-            result[creator]['fb_accounts'][fb_cond] = result[creator]['fb_accounts'].get(fb_cond, 0) + n
-
-        page_v = str(row.get('fb_page', '')).strip()
-        if page_v and page_v != '----':
-            n = _count_items(page_v)
-            result[creator]['fb_pages'][page_cond] = result[creator]['fb_pages'].get(page_cond, 0) + n
-
-        bm_v = str(row.get('bm_name', '')).strip()
-        if bm_v and bm_v != '----':
-            n = _count_items(bm_v)
-            result[creator]['bms'][bm_cond] = result[creator]['bms'].get(bm_cond, 0) + n
+        conds = present[cond_col].replace('', 'UNKNOWN')
+        sums = present[key].groupby([present['creator'], conds], sort=False).sum()
+        for (creator, cond), n in sums.items():
+            result[creator][key][cond] = int(n)
 
     return result
 
@@ -1601,7 +1690,7 @@ def score_account_dev(total_accounts):
     return 1
 
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
 def load_ab_testing_data():
     """
     Load A/B Testing data from Text/AbTest tab in Channel ROI sheet.
@@ -2060,10 +2149,10 @@ def load_agent_performance_data():
             agg_dict['channel'] = 'first'
             daily_df = daily_df.groupby(['agent', 'date'], as_index=False).agg(agg_dict)
             # Recalculate derived metrics
-            daily_df['cpr'] = daily_df.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-            daily_df['cpd'] = daily_df.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-            daily_df['conv_rate'] = daily_df.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-            daily_df['ctr'] = daily_df.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
+            daily_df['cpr'] = safe_ratio(daily_df['cost'], daily_df['register'])
+            daily_df['cpd'] = safe_ratio(daily_df['cost'], daily_df['ftd'])
+            daily_df['conv_rate'] = safe_ratio(daily_df['ftd'], daily_df['register'], 100)
+            daily_df['ctr'] = safe_ratio(daily_df['clicks'], daily_df['impressions'], 100)
             daily_df['roas'] = 0  # will be recalculated downstream where needed
             if raw_count != len(daily_df):
                 print(f"[OK] Aggregated {raw_count} raw rows -> {len(daily_df)} unique agent-date rows")
@@ -2083,9 +2172,121 @@ def load_agent_performance_data():
         return empty
 
 
+# P-tab per-day counts - whole numbers well inside int32
+PTAB_COUNT_COLUMNS = ('register', 'ftd', 'impressions', 'clicks')
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_agent_daily_categorical(daily_df):
+    """
+    P-tab daily data with 'agent' and 'channel' as categoricals, so the Agent
+    Performance split and per-agent totals group on integer codes, and the
+    count columns as int32 (half the bytes per groupby/sum pass; money stays
+    float64 so totals round as before). The frame from
+    load_agent_performance_data() keeps its dtypes for the other pages, which
+    group and merge on it without observed=True.
+    Keyed on the loaded daily frame, so a reload or cache clear rebuilds it.
+    """
+    if daily_df.empty:
+        return daily_df
+    dtypes = {col: 'category' for col in ('agent', 'channel')}
+    dtypes.update({col: 'int32' for col in PTAB_COUNT_COLUMNS})
+    return daily_df.astype({col: dtype for col, dtype in dtypes.items() if col in daily_df.columns})
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_agent_daily_slices(daily_df):
+    """
+    P-tab daily data split per agent once, so selecting an agent is a dict
+    lookup instead of a boolean scan of the whole frame on every rerun.
+    Keyed on the loaded daily frame, so a reload or cache clear rebuilds it.
+
+    Args:
+        daily_df: load_agent_performance_data()['daily']
+
+    Returns:
+        dict: {agent name: daily DataFrame}
+    """
+    daily_df = load_agent_daily_categorical(daily_df)
+    if daily_df.empty or 'agent' not in daily_df.columns:
+        return {}
+    return dict(tuple(daily_df.groupby('agent', sort=False, observed=True)))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_all_agents_daily(daily_df):
+    """
+    P-tab daily data summed across all agents per date (the "All" agent view),
+    built once per load instead of on every rerun. Rates are recomputed from
+    the sums; ROAS is left at 0 for the combined view.
+    Keyed on the loaded daily frame, so a reload or cache clear rebuilds it.
+
+    Args:
+        daily_df: load_agent_performance_data()['daily']
+
+    Returns:
+        DataFrame with one row per date
+    """
+    daily_df = load_agent_daily_categorical(daily_df)
+    if daily_df.empty:
+        return pd.DataFrame()
+    # ARPPU is the mean of the positive values per date: mask the rest to NaN
+    # so the built-in mean (which skips NaN) replaces a per-group Python lambda
+    combined = daily_df.assign(arppu=daily_df['arppu'].where(daily_df['arppu'] > 0)).groupby('date').agg({
+        'cost': 'sum', 'register': 'sum', 'ftd': 'sum',
+        'impressions': 'sum', 'clicks': 'sum',
+        'arppu': 'mean',
+    }).reset_index()
+    combined['arppu'] = combined['arppu'].fillna(0)
+    combined['cpr'] = safe_ratio(combined['cost'], combined['register'])
+    combined['cpd'] = safe_ratio(combined['cost'], combined['ftd'])
+    combined['conv_rate'] = safe_ratio(combined['ftd'], combined['register'], 100)
+    combined['ctr'] = safe_ratio(combined['clicks'], combined['impressions'], 100)
+    combined['roas'] = 0
+    return combined
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_per_agent_totals(daily_df, start_date, end_date):
+    """
+    Per-agent P-tab totals for start_date..end_date (inclusive), with rates
+    recomputed from the sums, highest cost first. Cached per loaded daily
+    frame and date range, so reruns from other widgets don't re-aggregate.
+
+    Args:
+        daily_df: load_agent_performance_data()['daily']
+        start_date, end_date: inclusive date range
+
+    Returns:
+        DataFrame with one row per agent
+    """
+    daily_df = load_agent_daily_categorical(daily_df)
+    if daily_df.empty:
+        return pd.DataFrame()
+    in_range = daily_df[
+        (daily_df['date'] >= pd.Timestamp(start_date)) &
+        (daily_df['date'] <= pd.Timestamp(end_date))
+    ]
+    per_agent = in_range.groupby('agent', sort=False, observed=True).agg({
+        'cost': 'sum', 'register': 'sum', 'ftd': 'sum',
+        'impressions': 'sum', 'clicks': 'sum',
+        'arppu': 'mean',
+    }).reset_index()
+    per_agent['cpr'] = safe_ratio(per_agent['cost'], per_agent['register'])
+    per_agent['cpd'] = safe_ratio(per_agent['cost'], per_agent['ftd'])
+    per_agent['conv_rate'] = safe_ratio(per_agent['ftd'], per_agent['register'], 100)
+    per_agent['ctr'] = safe_ratio(per_agent['clicks'], per_agent['impressions'], 100)
+    per_agent['roas'] = safe_ratio(per_agent['arppu'] / KPI_PHP_USD_RATE, per_agent['cpd'])
+    return per_agent.sort_values('cost', ascending=False)
+
+
 def refresh_agent_performance_data():
     """Clear Agent Performance data cache."""
     load_agent_performance_data.clear()
+    load_agent_daily_categorical.clear()
+    load_agent_daily_slices.clear()
+    load_all_agents_daily.clear()
+    load_per_agent_totals.clear()
 
 
 @st.cache_data(ttl=600)
@@ -1,19 +1,25 @@
 """
 Configuration settings for BINGO365 Monitoring Dashboard
 """
+import functools
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Try to use Streamlit secrets (for Streamlit Cloud), fall back to env vars
-def get_secret(section, key, default=None):
-    """Get secret from Streamlit secrets or environment variable"""
+@functools.lru_cache(maxsize=None)
+def _get_secrets():
+    """Load Streamlit secrets once as a plain dict ({} outside Streamlit / without secrets.toml)"""
     try:
         import streamlit as st
-        return st.secrets.get(section, {}).get(key, default)
+        return st.secrets.to_dict()
     except:
-        return default
+        return {}
+
+# Try to use Streamlit secrets (for Streamlit Cloud), fall back to env vars
+def get_secret(section, key, default=None):
+    """Get secret from Streamlit secrets or environment variable"""
+    return _get_secrets().get(section, {}).get(key, default)
 
 # Database Configuration
 DATABASE_URL = os.getenv(
@@ -49,6 +55,10 @@ AGENTS = [
     {"name": "SHILA", "sheet_performance": "SHILA", "sheet_content": "Shila content"},
 ]
 
+# Precomputed lookups over the static agent list
+AGENT_NAMES = tuple(a["name"] for a in AGENTS)
+AGENT_BY_NAME = {a["name"]: a for a in AGENTS}
+
 # Excluded from reports (boss accounts)
 EXCLUDED_PERSONS = ["JD"]
 
@@ -866,3 +876,23 @@ SIDEBAR_HIDE_CSS = """
     ::-webkit-scrollbar-thumb:hover { background: rgba(0,212,255,0.5); }
 </style>
 """
+
+# ============================================================
+# PLOTLY CHART CONFIG
+# ============================================================
+# Display-only dashboard charts: no modebar, so each chart ships less client UI per rerun
+PLOTLY_CHART_CONFIG = {'displayModeBar': False, 'responsive': True}
+
+# ============================================================
+# COMBINED PAGE CSS (sidebar/theme + section headers)
+# ============================================================
+# Built once at import so the combined tab pages inject a single style block per rerun
+SECTION_HEADER_CSS = """
+<style>
+    .section-header {
+        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+        color: white; padding: 15px; border-radius: 10px; margin: 20px 0 10px 0;
+    }
+</style>
+"""
+COMBINED_PAGE_CSS = SIDEBAR_HIDE_CSS + SECTION_HEADER_CSS
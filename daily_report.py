@@ -2,26 +2,70 @@
 Daily Report Generator for BINGO365 Monitoring
 Generates and sends daily reports to Telegram
 """
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from data_loader import load_agent_performance_data, load_agent_content_data, load_indian_promotion_content
+from data_loader import (
+    load_agent_performance_data, load_agent_content_data, load_indian_promotion_content,
+    load_all_agents_bulk, parquet_cache,
+)
 from channel_data_loader import (
     load_agent_performance_data as load_ptab_data,
     count_ab_testing, score_ab_testing,
     count_created_assets, score_account_dev,
 )
-from config import AGENTS, FACEBOOK_ADS_PERSONS, EXCLUDED_PERSONS, AGENT_PERFORMANCE_TABS
+from config import AGENTS, AGENT_NAMES, FACEBOOK_ADS_PERSONS, EXCLUDED_PERSONS, AGENT_PERFORMANCE_TABS, INDIAN_PROMOTION_AGENTS
+from utils.metrics import safe_ratio
 from telegram_reporter import TelegramReporter
 
+# Shared categorical dtype for agent_name - every per-agent frame uses the same
+# categories so concat keeps the column categorical (int8 codes, not strings).
+# Categories are sorted so groupby(sort=True) still orders agents alphabetically.
+AGENT_NAME_DTYPE = pd.CategoricalDtype(
+    categories=sorted(set(AGENT_NAMES) | set(INDIAN_PROMOTION_AGENTS))
+)
 
-def load_all_agent_data():
+
+# Report runs re-read unchanged sheets repeatedly - keep Parquet snapshots on disk
+load_agent_performance_snapshot = parquet_cache('performance', parts=3)(load_agent_performance_data)
+load_agent_content_snapshot = parquet_cache('content')(load_agent_content_data)
+
+
+@parquet_cache('bulk', parts=4, key='all_agents')
+def load_all_agents_bulk_snapshot():
     """
-    Load all data for all agents from Google Sheets
+    load_all_agents_bulk() flattened to one DataFrame per list so the batchGet
+    result can be persisted by parquet_cache.
+    Returns (None, None, None, None) when the batch is unavailable.
+    """
+    bulk = load_all_agents_bulk(AGENTS)
+    if bulk is None:
+        return None, None, None, None
+    return tuple(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame() for frames in bulk)
+
+
+def categorize_agent_names(frames):
+    """Cast agent_name to AGENT_NAME_DTYPE in-place for each DataFrame in the list"""
+    for df in frames:
+        if 'agent_name' not in df.columns:
+            continue
+        # Leave unknown agents as strings rather than silently turning them into NaN
+        if df['agent_name'].isin(AGENT_NAME_DTYPE.categories).all():
+            df['agent_name'] = df['agent_name'].astype(AGENT_NAME_DTYPE)
+    return frames
+
+
+def load_agent_data_per_sheet():
+    """
+    Load each agent's performance and content sheet concurrently.
+    Every sheet is an independent HTTP request, so the loads are overlapped
+    in a thread pool instead of running back to back.
 
     Returns:
         tuple: (all_ads, all_creative, all_sms, all_content) - lists of DataFrames
@@ -31,34 +75,58 @@ def load_all_agent_data():
     all_sms = []
     all_content = []
 
-    for agent in AGENTS:
-        # Load performance data (running ads, creative, sms)
-        try:
-            running_ads, creative, sms = load_agent_performance_data(
-                agent['name'],
-                agent['sheet_performance']
-            )
+    with ThreadPoolExecutor(max_workers=max(1, 2 * len(AGENTS))) as executor:
+        perf_futures = [
+            (agent, executor.submit(load_agent_performance_snapshot, agent['name'], agent['sheet_performance']))
+            for agent in AGENTS
+        ]
+        content_futures = [
+            (agent, executor.submit(load_agent_content_snapshot, agent['name'], agent['sheet_content']))
+            for agent in AGENTS
+        ]
+
+        # Collect in AGENTS order so the output lists stay deterministic
+        for agent, future in perf_futures:
+            # Load performance data (running ads, creative, sms)
+            try:
+                running_ads, creative, sms = future.result()
+
+                if running_ads is not None and not running_ads.empty:
+                    all_ads.append(running_ads)
+                if creative is not None and not creative.empty:
+                    all_creative.append(creative)
+                if sms is not None and not sms.empty:
+                    all_sms.append(sms)
+            except Exception as e:
+                print(f"Error loading performance data for {agent['name']}: {e}")
+
+        for agent, future in content_futures:
+            # Load content data
+            try:
+                content = future.result()
+
+                if content is not None and not content.empty:
+                    all_content.append(content)
+            except Exception as e:
+                print(f"Error loading content data for {agent['name']}: {e}")
 
-            if running_ads is not None and not running_ads.empty:
-                all_ads.append(running_ads)
-            if creative is not None and not creative.empty:
-                all_creative.append(creative)
-            if sms is not None and not sms.empty:
-                all_sms.append(sms)
-        except Exception as e:
-            print(f"Error loading performance data for {agent['name']}: {e}")
+    return all_ads, all_creative, all_sms, all_content
 
-        # Load content data
-        try:
-            content = load_agent_content_data(
-                agent['name'],
-                agent['sheet_content']
-            )
 
-            if content is not None and not content.empty:
-                all_content.append(content)
-        except Exception as e:
-            print(f"Error loading content data for {agent['name']}: {e}")
+def load_all_agent_data():
+    """
+    Load all data for all agents from Google Sheets
+
+    Returns:
+        tuple: (all_ads, all_creative, all_sms, all_content) - lists of DataFrames
+    """
+    # Single batchGet across every agent sheet (Parquet-cached like the per-sheet
+    # loads); falls back to per-sheet loads when the service account is unavailable
+    bulk = load_all_agents_bulk_snapshot()
+    if bulk[0] is not None:
+        all_ads, all_creative, all_sms, all_content = ([df] if not df.empty else [] for df in bulk)
+    else:
+        all_ads, all_creative, all_sms, all_content = load_agent_data_per_sheet()
 
     # Load Indian Promotion content (additional copywriting data)
     try:
@@ -69,9 +137,22 @@ def load_all_agent_data():
     except Exception as e:
         print(f"Error loading Indian Promotion data: {e}")
 
+    for frames in (all_ads, all_creative, all_sms, all_content):
+        categorize_agent_names(frames)
+
     return all_ads, all_creative, all_sms, all_content
 
 
+def date_range_mask(df, start_date, end_date):
+    """
+    Boolean mask of rows whose 'date' falls within [start_date, end_date].
+    Compares at datetime64[D] precision instead of materializing an
+    object-dtype column of datetime.date values.
+    """
+    days = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]')
+    return (days >= np.datetime64(start_date, 'D')) & (days <= np.datetime64(end_date, 'D'))
+
+
 def get_data_for_date_range(ads_list, creative_list, sms_list, content_list, start_date, end_date):
     """
     Filter data for a specific date range
@@ -91,27 +172,23 @@ def get_data_for_date_range(ads_list, creative_list, sms_list, content_list, sta
     if ads_list:
         ads_df = pd.concat(ads_list, ignore_index=True)
         if 'date' in ads_df.columns:
-            ads_df['date_only'] = pd.to_datetime(ads_df['date']).dt.date
-            ads_df = ads_df[(ads_df['date_only'] >= start_date) & (ads_df['date_only'] <= end_date)]
+            ads_df = ads_df[date_range_mask(ads_df, start_date, end_date)]
 
     if creative_list:
         creative_df = pd.concat(creative_list, ignore_index=True)
         if 'date' in creative_df.columns:
-            creative_df['date_only'] = pd.to_datetime(creative_df['date']).dt.date
-            creative_df = creative_df[(creative_df['date_only'] >= start_date) & (creative_df['date_only'] <= end_date)]
+            creative_df = creative_df[date_range_mask(creative_df, start_date, end_date)]
 
     if sms_list:
         sms_df = pd.concat(sms_list, ignore_index=True)
         if 'date' in sms_df.columns:
-            sms_df['date_only'] = pd.to_datetime(sms_df['date']).dt.date
-            sms_df = sms_df[(sms_df['date_only'] >= start_date) & (sms_df['date_only'] <= end_date)]
+            sms_df = sms_df[date_range_mask(sms_df, start_date, end_date)]
 
     if content_list:
         content_df = pd.concat(content_list, ignore_index=True)
         # Filter content by date if date column exists
         if 'date' in content_df.columns:
-            content_df['date_only'] = pd.to_datetime(content_df['date']).dt.date
-            content_df = content_df[(content_df['date_only'] >= start_date) & (content_df['date_only'] <= end_date)]
+            content_df = content_df[date_range_mask(content_df, start_date, end_date)]
 
     return ads_df, creative_df, sms_df, content_df
 
@@ -477,26 +554,23 @@ def generate_by_campaign_section(ad_accounts_df, target_date):
     if ad_accounts_df is None or ad_accounts_df.empty:
         return ""
 
-    df = ad_accounts_df.copy()
-    df['date_only'] = pd.to_datetime(df['date']).dt.date
-    t1_data = df[df['date_only'] == target_date]
+    t1_data = ad_accounts_df[date_range_mask(ad_accounts_df, target_date, target_date)]
 
     if t1_data.empty:
         return ""
 
     report = "📊 <b>BY CAMPAIGN (T+1)</b>\n"
 
-    for agent in sorted(t1_data['agent'].unique()):
-        agent_data = t1_data[t1_data['agent'] == agent].sort_values('cost', ascending=False)
+    # One groupby split (keys come out sorted) instead of a scan of the day's rows per agent
+    for agent, agent_data in t1_data.groupby('agent'):
+        agent_data = agent_data.sort_values('cost', ascending=False)
         total_cost = agent_data['cost'].sum()
 
         report += f"\n<b>{agent}</b> (${total_cost:,.2f})\n<pre>"
-        for _, row in agent_data.iterrows():
-            acct = row['ad_account']
-            cost = row['cost']
-            impr = int(row['impressions'])
-            clicks = int(row['clicks'])
-            ctr = row['ctr']
+        rows = agent_data[['ad_account', 'cost', 'impressions', 'clicks', 'ctr']].itertuples(index=False, name=None)
+        for acct, cost, impr, clicks, ctr in rows:
+            impr = int(impr)
+            clicks = int(clicks)
             acct_short = acct[:25] + '..' if len(acct) > 25 else acct
             report += f"  {acct_short}\n"
             report += f"    ${cost:,.2f} | {impr:,} imp | {clicks:,} clk | {ctr:.1f}%\n"
@@ -639,11 +713,17 @@ def check_running_ads(ads_list, target_date=None):
     if not ads_list:
         return False, pd.DataFrame()
 
-    ads_df = pd.concat(ads_list, ignore_index=True)
+    # Filter each agent frame to the target date first so concat only
+    # copies the (small) matching slices
+    # (dates are already datetime64 from the loader - compare at day precision)
+    target_day = np.datetime64(target_date, 'D')
+    filtered = [
+        df[df['date'].to_numpy(dtype='datetime64[D]') == target_day]
+        for df in ads_list if 'date' in df.columns
+    ]
 
-    if 'date' in ads_df.columns:
-        ads_df['date_only'] = pd.to_datetime(ads_df['date']).dt.date
-        target_ads = ads_df[ads_df['date_only'] == target_date]
+    if filtered:
+        target_ads = pd.concat(filtered, ignore_index=True)
 
         if 'total_ad' in target_ads.columns:
             total_ads = target_ads['total_ad'].sum()
@@ -652,101 +732,120 @@ def check_running_ads(ads_list, target_date=None):
     return False, pd.DataFrame()
 
 
-def generate_ads_report(ads_df, report_date):
-    """Generate report when ads are running"""
-    report = f"📊 <b>Advertiser KPI Report</b> - {report_date.strftime('%b %d, %Y')}\n\n"
-    report += "🎯 <b>RUNNING ADS SUMMARY</b>\n"
-    report += "<pre>"
-    report += f"{'Name':<10}{'Ads':>6}{'Impr':>10}{'Clicks':>8}{'CTR%':>7}\n"
-    report += "-" * 41 + "\n"
+def sum_daily_totals_by_agent(df, total_col):
+    """
+    Sum a daily-total column per agent in a single groupby pass.
+
+    The total is a merged cell repeated on every row of the same date, so the
+    first value per agent+date is taken before summing (avoids double-counting).
+    Without the total/date columns, the row count per agent is used instead.
 
-    total_ads_sum = 0
-    total_impressions = 0
-    total_clicks = 0
+    Returns:
+        Series: total per agent_name, sorted by agent
+    """
+    if total_col in df.columns and 'date' in df.columns:
+        daily_totals = df.groupby(['agent_name', df['date'].dt.normalize()], sort=True, observed=True)[total_col].first()
+        return daily_totals.groupby(level=0, sort=True, observed=True).sum()
+    return df.groupby('agent_name', sort=True, observed=True).size()
 
-    for agent_name in sorted(ads_df['agent_name'].unique()):
-        agent_data = ads_df[ads_df['agent_name'] == agent_name]
 
-        ads_count = int(agent_data['total_ad'].sum()) if 'total_ad' in agent_data.columns else 0
-        impressions = int(agent_data['impressions'].sum()) if 'impressions' in agent_data.columns else 0
-        clicks = int(agent_data['clicks'].sum()) if 'clicks' in agent_data.columns else 0
-        ctr = (clicks / impressions * 100) if impressions > 0 else 0
+def generate_ads_report(ads_df, report_date):
+    """Generate report when ads are running"""
+    parts = [f"📊 <b>Advertiser KPI Report</b> - {report_date.strftime('%b %d, %Y')}\n\n"]
+    parts.append("🎯 <b>RUNNING ADS SUMMARY</b>\n")
+    parts.append("<pre>")
+    parts.append(f"{'Name':<10}{'Ads':>6}{'Impr':>10}{'Clicks':>8}{'CTR%':>7}\n")
+    parts.append("-" * 41 + "\n")
+
+    # One groupby pass per metric column instead of a mask per agent
+    metric_cols = ['total_ad', 'impressions', 'clicks']
+    present_cols = [c for c in metric_cols if c in ads_df.columns]
+    agg = (
+        ads_df.groupby('agent_name', sort=True, observed=True)[present_cols].sum()
+        .reindex(columns=metric_cols, fill_value=0)
+    )
+    impr = agg['impressions'].to_numpy(dtype=float)
+    agg['ctr'] = np.divide(agg['clicks'].to_numpy(dtype=float) * 100, impr, out=np.zeros_like(impr), where=impr > 0)
 
-        total_ads_sum += ads_count
-        total_impressions += impressions
-        total_clicks += clicks
+    for agent_name, ads_count, impressions, clicks, ctr in agg.itertuples():
+        parts.append(f"{agent_name:<10}{int(ads_count):>6}{int(impressions):>10,}{int(clicks):>8,}{ctr:>6.1f}%\n")
 
-        report += f"{agent_name:<10}{ads_count:>6}{impressions:>10,}{clicks:>8,}{ctr:>6.1f}%\n"
+    # Totals in one vectorized reduction over the (tiny) aggregated frame
+    totals = agg[metric_cols].sum()
+    total_ads_sum = int(totals['total_ad'])
+    total_impressions = int(totals['impressions'])
+    total_clicks = int(totals['clicks'])
 
-    report += "-" * 41 + "\n"
+    parts.append("-" * 41 + "\n")
 
     overall_ctr = (total_clicks / total_impressions * 100) if total_impressions > 0 else 0
-    report += f"{'TOTAL':<10}{total_ads_sum:>6}{total_impressions:>10,}{total_clicks:>8,}{overall_ctr:>6.1f}%\n"
-    report += "</pre>\n"
+    parts.append(f"{'TOTAL':<10}{total_ads_sum:>6}{total_impressions:>10,}{total_clicks:>8,}{overall_ctr:>6.1f}%\n")
+    parts.append("</pre>\n")
 
-    return report
+    return "".join(parts)
 
 
 def generate_no_ads_report(creative_list, sms_list, content_list, report_date):
     """Generate report when no ads are running"""
-    report = f"📊 <b>Advertiser KPI Report</b> - {report_date.strftime('%b %d, %Y')}\n\n"
-    report += "⚠️ <b>No Running Ads Today</b>\n\n"
+    parts = [f"📊 <b>Advertiser KPI Report</b> - {report_date.strftime('%b %d, %Y')}\n\n"]
+    parts.append("⚠️ <b>No Running Ads Today</b>\n\n")
 
     # Creative Summary
     if creative_list:
         creative_df = pd.concat(creative_list, ignore_index=True)
-        report += "🎨 <b>CREATIVE</b>\n<pre>"
-        report += f"{'Name':<10}{'Total':>6}  {'Types'}\n"
-        report += "-" * 35 + "\n"
+        parts.append("🎨 <b>CREATIVE</b>\n<pre>")
+        parts.append(f"{'Name':<10}{'Total':>6}  {'Types'}\n")
+        parts.append("-" * 35 + "\n")
 
         total_creative = 0
-        for agent in sorted(creative_df['agent_name'].unique()):
-            agent_data = creative_df[creative_df['agent_name'] == agent]
-            # Group by date to avoid double-counting (creative_total is daily total)
-            if 'creative_total' in agent_data.columns and 'date' in agent_data.columns:
-                daily_totals = agent_data.groupby(agent_data['date'].dt.date)['creative_total'].first()
-                total = int(daily_totals.sum())
-            else:
-                total = len(agent_data)
+        agent_totals = sum_daily_totals_by_agent(creative_df, 'creative_total')
+        for agent, agent_data in creative_df.groupby('agent_name', sort=True, observed=True):
+            total = int(agent_totals[agent])
             total_creative += total
 
             types_list = agent_data['creative_type'].unique() if 'creative_type' in agent_data.columns else []
             types = ', '.join([str(t) for t in types_list[:2] if pd.notna(t)])
-            report += f"{agent:<10}{total:>6}  {types}\n"
+            parts.append(f"{agent:<10}{total:>6}  {types}\n")
 
-        report += "-" * 35 + "\n"
-        report += f"{'TOTAL':<10}{total_creative:>6}\n"
-        report += "</pre>\n\n"
+        parts.append("-" * 35 + "\n")
+        parts.append(f"{'TOTAL':<10}{total_creative:>6}\n")
+        parts.append("</pre>\n\n")
 
     # SMS Summary
     if sms_list:
         sms_df = pd.concat(sms_list, ignore_index=True)
-        report += "📱 <b>SMS</b>\n<pre>"
-        report += f"{'Name':<10}{'Total':>6}  {'Top Type'}\n"
-        report += "-" * 40 + "\n"
+        parts.append("📱 <b>SMS</b>\n<pre>")
+        parts.append(f"{'Name':<10}{'Total':>6}  {'Top Type'}\n")
+        parts.append("-" * 40 + "\n")
 
         total_sms = 0
-        for agent in sorted(sms_df['agent_name'].unique()):
-            agent_data = sms_df[sms_df['agent_name'] == agent]
-            # Group by date to avoid double-counting (sms_total is daily total)
-            if 'sms_total' in agent_data.columns and 'date' in agent_data.columns:
-                daily_totals = agent_data.groupby(agent_data['date'].dt.date)['sms_total'].first()
-                total = int(daily_totals.sum())
-            else:
-                total = len(agent_data)
+        agent_totals = sum_daily_totals_by_agent(sms_df, 'sms_total')
+
+        # Most frequent SMS type per agent, computed once for all agents: count
+        # each (agent, type), then keep the top count per agent - ties go to the
+        # smallest type, as Series.mode() did
+        if 'sms_type' in sms_df.columns:
+            type_counts = sms_df.groupby(['agent_name', 'sms_type'], observed=True).size().reset_index(name='n')
+            top_types = (
+                type_counts.sort_values(['n', 'sms_type'], ascending=[False, True], kind='stable')
+                .drop_duplicates('agent_name')
+                .set_index('agent_name')['sms_type']
+            )
+        else:
+            top_types = pd.Series(dtype=object)
+
+        for agent, total in agent_totals.items():
+            total = int(total)
             total_sms += total
 
-            if 'sms_type' in agent_data.columns:
-                top_type = agent_data['sms_type'].mode().iloc[0] if len(agent_data['sms_type'].mode()) > 0 else ''
-                top_type = str(top_type)[:20] + '...' if len(str(top_type)) > 20 else str(top_type)
-            else:
-                top_type = ''
+            top_type = str(top_types.get(agent, ''))
+            top_type = top_type[:20] + '...' if len(top_type) > 20 else top_type
 
-            report += f"{agent:<10}{total:>6}  {top_type}\n"
+            parts.append(f"{agent:<10}{total:>6}  {top_type}\n")
 
-        report += "-" * 40 + "\n"
-        report += f"{'TOTAL':<10}{total_sms:>6}\n"
-        report += "</pre>\n\n"
+        parts.append("-" * 40 + "\n")
+        parts.append(f"{'TOTAL':<10}{total_sms:>6}\n")
+        parts.append("</pre>\n\n")
 
     # Copywriting Summary - only Primary Text entries
     if content_list:
@@ -761,18 +860,18 @@ def generate_no_ads_report(creative_list, sms_list, content_list, report_date):
         if not primary_df.empty:
             total_primary = len(primary_df)
 
-            report += "📝 <b>COPYWRITING (Primary Text)</b>\n"
-            report += f"Total: <b>{total_primary}</b>\n\n"
+            parts.append("📝 <b>COPYWRITING (Primary Text)</b>\n")
+            parts.append(f"Total: <b>{total_primary}</b>\n\n")
 
-            report += "<pre>"
-            report += f"{'Name':<10}{'Posts':>6}\n"
-            report += "-" * 16 + "\n"
+            parts.append("<pre>")
+            parts.append(f"{'Name':<10}{'Posts':>6}\n")
+            parts.append("-" * 16 + "\n")
             for agent in sorted(primary_df['agent_name'].unique()):
                 agent_count = len(primary_df[primary_df['agent_name'] == agent])
-                report += f"{agent:<10}{agent_count:>6}\n"
-            report += "</pre>"
+                parts.append(f"{agent:<10}{agent_count:>6}\n")
+            parts.append("</pre>")
 
-    return report
+    return "".join(parts)
 
 
 def generate_ab_testing_section(ab_data):
@@ -956,8 +1055,8 @@ def generate_executive_summary(daily_df, target_date):
             cost=('cost', 'sum'), ftd=('ftd', 'sum')
         ).reset_index().set_index('agent')
 
-    agent_t1['conv'] = agent_t1.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agent_t1['cpa'] = agent_t1.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
+    agent_t1['conv'] = safe_ratio(agent_t1['ftd'], agent_t1['register'], 100)
+    agent_t1['cpa'] = safe_ratio(agent_t1['cost'], agent_t1['ftd'])
     agent_t1 = agent_t1.sort_values('ftd', ascending=False)
 
     table = []
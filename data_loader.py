@@ -5,8 +5,12 @@ Loads real data from Google Sheets with caching
 import pandas as pd
 import streamlit as st
 from datetime import datetime, timedelta
+import functools
+import glob
 import os
+import re
 import sys
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import (
@@ -126,187 +130,201 @@ def parse_creative_total(value, default=0):
     return default
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_agent_performance_data(agent_name, sheet_name):
+def parse_agent_performance_frame(df, agent_name):
     """
-    Load performance data (WITH RUNNING ADS + WITHOUT + SMS) from agent's sheet
+    Parse a raw agent performance sheet (header row already applied)
     Returns: running_ads_df, creative_df, sms_df
     """
-    try:
-        url = get_public_sheet_url(GOOGLE_SHEETS_ID, sheet_name)
+    if df.empty:
+        return None, None, None
 
-        # Read all data from sheet
-        df = pd.read_csv(url, header=0)  # Header is row 1 (index 0)
+    # Normalize agent name
+    normalized_agent = normalize_agent_name(agent_name)
+
+    # ============================================================
+    # SECTION 1: WITH RUNNING ADS (Columns A-N, indices 0-13)
+    # Column order: DATE, AMOUNT SPENT, TOTAL AD, CAMPAIGN, IMPRESSION,
+    #               CLICKS, CTR%, CPC, CPR, CONVERSION RATE,
+    #               REJECTED, DELETED, ACTIVE, REMARKS
+    # Note: Only rows with valid dates get performance data (no merging)
+    # ============================================================
+    running_ads_data = []
+    last_perf_date = None
+
+    for idx, row in df.iterrows():
+        date = parse_date(row.iloc[0] if len(row) > 0 else None)
+
+        # For running ads, only process rows with actual dates
+        # (performance data is per-date, not merged)
+        if not date:
+            continue
 
-        if df.empty:
-            return None, None, None
-
-        # Normalize agent name
-        normalized_agent = normalize_agent_name(agent_name)
-
-        # ============================================================
-        # SECTION 1: WITH RUNNING ADS (Columns A-N, indices 0-13)
-        # Column order: DATE, AMOUNT SPENT, TOTAL AD, CAMPAIGN, IMPRESSION,
-        #               CLICKS, CTR%, CPC, CPR, CONVERSION RATE,
-        #               REJECTED, DELETED, ACTIVE, REMARKS
-        # Note: Only rows with valid dates get performance data (no merging)
-        # ============================================================
-        running_ads_data = []
-        last_perf_date = None
-
-        for idx, row in df.iterrows():
-            date = parse_date(row.iloc[0] if len(row) > 0 else None)
-
-            # For running ads, only process rows with actual dates
-            # (performance data is per-date, not merged)
-            if not date:
-                continue
+        last_perf_date = date
+
+        running_ads_data.append({
+            'date': date,
+            'agent_name': normalized_agent,
+            'amount_spent': parse_numeric(row.iloc[1] if len(row) > 1 else 0),  # B - AMOUNT SPENT
+            'total_ad': int(parse_numeric(row.iloc[2] if len(row) > 2 else 0)),  # C - TOTAL AD
+            'campaign': str(row.iloc[3]) if len(row) > 3 and pd.notna(row.iloc[3]) else '',  # D - CAMPAIGN
+            'impressions': int(parse_numeric(row.iloc[4] if len(row) > 4 else 0)),  # E - IMPRESSION
+            'clicks': int(parse_numeric(row.iloc[5] if len(row) > 5 else 0)),  # F - CLICKS
+            'ctr_percent': parse_numeric(row.iloc[6] if len(row) > 6 else 0),  # G - CTR %
+            'cpc': parse_numeric(row.iloc[7] if len(row) > 7 else 0),  # H - CPC
+            'cpr': parse_numeric(row.iloc[8] if len(row) > 8 else 0),  # I - CPR
+            'conversion_rate': parse_numeric(row.iloc[9] if len(row) > 9 else 0),  # J - CONVERSION RATE
+            'rejected_count': int(parse_numeric(row.iloc[10] if len(row) > 10 else 0)),  # K - REJECTED
+            'deleted_count': int(parse_numeric(row.iloc[11] if len(row) > 11 else 0)),  # L - DELETED
+            'active_count': int(parse_numeric(row.iloc[12] if len(row) > 12 else 0)),  # M - ACTIVE
+            'ad_remarks': str(row.iloc[13]) if len(row) > 13 and pd.notna(row.iloc[13]) else '',  # N - REMARKS
+        })
+
+    # ============================================================
+    # SECTION 2: WITHOUT (Creative Work) (Columns O-T, indices 14-19)
+    # Column order: CREATIVE FOLDER, TYPE, TOTAL, CONTENT, CAPTION, REMARKS
+    # Note: Creative content can span multiple rows - rows without DATE inherit last valid date
+    # TOTAL column is also merged - inherit from last valid total
+    # ============================================================
+    creative_data = []
+    last_valid_date = None
+    last_creative_folder = ''
+    last_creative_type = ''
+    last_creative_total = 0  # Track last valid total for merged cells
+    default_date = datetime.now()  # Fallback for sheets with no dates
+
+    for idx, row in df.iterrows():
+        row_date = parse_date(row.iloc[0] if len(row) > 0 else None)
+
+        # Update tracking values if this row has a date
+        if row_date:
+            last_valid_date = row_date
+            # Also update folder/type/total if present on dated rows
+            folder = str(row.iloc[14]) if len(row) > 14 and pd.notna(row.iloc[14]) else ''
+            if folder and folder.strip() and folder != 'nan':
+                last_creative_folder = folder
+            ctype = str(row.iloc[15]) if len(row) > 15 and pd.notna(row.iloc[15]) else ''
+            if ctype and ctype.strip() and ctype != 'nan':
+                last_creative_type = ctype
+            # Update total if present on dated row
+            total_raw = row.iloc[16] if len(row) > 16 else None
+            if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
+                last_creative_total = parse_creative_total(total_raw)
 
-            last_perf_date = date
+        # Use last valid date for rows without dates, or default date if no dates at all
+        date_to_use = row_date if row_date else last_valid_date
+        if not date_to_use:
+            date_to_use = default_date  # Use today's date for sheets without any dates
 
-            running_ads_data.append({
-                'date': date,
+        creative_content = str(row.iloc[17]) if len(row) > 17 and pd.notna(row.iloc[17]) else ''  # R - CONTENT
+
+        # Get total from current row or inherit from last valid total
+        total_raw = row.iloc[16] if len(row) > 16 else None
+        if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
+            creative_total = parse_creative_total(total_raw)
+            last_creative_total = creative_total  # Update last valid total
+        else:
+            creative_total = last_creative_total  # Inherit from merged cell
+
+        # Only count creative work when actual content exists
+        has_content = creative_content and creative_content.strip() and creative_content != 'nan'
+
+        if has_content:
+            # Get folder/type from current row or use last valid
+            creative_folder_raw = str(row.iloc[14]) if len(row) > 14 and pd.notna(row.iloc[14]) else ''
+            if not creative_folder_raw or creative_folder_raw == 'nan':
+                creative_folder_raw = last_creative_folder
+            creative_type_raw = str(row.iloc[15]) if len(row) > 15 and pd.notna(row.iloc[15]) else ''
+            if not creative_type_raw or creative_type_raw == 'nan':
+                creative_type_raw = last_creative_type
+
+            # Normalize folder and type to title case
+            creative_folder = creative_folder_raw.strip().title() if creative_folder_raw else ''
+            creative_type = creative_type_raw.strip().upper() if creative_type_raw else ''
+
+            creative_data.append({
+                'date': date_to_use,
                 'agent_name': normalized_agent,
-                'amount_spent': parse_numeric(row.iloc[1] if len(row) > 1 else 0),  # B - AMOUNT SPENT
-                'total_ad': int(parse_numeric(row.iloc[2] if len(row) > 2 else 0)),  # C - TOTAL AD
-                'campaign': str(row.iloc[3]) if len(row) > 3 and pd.notna(row.iloc[3]) else '',  # D - CAMPAIGN
-                'impressions': int(parse_numeric(row.iloc[4] if len(row) > 4 else 0)),  # E - IMPRESSION
-                'clicks': int(parse_numeric(row.iloc[5] if len(row) > 5 else 0)),  # F - CLICKS
-                'ctr_percent': parse_numeric(row.iloc[6] if len(row) > 6 else 0),  # G - CTR %
-                'cpc': parse_numeric(row.iloc[7] if len(row) > 7 else 0),  # H - CPC
-                'cpr': parse_numeric(row.iloc[8] if len(row) > 8 else 0),  # I - CPR
-                'conversion_rate': parse_numeric(row.iloc[9] if len(row) > 9 else 0),  # J - CONVERSION RATE
-                'rejected_count': int(parse_numeric(row.iloc[10] if len(row) > 10 else 0)),  # K - REJECTED
-                'deleted_count': int(parse_numeric(row.iloc[11] if len(row) > 11 else 0)),  # L - DELETED
-                'active_count': int(parse_numeric(row.iloc[12] if len(row) > 12 else 0)),  # M - ACTIVE
-                'ad_remarks': str(row.iloc[13]) if len(row) > 13 and pd.notna(row.iloc[13]) else '',  # N - REMARKS
+                'creative_folder': creative_folder,
+                'creative_type': creative_type,
+                'creative_total': creative_total,  # Inherited from merged cell if empty
+                'creative_content': creative_content,
+                'caption': str(row.iloc[18]) if len(row) > 18 and pd.notna(row.iloc[18]) else '',  # S - CAPTION
+                'creative_remarks': str(row.iloc[19]) if len(row) > 19 and pd.notna(row.iloc[19]) else '',  # T - REMARKS
             })
 
-        # ============================================================
-        # SECTION 2: WITHOUT (Creative Work) (Columns O-T, indices 14-19)
-        # Column order: CREATIVE FOLDER, TYPE, TOTAL, CONTENT, CAPTION, REMARKS
-        # Note: Creative content can span multiple rows - rows without DATE inherit last valid date
-        # TOTAL column is also merged - inherit from last valid total
-        # ============================================================
-        creative_data = []
-        last_valid_date = None
-        last_creative_folder = ''
-        last_creative_type = ''
-        last_creative_total = 0  # Track last valid total for merged cells
-        default_date = datetime.now()  # Fallback for sheets with no dates
-
-        for idx, row in df.iterrows():
-            row_date = parse_date(row.iloc[0] if len(row) > 0 else None)
-
-            # Update tracking values if this row has a date
-            if row_date:
-                last_valid_date = row_date
-                # Also update folder/type/total if present on dated rows
-                folder = str(row.iloc[14]) if len(row) > 14 and pd.notna(row.iloc[14]) else ''
-                if folder and folder.strip() and folder != 'nan':
-                    last_creative_folder = folder
-                ctype = str(row.iloc[15]) if len(row) > 15 and pd.notna(row.iloc[15]) else ''
-                if ctype and ctype.strip() and ctype != 'nan':
-                    last_creative_type = ctype
-                # Update total if present on dated row
-                total_raw = row.iloc[16] if len(row) > 16 else None
-                if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
-                    last_creative_total = parse_creative_total(total_raw)
-
-            # Use last valid date for rows without dates, or default date if no dates at all
-            date_to_use = row_date if row_date else last_valid_date
-            if not date_to_use:
-                date_to_use = default_date  # Use today's date for sheets without any dates
-
-            creative_content = str(row.iloc[17]) if len(row) > 17 and pd.notna(row.iloc[17]) else ''  # R - CONTENT
-
-            # Get total from current row or inherit from last valid total
-            total_raw = row.iloc[16] if len(row) > 16 else None
+    # ============================================================
+    # SECTION 3: SMS (Columns U-W, indices 20-22)
+    # Column order: SMS TYPE, TOTAL, REMARKS
+    # Note: SMS data can span multiple rows - rows without DATE inherit last valid date
+    # TOTAL column is also merged - inherit from last valid total
+    # ============================================================
+    sms_data = []
+    last_sms_date = None
+    last_sms_total = 0  # Track last valid SMS total for merged cells
+
+    for idx, row in df.iterrows():
+        row_date = parse_date(row.iloc[0] if len(row) > 0 else None)
+
+        # Update last valid date if this row has a date
+        if row_date:
+            last_sms_date = row_date
+            # Update SMS total if present on dated row
+            total_raw = row.iloc[21] if len(row) > 21 else None
             if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
-                creative_total = parse_creative_total(total_raw)
-                last_creative_total = creative_total  # Update last valid total
-            else:
-                creative_total = last_creative_total  # Inherit from merged cell
-
-            # Only count creative work when actual content exists
-            has_content = creative_content and creative_content.strip() and creative_content != 'nan'
-
-            if has_content:
-                # Get folder/type from current row or use last valid
-                creative_folder_raw = str(row.iloc[14]) if len(row) > 14 and pd.notna(row.iloc[14]) else ''
-                if not creative_folder_raw or creative_folder_raw == 'nan':
-                    creative_folder_raw = last_creative_folder
-                creative_type_raw = str(row.iloc[15]) if len(row) > 15 and pd.notna(row.iloc[15]) else ''
-                if not creative_type_raw or creative_type_raw == 'nan':
-                    creative_type_raw = last_creative_type
-
-                # Normalize folder and type to title case
-                creative_folder = creative_folder_raw.strip().title() if creative_folder_raw else ''
-                creative_type = creative_type_raw.strip().upper() if creative_type_raw else ''
-
-                creative_data.append({
-                    'date': date_to_use,
-                    'agent_name': normalized_agent,
-                    'creative_folder': creative_folder,
-                    'creative_type': creative_type,
-                    'creative_total': creative_total,  # Inherited from merged cell if empty
-                    'creative_content': creative_content,
-                    'caption': str(row.iloc[18]) if len(row) > 18 and pd.notna(row.iloc[18]) else '',  # S - CAPTION
-                    'creative_remarks': str(row.iloc[19]) if len(row) > 19 and pd.notna(row.iloc[19]) else '',  # T - REMARKS
-                })
-
-        # ============================================================
-        # SECTION 3: SMS (Columns U-W, indices 20-22)
-        # Column order: SMS TYPE, TOTAL, REMARKS
-        # Note: SMS data can span multiple rows - rows without DATE inherit last valid date
-        # TOTAL column is also merged - inherit from last valid total
-        # ============================================================
-        sms_data = []
-        last_sms_date = None
-        last_sms_total = 0  # Track last valid SMS total for merged cells
-
-        for idx, row in df.iterrows():
-            row_date = parse_date(row.iloc[0] if len(row) > 0 else None)
-
-            # Update last valid date if this row has a date
-            if row_date:
-                last_sms_date = row_date
-                # Update SMS total if present on dated row
-                total_raw = row.iloc[21] if len(row) > 21 else None
-                if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
-                    last_sms_total = int(parse_numeric(total_raw))
-
-            # Use last valid date for rows without dates
-            date_to_use = row_date if row_date else last_sms_date
-            if not date_to_use:
-                continue
+                last_sms_total = int(parse_numeric(total_raw))
 
-            sms_type_raw = str(row.iloc[20]) if len(row) > 20 and pd.notna(row.iloc[20]) else ''  # U - SMS TYPE
+        # Use last valid date for rows without dates
+        date_to_use = row_date if row_date else last_sms_date
+        if not date_to_use:
+            continue
 
-            # Get total from current row or inherit from last valid total
-            total_raw = row.iloc[21] if len(row) > 21 else None
-            if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
-                sms_total = int(parse_numeric(total_raw))
-                last_sms_total = sms_total  # Update last valid total
-            else:
-                sms_total = last_sms_total  # Inherit from merged cell
+        sms_type_raw = str(row.iloc[20]) if len(row) > 20 and pd.notna(row.iloc[20]) else ''  # U - SMS TYPE
+
+        # Get total from current row or inherit from last valid total
+        total_raw = row.iloc[21] if len(row) > 21 else None
+        if pd.notna(total_raw) and str(total_raw).strip() and str(total_raw).strip() != 'nan':
+            sms_total = int(parse_numeric(total_raw))
+            last_sms_total = sms_total  # Update last valid total
+        else:
+            sms_total = last_sms_total  # Inherit from merged cell
+
+        if sms_type_raw and sms_type_raw.strip() and sms_type_raw != 'nan' and sms_total > 0:
+            # Normalize SMS type to title case to merge duplicates with different capitalization
+            sms_type = sms_type_raw.strip().title()
+            sms_data.append({
+                'date': date_to_use,
+                'agent_name': normalized_agent,
+                'sms_type': sms_type,
+                'sms_total': sms_total,  # Inherited from merged cell if empty
+                'sms_remarks': str(row.iloc[22]) if len(row) > 22 and pd.notna(row.iloc[22]) else '',  # W - REMARKS
+            })
+
+    running_ads_df = pd.DataFrame(running_ads_data) if running_ads_data else pd.DataFrame()
+    creative_df = pd.DataFrame(creative_data) if creative_data else pd.DataFrame()
+    sms_df = pd.DataFrame(sms_data) if sms_data else pd.DataFrame()
 
-            if sms_type_raw and sms_type_raw.strip() and sms_type_raw != 'nan' and sms_total > 0:
-                # Normalize SMS type to title case to merge duplicates with different capitalization
-                sms_type = sms_type_raw.strip().title()
-                sms_data.append({
-                    'date': date_to_use,
-                    'agent_name': normalized_agent,
-                    'sms_type': sms_type,
-                    'sms_total': sms_total,  # Inherited from merged cell if empty
-                    'sms_remarks': str(row.iloc[22]) if len(row) > 22 and pd.notna(row.iloc[22]) else '',  # W - REMARKS
-                })
+    # Store dates as datetime64[ns] once here so reports can compare them
+    # vectorized instead of re-parsing on every run
+    for frame in (running_ads_df, creative_df, sms_df):
+        if 'date' in frame.columns:
+            frame['date'] = pd.to_datetime(frame['date'], errors='coerce')
 
-        running_ads_df = pd.DataFrame(running_ads_data) if running_ads_data else pd.DataFrame()
-        creative_df = pd.DataFrame(creative_data) if creative_data else pd.DataFrame()
-        sms_df = pd.DataFrame(sms_data) if sms_data else pd.DataFrame()
+    return running_ads_df, creative_df, sms_df
 
-        return running_ads_df, creative_df, sms_df
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_agent_performance_data(agent_name, sheet_name):
+    """
+    Load performance data (WITH RUNNING ADS + WITHOUT + SMS) from agent's sheet
+    Returns: running_ads_df, creative_df, sms_df
+    """
+    try:
+        url = get_public_sheet_url(GOOGLE_SHEETS_ID, sheet_name)
+
+        # Read all data from sheet
+        df = pd.read_csv(url, header=0)  # Header is row 1 (index 0)
+
+        return parse_agent_performance_frame(df, agent_name)
 
     except Exception as e:
         st.warning(f"Could not load data for {agent_name}: {str(e)}")
@@ -335,90 +353,233 @@ def is_merged_header_row(row):
     return False
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_agent_content_data(agent_name, sheet_name):
+def parse_agent_content_frame(df, agent_name):
     """
-    Load content data from agent's content sheet
+    Parse a raw agent content sheet (read without header)
     Content sheet structure: DATE, TYPE, PRIMARY CONTENT, CONDITION, STATUS, blank, REMARK/S
     Note: First row may be malformed header with merged/concatenated cells
     Dates may be in m/d format without year and empty for continuation rows
     """
+    if df.empty:
+        return None
+
+    # Normalize agent name
+    normalized_agent = normalize_agent_name(agent_name)
+
+    content_data = []
+    last_valid_date = None
+    last_content_type = ''
+
+    for idx, row in df.iterrows():
+        # Skip malformed merged header rows (first few rows might be affected)
+        if idx < 3 and is_merged_header_row(row):
+            continue
+
+        # Skip header row with keywords
+        first_cell = str(row.iloc[0]) if len(row) > 0 and pd.notna(row.iloc[0]) else ''
+        if 'DATE' in first_cell.upper() and idx < 2:
+            continue
+
+        # Parse date - will return None for empty cells or malformed data
+        date = parse_date(row.iloc[0] if len(row) > 0 else None)
+
+        # Track last valid date for rows without dates (headlines under primary text)
+        if date:
+            last_valid_date = date
+        else:
+            date = last_valid_date
+
+        if not date:
+            continue
+
+        # Get content type - inherit from last row if empty
+        content_type_raw = str(row.iloc[1]) if len(row) > 1 and pd.notna(row.iloc[1]) else ''
+        if content_type_raw and content_type_raw.strip() and content_type_raw != 'nan':
+            # Normalize content type (Primary Text, Headline)
+            content_type_raw = content_type_raw.strip()
+            if 'primary' in content_type_raw.lower():
+                last_content_type = 'Primary Text'
+            elif 'headline' in content_type_raw.lower():
+                last_content_type = 'Headline'
+            else:
+                last_content_type = content_type_raw.title()
+
+        content_type = last_content_type
+
+        primary_content = str(row.iloc[2]) if len(row) > 2 and pd.notna(row.iloc[2]) else ''
+
+        # Skip if content looks like a header or is too long (concatenated)
+        if 'PRIMARY CONTENT' in primary_content.upper():
+            continue
+        if len(primary_content) > 1000:  # Likely concatenated merged cell data
+            continue
+
+        if primary_content and primary_content.strip() and primary_content != 'nan':
+            content_data.append({
+                'date': date,
+                'agent_name': normalized_agent,
+                'content_type': content_type,
+                'primary_content': primary_content.strip(),
+                'condition': str(row.iloc[3]).strip() if len(row) > 3 and pd.notna(row.iloc[3]) else '',
+                'status': str(row.iloc[4]).strip() if len(row) > 4 and pd.notna(row.iloc[4]) else '',
+                'primary_adjustment': str(row.iloc[5]).strip() if len(row) > 5 and pd.notna(row.iloc[5]) else '',
+                'remarks': str(row.iloc[6]).strip() if len(row) > 6 and pd.notna(row.iloc[6]) else '',
+            })
+
+    return pd.DataFrame(content_data) if content_data else pd.DataFrame()
+
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_agent_content_data(agent_name, sheet_name):
+    """
+    Load content data from agent's content sheet
+    See parse_agent_content_frame() for the sheet layout
+    """
     try:
         url = get_public_sheet_url(GOOGLE_SHEETS_ID, sheet_name)
 
         # Read all data without header - we'll parse manually due to malformed headers
         df = pd.read_csv(url, header=None)
 
-        if df.empty:
-            return None
+        return parse_agent_content_frame(df, agent_name)
 
-        # Normalize agent name
-        normalized_agent = normalize_agent_name(agent_name)
+    except Exception as e:
+        st.warning(f"Could not load content data for {agent_name}: {str(e)}")
+        return None
 
-        content_data = []
-        last_valid_date = None
-        last_content_type = ''
 
-        for idx, row in df.iterrows():
-            # Skip malformed merged header rows (first few rows might be affected)
-            if idx < 3 and is_merged_header_row(row):
-                continue
+# Local Parquet snapshots of sheet loads (used by the report scripts)
+PARQUET_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
 
-            # Skip header row with keywords
-            first_cell = str(row.iloc[0]) if len(row) > 0 and pd.notna(row.iloc[0]) else ''
-            if 'DATE' in first_cell.upper() and idx < 2:
-                continue
 
-            # Parse date - will return None for empty cells or malformed data
-            date = parse_date(row.iloc[0] if len(row) > 0 else None)
+def parquet_cache(kind, parts=1, ttl_minutes=15, key=None):
+    """
+    Decorator persisting a loader's DataFrame result(s) to
+    cache/{key}_{kind}[_{part}].parquet and reusing them while younger than
+    ttl_minutes. key defaults to the sheet_name of an (agent_name, sheet_name)
+    loader; loaders that aren't per-sheet pass a fixed key. Loaders returning a
+    tuple of DataFrames pass parts=N. Failed loads (None results) are never written.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            name = key if key is not None else args[1]
+            safe_name = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')
+            suffixes = [f"_{i}" for i in range(parts)] if parts > 1 else ['']
+            paths = [os.path.join(PARQUET_CACHE_DIR, f"{safe_name}_{kind}{sfx}.parquet") for sfx in suffixes]
 
-            # Track last valid date for rows without dates (headlines under primary text)
-            if date:
-                last_valid_date = date
-            else:
-                date = last_valid_date
+            try:
+                now = time.time()
+                if all(os.path.exists(p) and now - os.path.getmtime(p) < ttl_minutes * 60 for p in paths):
+                    frames = [pd.read_parquet(p) for p in paths]
+                    return tuple(frames) if parts > 1 else frames[0]
+            except Exception as e:
+                print(f"Parquet cache read failed for {name}: {e}")
 
-            if not date:
-                continue
+            result = func(*args)
 
-            # Get content type - inherit from last row if empty
-            content_type_raw = str(row.iloc[1]) if len(row) > 1 and pd.notna(row.iloc[1]) else ''
-            if content_type_raw and content_type_raw.strip() and content_type_raw != 'nan':
-                # Normalize content type (Primary Text, Headline)
-                content_type_raw = content_type_raw.strip()
-                if 'primary' in content_type_raw.lower():
-                    last_content_type = 'Primary Text'
-                elif 'headline' in content_type_raw.lower():
-                    last_content_type = 'Headline'
-                else:
-                    last_content_type = content_type_raw.title()
+            frames = result if parts > 1 else (result,)
+            if all(f is not None for f in frames):
+                try:
+                    os.makedirs(PARQUET_CACHE_DIR, exist_ok=True)
+                    for frame, path in zip(frames, paths):
+                        frame.to_parquet(path, index=False, compression='zstd')
+                    # Snapshots used to carry a _yyyymmdd stamp - drop those leftovers
+                    for old in glob.glob(os.path.join(PARQUET_CACHE_DIR, f"{safe_name}_{kind}*_{'[0-9]' * 8}.parquet")):
+                        os.remove(old)
+                except Exception as e:
+                    print(f"Parquet cache write failed for {name}: {e}")
 
-            content_type = last_content_type
+            return result
+        return wrapper
+    return decorator
 
-            primary_content = str(row.iloc[2]) if len(row) > 2 and pd.notna(row.iloc[2]) else ''
 
-            # Skip if content looks like a header or is too long (concatenated)
-            if 'PRIMARY CONTENT' in primary_content.upper():
-                continue
-            if len(primary_content) > 1000:  # Likely concatenated merged cell data
-                continue
+def _values_to_frame(rows, header):
+    """
+    Convert a Sheets API valueRange into a DataFrame shaped like pd.read_csv output.
+    The API trims trailing empty cells, so rows are padded and blanks become NaN.
+    """
+    if not rows:
+        return pd.DataFrame()
+
+    width = max(len(r) for r in rows)
+    padded = [list(r) + [''] * (width - len(r)) for r in rows]
 
-            if primary_content and primary_content.strip() and primary_content != 'nan':
-                content_data.append({
-                    'date': date,
-                    'agent_name': normalized_agent,
-                    'content_type': content_type,
-                    'primary_content': primary_content.strip(),
-                    'condition': str(row.iloc[3]).strip() if len(row) > 3 and pd.notna(row.iloc[3]) else '',
-                    'status': str(row.iloc[4]).strip() if len(row) > 4 and pd.notna(row.iloc[4]) else '',
-                    'primary_adjustment': str(row.iloc[5]).strip() if len(row) > 5 and pd.notna(row.iloc[5]) else '',
-                    'remarks': str(row.iloc[6]).strip() if len(row) > 6 and pd.notna(row.iloc[6]) else '',
-                })
+    if header:
+        df = pd.DataFrame(padded[1:], columns=padded[0])
+    else:
+        df = pd.DataFrame(padded)
 
-        return pd.DataFrame(content_data) if content_data else pd.DataFrame()
+    return df.mask(df == '')
+
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def load_all_agents_bulk(agents=None):
+    """
+    Load performance + content sheets for all agents with a single
+    spreadsheets.values.batchGet call instead of one request per sheet.
+
+    Requires the service account (see channel_data_loader.get_google_client),
+    and the main sheet (GOOGLE_SHEETS_ID) must be shared with it - otherwise
+    every call pays a failed batchGet before the per-sheet CSV fallback.
+
+    Returns: (all_ads, all_creative, all_sms, all_content) lists of DataFrames,
+             or None if the batch request is unavailable
+    """
+    if agents is None:
+        agents = AGENTS
+
+    try:
+        from channel_data_loader import get_google_client
+
+        # Report scripts call this outside a Streamlit page - log, don't st.warning
+        client = get_google_client(warn=False)
+        if client is None:
+            return None
+
+        def quote(sheet_name):
+            return "'" + sheet_name.replace("'", "''") + "'"
+
+        ranges = []
+        for agent in agents:
+            ranges.append(f"{quote(agent['sheet_performance'])}!A:W")
+            ranges.append(f"{quote(agent['sheet_content'])}!A:G")
+
+        # FORMATTED_VALUE keeps values identical to the public CSV export
+        # (e.g. "3.5%" for CTR) so the existing parsers apply unchanged
+        spreadsheet = client.open_by_key(GOOGLE_SHEETS_ID)
+        response = spreadsheet.values_batch_get(ranges, params={'valueRenderOption': 'FORMATTED_VALUE'})
+        value_ranges = response.get('valueRanges', [])
+
+        all_ads = []
+        all_creative = []
+        all_sms = []
+        all_content = []
+
+        # valueRanges come back in request order: performance, content per agent
+        for i, agent in enumerate(agents):
+            perf_rows = value_ranges[2 * i].get('values', []) if 2 * i < len(value_ranges) else []
+            content_rows = value_ranges[2 * i + 1].get('values', []) if 2 * i + 1 < len(value_ranges) else []
+
+            running_ads, creative, sms = parse_agent_performance_frame(
+                _values_to_frame(perf_rows, header=True), agent['name']
+            )
+            if running_ads is not None and not running_ads.empty:
+                all_ads.append(running_ads)
+            if creative is not None and not creative.empty:
+                all_creative.append(creative)
+            if sms is not None and not sms.empty:
+                all_sms.append(sms)
+
+            content = parse_agent_content_frame(_values_to_frame(content_rows, header=False), agent['name'])
+            if content is not None and not content.empty:
+                all_content.append(content)
+
+        return all_ads, all_creative, all_sms, all_content
 
     except Exception as e:
-        st.warning(f"Could not load content data for {agent_name}: {str(e)}")
+        print(f"Batch load of agent sheets failed: {e}")
         return None
 
 
@@ -1,7 +1,7 @@
 """
 Database schema and setup for BINGO365 Monitoring
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, Date, DateTime, Text, ForeignKey, Index
+from sqlalchemy import create_engine, text, Column, Integer, String, Float, Date, DateTime, Text, ForeignKey, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -55,8 +55,14 @@ class AdPerformance(Base):
 
     # Indexes
     __table_args__ = (
-        Index('idx_performance_agent_date', 'agent_id', 'date'),
         Index('idx_performance_date', 'date'),
+        # Covering index (Postgres 11+ INCLUDE) so per-agent daily summaries,
+        # newest first, are served by an index-only scan without heap fetches.
+        # Replaces idx_performance_agent_date (same leading columns)
+        Index(
+            'idx_perf_agent_date_covering', agent_id, date.desc(),
+            postgresql_include=['total_ad', 'impressions', 'clicks', 'ctr_percent'],
+        ),
     )
 
 
@@ -73,7 +79,7 @@ class AdContent(Base):
     status = Column(String(50))
     primary_adjustment = Column(Text)
     remarks = Column(Text)
-    content_hash = Column(String(64))  # SHA256 hash for quick duplicate detection
+    content_hash = Column(LargeBinary(32))  # Raw SHA256 digest (BYTEA) for quick duplicate detection
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -125,33 +131,89 @@ class DailyStats(Base):
     )
 
 
+# Process-wide engine + session factory, created on first use so importing
+# this module never opens a connection
+_ENGINE = None
+_SESSION_FACTORY = None
+
+
+def get_engine():
+    """Get the shared SQLAlchemy engine (pooled connections reused across sessions)"""
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = create_engine(
+            DATABASE_URL,
+            pool_size=10,
+            pool_pre_ping=True,  # drop connections closed by the server
+            pool_recycle=300,    # recycle before Postgres idle timeouts
+        )
+    return _ENGINE
+
+
 def init_database():
     """Initialize database and create tables"""
-    engine = create_engine(DATABASE_URL)
+    engine = get_engine()
     Base.metadata.create_all(engine)
+    # create_all never alters existing tables - bring deployed ones up to date
+    migrate_performance_indexes()
+    migrate_content_hash_to_binary()
     print("Database tables created successfully!")
     return engine
 
 
+def migrate_performance_indexes():
+    """Add the covering ad_performance index to existing tables and drop the plain (agent_id, date) one it replaces"""
+    engine = get_engine()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS idx_perf_agent_date_covering "
+            "ON ad_performance (agent_id, date DESC) "
+            "INCLUDE (total_ad, impressions, clicks, ctr_percent)"
+        ))
+        conn.execute(text("DROP INDEX IF EXISTS idx_performance_agent_date"))
+
+
+def migrate_content_hash_to_binary():
+    """Convert ad_content.content_hash from 64-char hex VARCHAR to raw 32-byte BYTEA (no-op once converted)"""
+    engine = get_engine()
+    with engine.begin() as conn:
+        data_type = conn.execute(text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'ad_content' AND column_name = 'content_hash'"
+        )).scalar()
+        if data_type != 'character varying':
+            return
+        conn.execute(text("DROP INDEX IF EXISTS idx_content_hash"))
+        conn.execute(text(
+            "ALTER TABLE ad_content ALTER COLUMN content_hash TYPE bytea "
+            "USING decode(content_hash, 'hex')"
+        ))
+        conn.execute(text("CREATE INDEX idx_content_hash ON ad_content (content_hash)"))
+    print("Migrated ad_content.content_hash to BYTEA")
+
+
 def get_session():
     """Get database session"""
-    engine = create_engine(DATABASE_URL)
-    Session = sessionmaker(bind=engine)
-    return Session()
+    global _SESSION_FACTORY
+    if _SESSION_FACTORY is None:
+        _SESSION_FACTORY = sessionmaker(bind=get_engine())
+    return _SESSION_FACTORY()
 
 
 def seed_agents():
     """Seed initial agent data"""
-    from config import AGENTS
+    from config import AGENT_NAMES
 
     session = get_session()
     try:
-        for agent_config in AGENTS:
-            existing = session.query(Agent).filter_by(name=agent_config["name"]).first()
-            if not existing:
-                agent = Agent(name=agent_config["name"])
-                session.add(agent)
-                print(f"Added agent: {agent_config['name']}")
+        # One SELECT for all existing names instead of a query per agent
+        existing = {name for (name,) in session.query(Agent.name).all()}
+        new_agents = [{"name": name} for name in AGENT_NAMES if name not in existing]
+        if new_agents:
+            # Plain INSERT of mappings - skips ORM instance-state tracking
+            session.bulk_insert_mappings(Agent, new_agents)
+            for row in new_agents:
+                print(f"Added agent: {row['name']}")
         session.commit()
         print("Agents seeded successfully!")
     except Exception as e:
@@ -4,6 +4,7 @@ Tabs: Overview, Individual Overall (P-tabs)
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -14,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import FACEBOOK_ADS_PERSONS, SIDEBAR_HIDE_CSS
 from channel_data_loader import (
     load_agent_performance_data as load_ptab_data, refresh_agent_performance_data,
+    load_agent_daily_slices, load_all_agents_daily, load_per_agent_totals,
 )
 
 # Apply shared sidebar hide CSS
@@ -25,6 +27,36 @@ PTAB_AGENT_MAP = {
     'SHILA': 'Shila', 'JASON': 'Jason', 'RON': 'Ron',
 }
 
+
+# Table column types, created at import instead of per rerun (passed as a copy -
+# st.dataframe adds its index entry to the dict). Values stay numeric and are
+# formatted in the browser instead of per-row f-strings.
+PER_AGENT_COLUMN_CONFIG = {
+    "Cost": st.column_config.NumberColumn(format="$ %.2f"),
+    "CPR": st.column_config.NumberColumn(format="$ %.2f"),
+    "Cost/FTD": st.column_config.NumberColumn(format="$ %.2f"),
+    "Impressions": st.column_config.NumberColumn(format="%d"),
+    "Clicks": st.column_config.NumberColumn(format="%d"),
+    "Conv %": st.column_config.NumberColumn(format="%.1f%%"),
+    "CTR": st.column_config.NumberColumn(format="%.2f%%"),
+    "ARPPU": st.column_config.NumberColumn(format="₱ %.2f"),
+    "ROAS": st.column_config.NumberColumn(format="%.2fx"),
+}
+
+DAILY_COLUMN_CONFIG = {
+    "date": st.column_config.DateColumn("date", format="MM/DD/YYYY"),
+    "cost": st.column_config.NumberColumn("Cost", format="$ %.2f"),
+    "cpr": st.column_config.NumberColumn("CPR", format="$ %.2f"),
+    "cpd": st.column_config.NumberColumn("Cost/FTD", format="$ %.2f"),
+    "conv_rate": st.column_config.NumberColumn("Conv %", format="%.2f%%"),
+    "impressions": st.column_config.NumberColumn("Impressions", format="%d"),
+    "clicks": st.column_config.NumberColumn("Clicks", format="%d"),
+    "ctr": st.column_config.NumberColumn("CTR", format="%.2f%%"),
+    "arppu": st.column_config.NumberColumn("ARPPU", format="₱ %.2f"),
+    "roas": "ROAS",
+}
+
+
 # Sidebar logo
 logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "logo.jpg")
 if os.path.exists(logo_path):
@@ -66,27 +98,14 @@ ptab_daily = ptab_all.get('daily', pd.DataFrame())
 if is_all_agents:
     # All agents: use all P-tab data
     ptab_agent = None  # not filtering by single agent
-    has_ptab = not ptab_daily.empty
-    agent_ptab_daily = ptab_daily.copy() if has_ptab else pd.DataFrame()
-    # Aggregate daily across all agents (sum per date)
-    if has_ptab:
-        agent_ptab_daily = agent_ptab_daily.groupby('date').agg({
-            'cost': 'sum', 'register': 'sum', 'ftd': 'sum',
-            'impressions': 'sum', 'clicks': 'sum',
-            'arppu': lambda x: x[x > 0].mean() if (x > 0).any() else 0,
-        }).reset_index()
-        # Recalculate derived metrics from summed values
-        agent_ptab_daily['cpr'] = agent_ptab_daily.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-        agent_ptab_daily['cpd'] = agent_ptab_daily.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-        agent_ptab_daily['conv_rate'] = agent_ptab_daily.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-        agent_ptab_daily['ctr'] = agent_ptab_daily.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
-        agent_ptab_daily['roas'] = 0
+    # Daily sums across all agents, aggregated once per load
+    agent_ptab_daily = load_all_agents_daily(ptab_daily)
+    has_ptab = not agent_ptab_daily.empty
 else:
     ptab_agent = PTAB_AGENT_MAP.get(selected_agent)
-    has_ptab = ptab_agent and not ptab_daily.empty and ptab_agent in ptab_daily['agent'].values
-    agent_ptab_daily = pd.DataFrame()
-    if has_ptab:
-        agent_ptab_daily = ptab_daily[ptab_daily['agent'] == ptab_agent].copy()
+    agent_slice = load_agent_daily_slices(ptab_daily).get(ptab_agent) if ptab_agent and not ptab_daily.empty else None
+    has_ptab = agent_slice is not None
+    agent_ptab_daily = agent_slice if has_ptab else pd.DataFrame()
 
 # Date range from P-tab
 if has_ptab:
@@ -112,16 +131,37 @@ else:
 
 # Apply date filter to P-tab data
 if has_ptab and not agent_ptab_daily.empty:
-    agent_ptab_daily = agent_ptab_daily[
-        (agent_ptab_daily['date'] >= pd.Timestamp(start_date)) &
-        (agent_ptab_daily['date'] <= pd.Timestamp(end_date))
-    ]
+    dates = agent_ptab_daily['date']
+    if dates.is_monotonic_increasing:
+        # The all-agents rollup and the per-agent slices come out date-ordered:
+        # two binary searches and a positional slice instead of two full masks
+        lo = dates.searchsorted(pd.Timestamp(start_date), side='left')
+        hi = dates.searchsorted(pd.Timestamp(end_date), side='right')
+        agent_ptab_daily = agent_ptab_daily.iloc[lo:hi]
+    else:
+        agent_ptab_daily = agent_ptab_daily[
+            (dates >= pd.Timestamp(start_date)) &
+            (dates <= pd.Timestamp(end_date))
+        ]
     has_ptab = not agent_ptab_daily.empty
 
 # Sidebar data info
 if has_ptab:
     st.sidebar.success(f"P-tab: {len(agent_ptab_daily)} days loaded")
 
+    # Period totals and rates for both tabs' KPI cards, one column-wise reduction
+    # (nansum keeps pandas' skip-NaN semantics)
+    total_cost, total_reg, total_ftd, total_impr, total_clicks = np.nansum(
+        agent_ptab_daily[['cost', 'register', 'ftd', 'impressions', 'clicks']].to_numpy(dtype=np.float64), axis=0)
+    total_reg, total_ftd, total_impr, total_clicks = int(total_reg), int(total_ftd), int(total_impr), int(total_clicks)
+    avg_cpr = total_cost / total_reg if total_reg > 0 else 0
+    avg_cpd = total_cost / total_ftd if total_ftd > 0 else 0
+    conv_rate = (total_ftd / total_reg * 100) if total_reg > 0 else 0
+    overall_ctr = (total_clicks / total_impr * 100) if total_impr > 0 else 0
+
+    # Date-ordered rows for both tabs' trend charts and the daily table
+    agent_daily = agent_ptab_daily.sort_values('date')
+
 # ============================================================
 # AGENT HEADER
 # ============================================================
@@ -152,15 +192,6 @@ with tab1:
     st.subheader("Quick Summary")
 
     if has_ptab:
-        total_cost = agent_ptab_daily['cost'].sum()
-        total_reg = int(agent_ptab_daily['register'].sum())
-        total_ftd = int(agent_ptab_daily['ftd'].sum())
-        total_impr = int(agent_ptab_daily['impressions'].sum())
-        total_clicks = int(agent_ptab_daily['clicks'].sum())
-        avg_cpr = total_cost / total_reg if total_reg > 0 else 0
-        avg_cpd = total_cost / total_ftd if total_ftd > 0 else 0
-        conv_rate = (total_ftd / total_reg * 100) if total_reg > 0 else 0
-
         c1, c2, c3, c4, c5, c6 = st.columns(6)
         c1.metric("Total Cost", f"${total_cost:,.2f}")
         c2.metric("Register", f"{total_reg:,}")
@@ -172,7 +203,7 @@ with tab1:
         c1, c2, c3 = st.columns(3)
         c1.metric("Impressions", f"{total_impr:,}")
         c2.metric("Clicks", f"{total_clicks:,}")
-        c3.metric("CTR", f"{(total_clicks / total_impr * 100) if total_impr > 0 else 0:.2f}%")
+        c3.metric("CTR", f"{overall_ctr:.2f}%")
     else:
         st.info("No P-tab data available.")
 
@@ -183,9 +214,8 @@ with tab1:
 
     fig = go.Figure()
     if has_ptab:
-        a_daily = agent_ptab_daily.sort_values('date')
-        fig.add_trace(go.Scatter(x=a_daily['date'], y=a_daily['cost'], name='Cost ($)', line=dict(color='#3498db', width=3), mode='lines+markers'))
-        fig.add_trace(go.Scatter(x=a_daily['date'], y=a_daily['ftd'], name='FTD', line=dict(color='#27ae60', width=3), mode='lines+markers', yaxis='y2'))
+        fig.add_trace(go.Scatter(x=agent_daily['date'], y=agent_daily['cost'], name='Cost ($)', line=dict(color='#3498db', width=3), mode='lines+markers'))
+        fig.add_trace(go.Scatter(x=agent_daily['date'], y=agent_daily['ftd'], name='FTD', line=dict(color='#27ae60', width=3), mode='lines+markers', yaxis='y2'))
         fig.update_layout(
             height=350,
             yaxis=dict(title='Cost ($)', side='left', rangemode='tozero'),
@@ -203,19 +233,7 @@ with tab5:
     st.subheader("📈 Individual Overall (P-tab)")
 
     if has_ptab:
-        agent_daily = agent_ptab_daily.sort_values('date').copy()
-
-        # KPI cards
-        total_cost = agent_daily['cost'].sum()
-        total_reg = int(agent_daily['register'].sum())
-        total_ftd = int(agent_daily['ftd'].sum())
-        avg_cpr = total_cost / total_reg if total_reg > 0 else 0
-        avg_cpd = total_cost / total_ftd if total_ftd > 0 else 0
-        conv_rate = (total_ftd / total_reg * 100) if total_reg > 0 else 0
-        total_impr = int(agent_daily['impressions'].sum())
-        total_clicks = int(agent_daily['clicks'].sum())
-        overall_ctr = (total_clicks / total_impr * 100) if total_impr > 0 else 0
-
+        # KPI cards (totals and rates computed once after the date filter)
         c1, c2, c3, c4, c5, c6 = st.columns(6)
         c1.metric("Cost", f"${total_cost:,.2f}")
         c2.metric("Register", f"{total_reg:,}")
@@ -239,22 +257,8 @@ with tab5:
         # Per-agent breakdown table when "All" selected
         if is_all_agents and not agent_ptab_daily.empty:
             st.subheader("Per Agent Breakdown")
-            # Use the unfiltered ptab_daily but apply date filter
-            filtered_ptab = ptab_daily[
-                (ptab_daily['date'] >= pd.Timestamp(start_date)) &
-                (ptab_daily['date'] <= pd.Timestamp(end_date))
-            ]
-            per_agent = filtered_ptab.groupby('agent').agg({
-                'cost': 'sum', 'register': 'sum', 'ftd': 'sum',
-                'impressions': 'sum', 'clicks': 'sum',
-                'arppu': 'mean',
-            }).reset_index()
-            per_agent['cpr'] = per_agent.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-            per_agent['cpd'] = per_agent.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-            per_agent['conv_rate'] = per_agent.apply(lambda r: (r['ftd'] / r['register'] * 100) if r['register'] > 0 else 0, axis=1)
-            per_agent['ctr'] = per_agent.apply(lambda r: (r['clicks'] / r['impressions'] * 100) if r['impressions'] > 0 else 0, axis=1)
-            per_agent['roas'] = per_agent.apply(lambda r: (r['arppu'] / 57.7 / r['cpd']) if r['cpd'] > 0 else 0, axis=1)
-            per_agent = per_agent.sort_values('cost', ascending=False)
+            # Totals over the unfiltered P-tab data for the selected dates, cached per range
+            per_agent = load_per_agent_totals(ptab_daily, start_date, end_date)
 
             # Chart: cost by agent
             fig = px.bar(per_agent.sort_values('cost', ascending=True), y='agent', x='cost', orientation='h',
@@ -262,24 +266,15 @@ with tab5:
             fig.update_layout(height=max(300, len(per_agent) * 45), showlegend=False, yaxis_title='')
             st.plotly_chart(fig, use_container_width=True)
 
-            # Format for display
-            pa_disp = per_agent.copy()
-            pa_disp['cost'] = pa_disp['cost'].apply(lambda x: f"${x:,.2f}")
-            pa_disp['cpr'] = pa_disp['cpr'].apply(lambda x: f"${x:,.2f}")
-            pa_disp['cpd'] = pa_disp['cpd'].apply(lambda x: f"${x:,.2f}")
-            pa_disp['impressions'] = pa_disp['impressions'].apply(lambda x: f"{int(x):,}")
-            pa_disp['clicks'] = pa_disp['clicks'].apply(lambda x: f"{int(x):,}")
-            pa_disp['conv_rate'] = pa_disp['conv_rate'].apply(lambda x: f"{x:.1f}%")
-            pa_disp['ctr'] = pa_disp['ctr'].apply(lambda x: f"{x:.2f}%")
-            pa_disp['arppu'] = pa_disp['arppu'].apply(lambda x: f"₱{x:,.2f}")
-            pa_disp['roas'] = pa_disp['roas'].apply(lambda x: f"{x:.2f}x")
-            pa_disp = pa_disp.rename(columns={
+            # Numbers stay numeric; the column config formats them in the browser
+            pa_disp = per_agent.rename(columns={
                 'agent': 'Agent', 'cost': 'Cost', 'register': 'Register', 'ftd': 'FTD',
                 'cpr': 'CPR', 'cpd': 'Cost/FTD', 'conv_rate': 'Conv %',
                 'impressions': 'Impressions', 'clicks': 'Clicks', 'ctr': 'CTR',
                 'arppu': 'ARPPU', 'roas': 'ROAS',
             })
-            st.dataframe(pa_disp, use_container_width=True, hide_index=True)
+            st.dataframe(pa_disp, use_container_width=True, hide_index=True,
+                         column_config=dict(PER_AGENT_COLUMN_CONFIG))
             st.divider()
 
         # Daily trend charts
@@ -300,31 +295,13 @@ with tab5:
         st.subheader("Daily Data")
         daily_cols = ['date', 'cost', 'register', 'cpr', 'ftd', 'cpd', 'conv_rate', 'impressions', 'clicks', 'ctr', 'arppu', 'roas']
         available_daily_cols = [c for c in daily_cols if c in agent_daily.columns]
-        d_display = agent_daily[available_daily_cols].copy()
-        d_display = d_display.sort_values('date', ascending=False)
-        d_display['date'] = d_display['date'].dt.strftime('%m/%d/%Y') if hasattr(d_display['date'], 'dt') else d_display['date']
-        # Format numbers with commas for display
-        d_display['cost'] = d_display['cost'].apply(lambda x: f"${x:,.2f}")
-        if 'cpr' in d_display.columns:
-            d_display['cpr'] = d_display['cpr'].apply(lambda x: f"${x:,.2f}")
-        if 'cpd' in d_display.columns:
-            d_display['cpd'] = d_display['cpd'].apply(lambda x: f"${x:,.2f}")
-        d_display['impressions'] = d_display['impressions'].apply(lambda x: f"{int(x):,}")
-        d_display['clicks'] = d_display['clicks'].apply(lambda x: f"{int(x):,}")
-        if 'conv_rate' in d_display.columns:
-            d_display['conv_rate'] = d_display['conv_rate'].apply(lambda x: f"{x:.2f}%")
-        if 'ctr' in d_display.columns:
-            d_display['ctr'] = d_display['ctr'].apply(lambda x: f"{x:.2f}%")
-        if 'arppu' in d_display.columns:
-            d_display['arppu'] = d_display['arppu'].apply(lambda x: f"₱{x:,.2f}")
+        # sort_values already returns a new frame - no .copy() first; the date
+        # stays datetime64 and is formatted client-side by its DateColumn
+        d_display = agent_daily[available_daily_cols].sort_values('date', ascending=False)
         st.dataframe(
             d_display,
             use_container_width=True, hide_index=True,
-            column_config={
-                "cost": "Cost", "cpr": "CPR", "cpd": "Cost/FTD",
-                "conv_rate": "Conv %", "impressions": "Impressions",
-                "clicks": "Clicks", "ctr": "CTR", "arppu": "ARPPU", "roas": "ROAS",
-            },
+            column_config=dict(DAILY_COLUMN_CONFIG),
         )
     else:
         st.warning(f"No P-tab data available for {selected_agent}.")
@@ -4,6 +4,7 @@ Data from Created Assets tab in Channel ROI sheet.
 Excludes disabled/inactive assets by default.
 """
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -14,11 +15,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import (
-    load_created_assets_data, refresh_created_assets_data,
-    count_created_assets, count_assets_by_condition,
+    load_created_assets_data, load_created_assets_filter_options, refresh_created_assets_data,
+    count_created_assets, count_assets_by_condition, count_cell_items, CREATED_ASSET_ITEMS,
     load_country_plan_data,
 )
-from config import SIDEBAR_HIDE_CSS
+from config import SIDEBAR_HIDE_CSS, PLOTLY_CHART_CONFIG
+from utils.table_search import render_searchable_table, stripped_value_mask
 
 _PAGE_CSS = """
 <style>
@@ -29,14 +31,71 @@ _PAGE_CSS = """
 </style>
 """
 
-DISABLED_KEYS = {'DISABLED', 'RESTRICTED', 'FOR VERIFY', 'SUSPENDED', 'CHECKPOINT', 'INACTIVE'}
+ASSET_TYPE_COLORS = {
+    'Gmail': '#3b82f6', 'FB Accounts': '#22c55e',
+    'FB Pages': '#f59e0b', 'BMs': '#a855f7',
+}
 
+DISABLED_KEYS = {'DISABLED', 'RESTRICTED', 'FOR VERIFY', 'SUSPENDED', 'CHECKPOINT', 'INACTIVE'}
 
-def _count_items(val):
-    """Count non-empty, non-separator items in a cell (may have newlines)."""
-    if not val:
-        return 0
-    return len([v for v in val.split('\n') if v.strip() and v.strip() != '----'])
+CONDITION_COLUMNS = ['fb_condition', 'page_condition', 'bm_condition']
+
+
+def _normalize_creators(creators):
+    """
+    Strip/uppercase creator names as a Categorical - the string ops run once per
+    distinct creator (category) rather than once per row.
+    """
+    cat = creators.astype('category')
+    normalized = cat.cat.categories.astype(str).str.strip().str.upper()
+    # Trailing '' so missing values (code -1) map to an empty creator
+    lookup = np.append(np.asarray(normalized, dtype=object), '')
+    return pd.Categorical(lookup[cat.cat.codes.to_numpy()])
+
+
+def _prepare_asset_counts(df):
+    """
+    Per-row asset counts (all and active) plus stripped/uppercased conditions,
+    computed once per filtered frame and shared by the per-creator counts and
+    the condition pies.
+    """
+    n = len(df)
+    creators = df['creator'] if 'creator' in df.columns else pd.Series([''] * n, index=df.index)
+    prepped = pd.DataFrame({'creator': _normalize_creators(creators)})
+    for cond_col in CONDITION_COLUMNS:
+        if cond_col in df.columns:
+            prepped[cond_col] = df[cond_col].astype(str).str.strip().str.upper().to_numpy()
+        else:
+            prepped[cond_col] = ''
+
+    for key, val_col, cond_col in CREATED_ASSET_ITEMS:
+        counts = count_cell_items(df[val_col]) if val_col in df.columns else np.zeros(n, dtype=int)
+        prepped[key] = counts
+        prepped[f'{key}_active'] = np.where(prepped[cond_col].isin(DISABLED_KEYS).to_numpy(), 0, counts)
+    return prepped
+
+
+def _count_assets_per_creator(prepped, active_only):
+    """
+    Count assets per creator as {CREATOR: {'gmail', 'fb_accounts', 'fb_pages', 'bms', 'total'}}
+    from a _prepare_asset_counts frame. With active_only, assets whose condition is in
+    DISABLED_KEYS are excluded.
+    """
+    keys = [key for key, _, _ in CREATED_ASSET_ITEMS]
+    source = [f'{key}_active' for key in keys] if active_only else keys
+    counts = prepped.loc[prepped['creator'] != '', ['creator'] + source]
+    counts.columns = ['creator'] + keys
+    counts['total'] = counts[keys].sum(axis=1)
+    return counts.groupby('creator', sort=False, observed=True).sum().astype(int).to_dict('index')
+
+
+def _condition_counts(prepped, df, val_col, cond_col):
+    """Condition value counts for rows that have an asset in val_col (empty conditions dropped)."""
+    conds = prepped[cond_col][(df[val_col].str.strip() != '').to_numpy()]
+    conds = conds[conds != '']
+    cond_counts = conds.value_counts().reset_index()
+    cond_counts.columns = ['Condition', 'Count']
+    return cond_counts
 
 
 def _exclude_disabled(df):
@@ -56,6 +115,12 @@ def render_content(key_prefix="ca"):
 
     with st.spinner("Loading data..."):
         assets_df = load_created_assets_data()
+        filter_options = load_created_assets_filter_options()
+
+    # Creator is the filter and groupby key throughout the page; a categorical keeps
+    # string ops and grouping on the handful of distinct names
+    if 'creator' in assets_df.columns:
+        assets_df['creator'] = assets_df['creator'].astype('category')
 
     if assets_df.empty:
         st.error("No Created Assets data available.")
@@ -82,18 +147,12 @@ def render_content(key_prefix="ca"):
         end_date = None
 
     with fc3:
-        # Country filter — collect unique countries from both fb_country and bm_country
-        all_countries = set()
-        for col in ['fb_country', 'bm_country']:
-            if col in assets_df.columns:
-                vals = assets_df[col].dropna().str.strip()
-                all_countries.update(v for v in vals.unique() if v)
-        country_options = sorted(all_countries) if all_countries else []
+        # Country filter — unique countries from both fb_country and bm_country
+        country_options = filter_options['countries']
         selected_countries = st.multiselect("Country", country_options, default=country_options, key=f"{key_prefix}_country")
 
     with fc4:
-        ca_creators = set(assets_df['creator'].str.strip().unique())
-        creators = sorted(ca_creators)
+        creators = filter_options['creators']
         selected = st.multiselect("Creator", creators, default=creators, key=f"{key_prefix}_creator")
 
     ALL_ASSET_TYPES = ['Gmail/Outlook', 'FB Accounts', 'FB Pages', 'Business Managers']
@@ -102,7 +161,8 @@ def render_content(key_prefix="ca"):
         selected_types = st.multiselect("Asset Type", ALL_ASSET_TYPES, default=ALL_ASSET_TYPES, key=f"{key_prefix}_types")
     active_type_keys = {ASSET_TYPE_MAP[t] for t in selected_types}
 
-    filtered = assets_df.copy()
+    # Filters below always rebind filtered, so no defensive copy of the full frame
+    filtered = assets_df
 
     # Apply date filter
     if has_dates and start_date and end_date:
@@ -113,7 +173,7 @@ def render_content(key_prefix="ca"):
         ]
 
     if selected:
-        filtered = filtered[filtered['creator'].str.strip().isin(selected)]
+        filtered = filtered[stripped_value_mask(filtered['creator'], selected)]
     else:
         st.warning("No creators selected.")
         return
@@ -131,89 +191,10 @@ def render_content(key_prefix="ca"):
                 no_country = no_country & (filtered[col].str.strip() == '')
         filtered = filtered[country_mask | no_country]
 
-    # ── Count active assets per creator (exclude disabled/inactive) ──
-    def count_active_per_creator(df):
-        """Count only ACTIVE assets per creator, excluding disabled/inactive."""
-        result = {}
-        for _, row in df.iterrows():
-            creator = str(row.get('creator', '')).strip().upper()
-            if not creator:
-                continue
-            if creator not in result:
-                result[creator] = {'gmail': 0, 'fb_accounts': 0, 'fb_pages': 0, 'bms': 0, 'total': 0}
-
-            fb_cond = str(row.get('fb_condition', '')).strip().upper()
-            page_cond = str(row.get('page_condition', '')).strip().upper()
-            bm_cond = str(row.get('bm_condition', '')).strip().upper()
-
-            # Gmail — count if FB account condition is not disabled (gmail shares row with FB)
-            gmail_val = str(row.get('gmail', '')).strip()
-            if gmail_val and gmail_val != '----' and fb_cond not in DISABLED_KEYS:
-                n = _count_items(gmail_val)
-                result[creator]['gmail'] += n
-                result[creator]['total'] += n
-
-            # FB Accounts
-            fb_val = str(row.get('fb_username', '')).strip()
-            if fb_val and fb_val != '----' and fb_cond not in DISABLED_KEYS:
-                n = _count_items(fb_val)
-                result[creator]['fb_accounts'] += n
-                result[creator]['total'] += n
-
-            # FB Pages
-            page_val = str(row.get('fb_page', '')).strip()
-            if page_val and page_val != '----' and page_cond not in DISABLED_KEYS:
-                n = _count_items(page_val)
-                result[creator]['fb_pages'] += n
-                result[creator]['total'] += n
-
-            # BMs
-            bm_val = str(row.get('bm_name', '')).strip()
-            if bm_val and bm_val != '----' and bm_cond not in DISABLED_KEYS:
-                n = _count_items(bm_val)
-                result[creator]['bms'] += n
-                result[creator]['total'] += n
-
-        return result
-
-    def count_all_per_creator(df):
-        """Count ALL assets per creator (including disabled) for comparison."""
-        result = {}
-        for _, row in df.iterrows():
-            creator = str(row.get('creator', '')).strip().upper()
-            if not creator:
-                continue
-            if creator not in result:
-                result[creator] = {'gmail': 0, 'fb_accounts': 0, 'fb_pages': 0, 'bms': 0, 'total': 0}
-
-            gmail_val = str(row.get('gmail', '')).strip()
-            if gmail_val and gmail_val != '----':
-                n = _count_items(gmail_val)
-                result[creator]['gmail'] += n
-                result[creator]['total'] += n
-
-            fb_val = str(row.get('fb_username', '')).strip()
-            if fb_val and fb_val != '----':
-                n = _count_items(fb_val)
-                result[creator]['fb_accounts'] += n
-                result[creator]['total'] += n
-
-            page_val = str(row.get('fb_page', '')).strip()
-            if page_val and page_val != '----':
-                n = _count_items(page_val)
-                result[creator]['fb_pages'] += n
-                result[creator]['total'] += n
-
-            bm_val = str(row.get('bm_name', '')).strip()
-            if bm_val and bm_val != '----':
-                n = _count_items(bm_val)
-                result[creator]['bms'] += n
-                result[creator]['total'] += n
-
-        return result
-
-    active_counts = count_active_per_creator(filtered)
-    all_counts = count_all_per_creator(filtered)
+    # ── Count assets per creator: active only (exclude disabled/inactive) and all ──
+    prepped = _prepare_asset_counts(filtered)
+    active_counts = _count_assets_per_creator(prepped, active_only=True)
+    all_counts = _count_assets_per_creator(prepped, active_only=False)
 
     # ── KPI Cards (active only) ──
     period_label = ""
@@ -286,62 +267,49 @@ def render_content(key_prefix="ca"):
         st.dataframe(summary_df, use_container_width=True, hide_index=True, key=f"{key_prefix}_tbl_summary")
 
     # ── Stacked Bar Chart ──
+    # Built with graph_objects straight from the counts - no long-form frame for px to re-parse
     if active_counts:
-        chart_rows = []
-        for creator in sorted(active_counts.keys()):
-            ac = active_counts[creator]
-            for at_key in ['gmail', 'fb_accounts', 'fb_pages', 'bms']:
-                if at_key not in active_type_keys:
-                    continue
-                chart_rows.append({
-                    'Creator': creator,
-                    'Type': type_labels[at_key],
-                    'Count': ac.get(at_key, 0),
-                })
-
-        chart_df = pd.DataFrame(chart_rows)
-        fig = px.bar(
-            chart_df, x='Creator', y='Count', color='Type',
-            barmode='stack', title='Active Assets per Creator',
-            color_discrete_map={
-                'Gmail': '#3b82f6', 'FB Accounts': '#22c55e',
-                'FB Pages': '#f59e0b', 'BMs': '#a855f7',
-            },
+        chart_creators = sorted(active_counts.keys())
+        fig = go.Figure([
+            go.Bar(
+                name=type_labels[at_key], x=chart_creators,
+                y=[active_counts[c].get(at_key, 0) for c in chart_creators],
+                marker_color=ASSET_TYPE_COLORS[type_labels[at_key]],
+            )
+            for at_key in ['gmail', 'fb_accounts', 'fb_pages', 'bms'] if at_key in active_type_keys
+        ])
+        fig.update_layout(
+            barmode='stack', title='Active Assets per Creator', legend_title_text='Type',
+            height=400, xaxis_title="", yaxis_title="Count",
         )
-        fig.update_layout(height=400, xaxis_title="", yaxis_title="Count")
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_creators")
+        st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_creators")
 
     # ── Condition Breakdown ──
     st.divider()
     st.markdown('<div class="section-header"><h3>CONDITION BREAKDOWN</h3></div>', unsafe_allow_html=True)
 
+    # Only build pies for the asset types selected in the filter
     col_a, col_b = st.columns(2)
 
     with col_a:
-        fb_conds = filtered[filtered['fb_username'].str.strip() != '']['fb_condition'].str.strip().str.upper()
-        fb_conds = fb_conds[fb_conds != '']
-        if not fb_conds.empty:
-            cond_counts = fb_conds.value_counts().reset_index()
-            cond_counts.columns = ['Condition', 'Count']
-            fig2 = px.pie(cond_counts, names='Condition', values='Count', title='FB Account Conditions')
-            st.plotly_chart(fig2, use_container_width=True, key=f"{key_prefix}_pie_fb")
+        if 'fb_accounts' in active_type_keys:
+            cond_counts = _condition_counts(prepped, filtered, 'fb_username', 'fb_condition')
+            if not cond_counts.empty:
+                fig2 = px.pie(cond_counts, names='Condition', values='Count', title='FB Account Conditions')
+                st.plotly_chart(fig2, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_pie_fb")
 
     with col_b:
-        pg_conds = filtered[filtered['fb_page'].str.strip() != '']['page_condition'].str.strip().str.upper()
-        pg_conds = pg_conds[pg_conds != '']
-        if not pg_conds.empty:
-            cond_counts = pg_conds.value_counts().reset_index()
-            cond_counts.columns = ['Condition', 'Count']
-            fig3 = px.pie(cond_counts, names='Condition', values='Count', title='Page Conditions')
-            st.plotly_chart(fig3, use_container_width=True, key=f"{key_prefix}_pie_pages")
-
-    bm_conds = filtered[filtered['bm_name'].str.strip() != '']['bm_condition'].str.strip().str.upper()
-    bm_conds = bm_conds[bm_conds != '']
-    if not bm_conds.empty:
-        cond_counts = bm_conds.value_counts().reset_index()
-        cond_counts.columns = ['Condition', 'Count']
-        fig4 = px.pie(cond_counts, names='Condition', values='Count', title='BM Conditions')
-        st.plotly_chart(fig4, use_container_width=True, key=f"{key_prefix}_pie_bm")
+        if 'fb_pages' in active_type_keys:
+            cond_counts = _condition_counts(prepped, filtered, 'fb_page', 'page_condition')
+            if not cond_counts.empty:
+                fig3 = px.pie(cond_counts, names='Condition', values='Count', title='Page Conditions')
+                st.plotly_chart(fig3, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_pie_pages")
+
+    if 'bms' in active_type_keys:
+        cond_counts = _condition_counts(prepped, filtered, 'bm_name', 'bm_condition')
+        if not cond_counts.empty:
+            fig4 = px.pie(cond_counts, names='Condition', values='Count', title='BM Conditions')
+            st.plotly_chart(fig4, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_pie_bm")
 
     # ── Raw Data ──
     st.divider()
@@ -350,7 +318,6 @@ def render_content(key_prefix="ca"):
     display_cols = ['date', 'creator', 'gmail', 'fb_username', 'fb_condition', 'fb_page', 'page_condition', 'fb_country', 'bm_name', 'bm_country', 'bm_condition']
     # Only include columns that exist
     display_cols = [c for c in display_cols if c in filtered.columns]
-    display_df = filtered[display_cols].copy()
     col_rename = {
         'date': 'Date', 'creator': 'Creator', 'gmail': 'Gmail/Outlook',
         'fb_username': 'FB Username', 'fb_condition': 'FB Condition',
@@ -358,15 +325,11 @@ def render_content(key_prefix="ca"):
         'fb_country': 'Country (FB)', 'bm_name': 'BM Name',
         'bm_country': 'Country (BM)', 'bm_condition': 'BM Condition',
     }
-    display_df.columns = [col_rename.get(c, c) for c in display_cols]
+    # Project only the displayed columns (renamed) instead of copying the filtered frame
+    display_df = pd.DataFrame({col_rename.get(c, c): filtered[c].to_numpy() for c in display_cols})
     display_df['Date'] = pd.to_datetime(display_df['Date'], errors='coerce').dt.strftime('%m/%d/%Y')
 
-    search = st.text_input("Search", placeholder="Type to search across all columns...", key=f"{key_prefix}_search")
-    if search:
-        display_df = display_df[display_df.apply(lambda row: row.astype(str).str.contains(search, case=False).any(), axis=1)]
-
-    st.dataframe(display_df, use_container_width=True, hide_index=True, height=500, key=f"{key_prefix}_tbl_records")
-    st.caption(f"Showing {len(display_df)} of {len(filtered)} records")
+    render_searchable_table(display_df, len(filtered), key_prefix, "tbl_records")
 
     # ── Country Breakdown ──
     st.divider()
@@ -410,22 +373,24 @@ def render_content(key_prefix="ca"):
             if pie_rows:
                 pie_df = pd.DataFrame(pie_rows)
                 fig_pie = px.pie(pie_df, names='Country', values='Assets', title='Assets by Country')
-                st.plotly_chart(fig_pie, use_container_width=True, key=f"{key_prefix}_pie_country")
+                st.plotly_chart(fig_pie, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_pie_country")
 
         # Stacked bar
         with cc2:
-            bar_rows = []
-            for country, counts in country_stats.items():
-                for atype, cnt in counts.items():
-                    if cnt > 0:
-                        bar_rows.append({'Country': country, 'Type': atype, 'Count': cnt})
-            if bar_rows:
-                bar_df = pd.DataFrame(bar_rows)
-                fig_bar = px.bar(bar_df, x='Country', y='Count', color='Type', barmode='stack',
-                                 title='Asset Types by Country',
-                                 color_discrete_map={'FB Accounts': '#22c55e', 'FB Pages': '#f59e0b', 'BMs': '#a855f7'})
-                fig_bar.update_layout(height=400)
-                st.plotly_chart(fig_bar, use_container_width=True, key=f"{key_prefix}_bar_country")
+            bar_traces = []
+            for atype in ['FB Pages', 'BMs', 'FB Accounts']:
+                bar_countries = [c for c, counts in country_stats.items() if counts[atype] > 0]
+                if bar_countries:
+                    bar_traces.append(go.Bar(
+                        name=atype, x=bar_countries,
+                        y=[country_stats[c][atype] for c in bar_countries],
+                        marker_color=ASSET_TYPE_COLORS[atype],
+                    ))
+            if bar_traces:
+                fig_bar = go.Figure(bar_traces)
+                fig_bar.update_layout(barmode='stack', title='Asset Types by Country',
+                                      legend_title_text='Type', height=400)
+                st.plotly_chart(fig_bar, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_bar_country")
 
         # Summary table
         country_rows = []
@@ -464,7 +429,7 @@ def render_content(key_prefix="ca"):
             st.info("No plan data for the selected period.")
         else:
             # Summary per agent
-            plan_summary = plan_filtered.groupby('agent').agg(
+            plan_summary = plan_filtered.groupby('agent', sort=False).agg(
                 fb_account=('fb_account', lambda x: pd.to_numeric(x, errors='coerce').sum()),
                 page=('page', lambda x: pd.to_numeric(x, errors='coerce').sum()),
                 bm=('bm', lambda x: pd.to_numeric(x, errors='coerce').sum()),
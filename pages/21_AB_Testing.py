@@ -13,7 +13,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_ab_testing_data, refresh_ab_testing_data, count_ab_testing
-from config import SIDEBAR_HIDE_CSS, FACEBOOK_ADS_PERSONS
+from config import SIDEBAR_HIDE_CSS, FACEBOOK_ADS_PERSONS, PLOTLY_CHART_CONFIG
+from utils.table_search import render_searchable_table, stripped_value_mask
 
 _PAGE_CSS = """
 <style>
@@ -25,6 +26,56 @@ _PAGE_CSS = """
 """
 
 
+@st.fragment
+def _render_detail_log(detail_df, date_range, key_prefix):
+    """
+    Creator/advertiser filters and the detail table as a fragment, so changing a
+    filter reruns only this block - not the data load, charts and scoring above.
+    """
+    # Inline filters
+    fc1, fc2, fc3 = st.columns([2, 2, 2])
+    with fc1:
+        creators = sorted(detail_df['creator'].dropna().str.strip().unique())
+        selected_creator = st.selectbox("Creator", ["All"] + [c for c in creators if c], key=f"{key_prefix}_creator")
+    with fc2:
+        advertisers = sorted(detail_df['advertiser'].dropna().str.strip().unique())
+        selected_advertiser = st.selectbox("Advertiser", ["All"] + [a for a in advertisers if a], key=f"{key_prefix}_advertiser")
+
+    filtered = detail_df
+
+    # Apply date filter to detail log (parsed dates kept as a local Series, not a temp column)
+    if date_range:
+        batch_dt = pd.to_datetime(filtered['batch_date'], errors='coerce')
+        filtered = filtered[
+            (batch_dt.notna()) &
+            (batch_dt >= date_range[0]) &
+            (batch_dt <= date_range[1])
+        ]
+
+    if selected_creator != "All":
+        filtered = filtered[stripped_value_mask(filtered['creator'], [selected_creator])]
+    if selected_advertiser != "All":
+        filtered = filtered[stripped_value_mask(filtered['advertiser'], [selected_advertiser])]
+
+    # Display columns
+    display_cols = ['batch_date', 'creator', 'headline', 'advertiser', 'total_published']
+    available_cols = [c for c in display_cols if c in filtered.columns]
+    rename_map = {
+        'batch_date': 'Date',
+        'creator': 'Creator',
+        'headline': 'Headline',
+        'advertiser': 'Advertiser',
+        'total_published': 'Published',
+    }
+    # Project only the displayed columns (renamed) instead of copying the filtered frame
+    display_df = pd.DataFrame({rename_map.get(c, c): filtered[c].to_numpy() for c in available_cols})
+
+    if 'Date' in display_df.columns:
+        display_df['Date'] = pd.to_datetime(display_df['Date'], errors='coerce').dt.strftime('%m/%d/%Y')
+
+    render_searchable_table(display_df, len(filtered), key_prefix, "tbl_detail")
+
+
 def render_content(key_prefix="ab"):
     """Render A/B Testing content. Can be called standalone or from Operations wrapper."""
 
@@ -106,7 +157,7 @@ def render_content(key_prefix="ab"):
             },
         )
         fig.update_layout(height=400, xaxis_title="", yaxis_title="Count")
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_agents")
+        st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_agents")
 
         # Scoring table
         st.subheader("KPI Scoring")
@@ -164,54 +215,7 @@ def render_content(key_prefix="ab"):
         st.divider()
         st.markdown('<div class="section-header"><h3>📋 CAMPAIGN DETAIL LOG</h3></div>', unsafe_allow_html=True)
 
-        # Inline filters
-        fc1, fc2, fc3 = st.columns([2, 2, 2])
-        with fc1:
-            creators = sorted(detail_df['creator'].dropna().str.strip().unique())
-            selected_creator = st.selectbox("Creator", ["All"] + [c for c in creators if c], key=f"{key_prefix}_creator")
-        with fc2:
-            advertisers = sorted(detail_df['advertiser'].dropna().str.strip().unique())
-            selected_advertiser = st.selectbox("Advertiser", ["All"] + [a for a in advertisers if a], key=f"{key_prefix}_advertiser")
-
-        filtered = detail_df.copy()
-
-        # Apply date filter to detail log
-        if date_range:
-            filtered['_batch_dt'] = pd.to_datetime(filtered['batch_date'], errors='coerce')
-            filtered = filtered[
-                (filtered['_batch_dt'].notna()) &
-                (filtered['_batch_dt'] >= date_range[0]) &
-                (filtered['_batch_dt'] <= date_range[1])
-            ]
-            filtered = filtered.drop(columns=['_batch_dt'])
-
-        if selected_creator != "All":
-            filtered = filtered[filtered['creator'].str.strip() == selected_creator]
-        if selected_advertiser != "All":
-            filtered = filtered[filtered['advertiser'].str.strip() == selected_advertiser]
-
-        # Display columns
-        display_cols = ['batch_date', 'creator', 'headline', 'advertiser', 'total_published']
-        available_cols = [c for c in display_cols if c in filtered.columns]
-        display_df = filtered[available_cols].copy()
-        rename_map = {
-            'batch_date': 'Date',
-            'creator': 'Creator',
-            'headline': 'Headline',
-            'advertiser': 'Advertiser',
-            'total_published': 'Published',
-        }
-        display_df = display_df.rename(columns=rename_map)
-
-        if 'Date' in display_df.columns:
-            display_df['Date'] = pd.to_datetime(display_df['Date'], errors='coerce').dt.strftime('%m/%d/%Y')
-
-        search = st.text_input("Search", placeholder="Type to search across all columns...", key=f"{key_prefix}_search")
-        if search:
-            display_df = display_df[display_df.apply(lambda row: row.astype(str).str.contains(search, case=False).any(), axis=1)]
-
-        st.dataframe(display_df, use_container_width=True, hide_index=True, height=500, key=f"{key_prefix}_tbl_detail")
-        st.caption(f"Showing {len(display_df)} of {len(filtered)} records")
+        _render_detail_log(detail_df, date_range, key_prefix)
 
 
 def main():
@@ -4,6 +4,7 @@ Fetches messages from Railway Chat Listener API.
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import requests
 from datetime import datetime, timedelta, timezone
@@ -12,13 +13,16 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import SIDEBAR_HIDE_CSS
+from config import SIDEBAR_HIDE_CSS, PLOTLY_CHART_CONFIG
 
 # Railway API config
 CHAT_API_URL = os.getenv("CHAT_API_URL", "https://humble-illumination-production-713f.up.railway.app")
 CHAT_API_KEY = os.getenv("CHAT_API_KEY", "juan365chat")
 PH_TZ = timezone(timedelta(hours=8))
 
+# Message fields the page uses; the frame is built with exactly these columns
+MESSAGE_COLUMNS = ['id', 'date_ph', 'first_name', 'username', 'text', 'message_type']
+
 
 def api_get(endpoint, params=None):
     """Fetch data from Railway Chat Listener API."""
@@ -34,12 +38,12 @@ def api_get(endpoint, params=None):
         return None
 
 
-@st.cache_data(ttl=30)
+@st.cache_data(ttl=30, show_spinner=False)
 def load_stats():
     return api_get('/api/stats') or {}
 
 
-@st.cache_data(ttl=30)
+@st.cache_data(ttl=30, show_spinner=False, max_entries=32)
 def load_messages(search_term=None, date_from=None, date_to=None, user_filter=None, limit=500):
     params = {'limit': limit}
     if search_term:
@@ -48,41 +52,58 @@ def load_messages(search_term=None, date_from=None, date_to=None, user_filter=No
         params['date_from'] = str(date_from)
     if date_to:
         params['date_to'] = str(date_to)
-    if user_filter and user_filter != "All":
+    if user_filter:
         params['user'] = user_filter
 
     data = api_get('/api/messages', params)
     if data and data.get('messages'):
-        return pd.DataFrame(data['messages'])
+        # Known columns: pandas skips scanning every dict for the union of keys
+        df = pd.DataFrame.from_records(data['messages'], columns=MESSAGE_COLUMNS)
+        if 'date_ph' in df.columns:
+            # Parsed once here; the analytics charts group on its dt fields
+            df['date_ph_ts'] = pd.to_datetime(df['date_ph'], format='ISO8601', errors='coerce')
+        return df
     return pd.DataFrame()
 
 
-def render_message(row):
-    name = row.get('first_name') or row.get('username') or 'Unknown'
-    username = row.get('username', '')
-    date_ph = row.get('date_ph', '')
-    text = row.get('text', '')
-    if not isinstance(text, str):
-        text = ''
-    msg_type = row.get('message_type', 'text')
-
-    text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\n', '<br>')
+def _text_column(df, col, default=''):
+    """df[col] as strings with missing/None replaced by default (a constant column if col is absent)."""
+    if col not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[col].where(df[col].notna(), default).astype(str)
 
-    type_badge = ''
-    if msg_type != 'text':
-        type_badge = f' <span style="background:#4a4a6a;padding:1px 6px;border-radius:8px;font-size:0.7em;">{msg_type}</span>'
 
-    at_user = f' <span style="color:#888;font-size:0.8em;">@{username}</span>' if username else ''
-
-    return f"""
-    <div style="padding:8px 12px;margin:3px 0;border-left:3px solid #4a9eff;background:rgba(74,158,255,0.05);border-radius:0 6px 6px 0;">
-        <div style="display:flex;justify-content:space-between;align-items:center;">
-            <span><strong style="color:#4a9eff;">{name}</strong>{at_user}{type_badge}</span>
-            <span style="color:#888;font-size:0.8em;">{date_ph}</span>
-        </div>
-        <div style="margin-top:4px;color:#e0e0e0;">{text}</div>
-    </div>
+def render_messages_html(df):
+    """
+    HTML fragment for every message in df, built column-wise with vectorized
+    string ops instead of an f-string per row. Returns a Series aligned with df.
     """
+    text = (_text_column(df, 'text')
+            .str.replace('&', '&amp;', regex=False)
+            .str.replace('<', '&lt;', regex=False)
+            .str.replace('>', '&gt;', regex=False)
+            .str.replace('\n', '<br>', regex=False))
+    username = _text_column(df, 'username')
+    name = _text_column(df, 'first_name').replace('', np.nan).fillna(username.replace('', np.nan)).fillna('Unknown')
+    msg_type = _text_column(df, 'message_type', 'text')
+    date_ph = _text_column(df, 'date_ph')
+
+    at_user = pd.Series(
+        np.where(username != '', ' <span style="color:#888;font-size:0.8em;">@' + username + '</span>', ''),
+        index=df.index)
+    type_badge = pd.Series(
+        np.where(msg_type != 'text',
+                 ' <span style="background:#4a4a6a;padding:1px 6px;border-radius:8px;font-size:0.7em;">' + msg_type + '</span>',
+                 ''),
+        index=df.index)
+
+    return ('<div style="padding:8px 12px;margin:3px 0;border-left:3px solid #4a9eff;background:rgba(74,158,255,0.05);border-radius:0 6px 6px 0;">'
+            '<div style="display:flex;justify-content:space-between;align-items:center;">'
+            '<span><strong style="color:#4a9eff;">' + name + '</strong>' + at_user + type_badge + '</span>'
+            '<span style="color:#888;font-size:0.8em;">' + date_ph + '</span>'
+            '</div>'
+            '<div style="margin-top:4px;color:#e0e0e0;">' + text + '</div>'
+            '</div>')
 
 
 def render_content(key_prefix="cm"):
@@ -135,14 +156,31 @@ def render_content(key_prefix="cm"):
 
     st.markdown("---")
 
-    # Load filtered messages
-    messages_df = load_messages(
-        search_term=search_term if search_term else None,
-        date_from=date_from,
-        date_to=date_to,
-        user_filter=user_filter if user_filter != "All" else None,
-        limit=1000,
-    )
+    # Load filtered messages. The frame and its message HTML are kept in
+    # session_state per filter set, so paging (or any other widget rerun) doesn't
+    # repeat the API fetch + DataFrame build; HTML is built per page on first
+    # view. The listener's last message date is part of the key so new
+    # messages still show.
+    # Arguments are normalized first so equivalent filters share a cache entry
+    search_norm = (search_term or '').strip() or None
+    user_norm = user_filter if user_filter != "All" else None
+    msg_state_key = f"{key_prefix}_msg_cache"
+    msg_params = (search_norm, str(date_from), str(date_to), user_norm, stats.get('last_date'))
+    cached = st.session_state.get(msg_state_key)
+    if cached is None or cached['params'] != msg_params:
+        messages_df = load_messages(
+            search_term=search_norm,
+            date_from=date_from,
+            date_to=date_to,
+            user_filter=user_norm,
+            limit=1000,
+        )
+        cached = {'params': msg_params, 'df': messages_df, 'html_pages': {}}
+        st.session_state[msg_state_key] = cached
+        # New result set - start from the first page (also keeps the stored
+        # page within the new page count)
+        st.session_state[f"{key_prefix}_msg_page"] = 1
+    messages_df = cached['df']
 
     tab1, tab2, tab3 = st.tabs(["💬 Messages", "📊 Analytics", "📋 Data Table"])
 
@@ -154,21 +192,24 @@ def render_content(key_prefix="cm"):
         if messages_df.empty:
             st.info("No messages found matching your filters.")
         else:
-            html_parts = []
-            for _, row in messages_df.iterrows():
-                html_parts.append(render_message(row))
-
+            total = len(messages_df)
             page_size = 50
-            total_pages = max(1, (len(html_parts) + page_size - 1) // page_size)
-            page = st.number_input("Page", min_value=1, max_value=total_pages, value=1, key=f"{key_prefix}_msg_page")
+            total_pages = max(1, (total + page_size - 1) // page_size)
+            # No value= here: the page is seeded through session_state when results change
+            page = st.number_input("Page", min_value=1, max_value=total_pages, key=f"{key_prefix}_msg_page")
             start = (page - 1) * page_size
             end = start + page_size
 
+            # Only the rows on screen are escaped/templated
+            html_pages = cached['html_pages']
+            if page not in html_pages:
+                html_pages[page] = "".join(render_messages_html(messages_df.iloc[start:end]))
+
             st.markdown(
-                f'<div style="max-height:600px;overflow-y:auto;">{"".join(html_parts[start:end])}</div>',
+                f'<div style="max-height:600px;overflow-y:auto;">{html_pages[page]}</div>',
                 unsafe_allow_html=True
             )
-            st.caption(f"Showing {start+1}-{min(end, len(html_parts))} of {len(html_parts)} messages | Page {page}/{total_pages}")
+            st.caption(f"Showing {start+1}-{min(end, total)} of {total} messages | Page {page}/{total_pages}")
 
     with tab2:
         if not messages_df.empty:
@@ -183,7 +224,7 @@ def render_content(key_prefix="cm"):
                                 title='Messages by User (Top 15)',
                                 color='Messages', color_continuous_scale='Blues')
                     fig.update_layout(height=400, showlegend=False)
-                    st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_users")
+                    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_users")
 
             with col2:
                 type_data = stats.get('type_dist', [])
@@ -194,42 +235,45 @@ def render_content(key_prefix="cm"):
                                 title='Message Types',
                                 color_discrete_sequence=px.colors.qualitative.Set3)
                     fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_pie_types")
+                    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_pie_types")
 
-            if 'date_ph' in messages_df.columns:
-                daily = messages_df.copy()
-                daily['day'] = daily['date_ph'].str[:10]
-                daily_counts = daily.groupby('day').size().reset_index(name='messages')
-                daily_counts = daily_counts.sort_values('day')
+            if 'date_ph_ts' in messages_df.columns:
+                # groupby already returns days in sorted order - no copy of messages_df, no re-sort
+                day = messages_df['date_ph_ts'].dt.date.rename('day')
+                daily_counts = messages_df.groupby(day).size().reset_index(name='messages')
 
                 fig = px.line(daily_counts, x='day', y='messages',
                             title='Daily Message Volume', markers=True)
                 fig.update_layout(height=350, xaxis_title="Date", yaxis_title="Messages")
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_daily")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_daily")
 
-            if 'date_ph' in messages_df.columns:
-                hourly = messages_df.copy()
-                hourly['hour'] = hourly['date_ph'].str[11:13].astype(int)
-                hourly_counts = hourly.groupby('hour').size().reset_index(name='messages')
+            if 'date_ph_ts' in messages_df.columns:
+                hour = messages_df['date_ph_ts'].dt.hour.rename('hour')
+                hourly_counts = messages_df.groupby(hour).size().reset_index(name='messages')
 
                 fig = px.bar(hourly_counts, x='hour', y='messages',
                             title='Hourly Message Distribution (PH Time)',
                             color='messages', color_continuous_scale='Viridis')
                 fig.update_layout(height=350, xaxis_title="Hour (24h)", yaxis_title="Messages",
                                 xaxis=dict(dtick=1))
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_hourly")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_hourly")
         else:
             st.info("No data to analyze.")
 
     with tab3:
         if not messages_df.empty:
-            display_df = messages_df[['date_ph', 'first_name', 'username', 'text', 'message_type']].copy()
-            display_df['text'] = display_df['text'].fillna('')
-            display_df.columns = ['Date (PH)', 'Name', 'Username', 'Message', 'Type']
-            st.dataframe(display_df, use_container_width=True, hide_index=True, height=600, key=f"{key_prefix}_tbl_data")
-
-            csv = display_df.to_csv(index=False)
-            st.download_button("📥 Download CSV", csv, f"chat_messages_{datetime.now():%Y%m%d}.csv", key=f"{key_prefix}_dl_csv")
+            # Table and CSV bytes ride in the per-filter message cache, so the
+            # download payload isn't re-serialized on every rerun
+            if 'table' not in cached:
+                display_df = messages_df[['date_ph', 'first_name', 'username', 'text', 'message_type']].copy()
+                display_df['text'] = display_df['text'].fillna('')
+                display_df.columns = ['Date (PH)', 'Name', 'Username', 'Message', 'Type']
+                cached['table'] = display_df
+                cached['csv'] = display_df.to_csv(index=False).encode('utf-8')
+            st.dataframe(cached['table'], use_container_width=True, hide_index=True, height=600, key=f"{key_prefix}_tbl_data")
+
+            st.download_button("📥 Download CSV", cached['csv'], f"chat_messages_{datetime.now():%Y%m%d}.csv",
+                               mime="text/csv", key=f"{key_prefix}_dl_csv")
         else:
             st.info("No messages to display.")
 
@@ -248,6 +292,7 @@ def main():
         st.header("Controls")
         if st.button("🔄 Refresh", type="primary", use_container_width=True):
             st.cache_data.clear()
+            st.session_state.pop("cm_msg_cache", None)
             st.rerun()
 
     render_content()
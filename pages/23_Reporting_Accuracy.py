@@ -28,6 +28,7 @@ from config import (
     FACEBOOK_ADS_PERSONS,
     EXCLUDED_FROM_REPORTING,
     SIDEBAR_HIDE_CSS,
+    PLOTLY_CHART_CONFIG,
 )
 
 # Railway API config
@@ -256,7 +257,7 @@ def render_content(key_prefix="ra"):
                 combined_scores = pd.concat(all_scores, ignore_index=True)
 
                 # Summary table
-                summary = combined_scores.groupby('agent').agg(
+                summary = combined_scores.groupby('agent', sort=False).agg(
                     reports=('score', 'count'),
                     avg_score=('score', 'mean'),
                     avg_minute=('minute', 'mean'),
@@ -294,7 +295,7 @@ def render_content(key_prefix="ra"):
                             range_color=[1, 4])
                 fig.update_layout(height=400, yaxis_range=[0, 4.5], yaxis_title="Score (1-4)")
                 fig.add_hline(y=3, line_dash="dash", line_color="gray", annotation_text="Target (3)")
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_scores")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_scores")
 
                 # Score distribution
                 score_dist = combined_scores.groupby(['agent', 'score']).size().reset_index(name='count')
@@ -303,7 +304,7 @@ def render_content(key_prefix="ra"):
                             barmode='stack',
                             color_discrete_map={4: '#44cc44', 3: '#ffcc00', 2: '#ff8800', 1: '#ff4444'})
                 fig.update_layout(height=400)
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_dist")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_dist")
             else:
                 st.info("No report-related messages found from agents. Keywords searched: " + ", ".join(REPORT_KEYWORDS[:5]))
 
@@ -324,19 +325,18 @@ def render_content(key_prefix="ra"):
                             barmode='group')
                 fig.update_layout(height=400, xaxis=dict(dtick=1),
                                 xaxis_title="Hour (24h PH)", yaxis_title="Messages")
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_hourly")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_hourly")
 
-                # Heatmap: Agent x Hour
-                pivot = filtered.groupby(['agent', 'hour']).size().reset_index(name='count')
-                if not pivot.empty:
-                    heatmap_data = pivot.pivot_table(index='agent', columns='hour', values='count', fill_value=0)
+                # Heatmap: Agent x Hour (same agent/hour counts as the bar chart above)
+                if not hourly.empty:
+                    heatmap_data = hourly.pivot_table(index='agent', columns='hour', values='messages', fill_value=0)
                     fig = px.imshow(heatmap_data,
                                    title='Agent Activity Heatmap (Messages per Hour)',
                                    labels=dict(x="Hour (PH)", y="Agent", color="Messages"),
                                    color_continuous_scale='YlOrRd',
                                    aspect='auto')
                     fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_heatmap")
+                    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_heatmap")
 
                 # Daily messages trend per agent
                 daily = filtered.groupby(['agent', 'date_only']).size().reset_index(name='messages')
@@ -345,7 +345,7 @@ def render_content(key_prefix="ra"):
                             title='Daily Message Count by Agent',
                             markers=True)
                 fig.update_layout(height=400, xaxis_title="Date", yaxis_title="Messages")
-                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_chart_daily")
+                st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CHART_CONFIG, key=f"{key_prefix}_chart_daily")
             else:
                 st.info("No messages for selected agent.")
         else:
@@ -6,8 +6,10 @@ Manual KPIs can be scored via input fields per agent.
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, date
 from channel_data_loader import (
+    get_google_client,
     load_agent_performance_data,
     refresh_agent_performance_data,
     calculate_kpi_scores,
@@ -41,6 +43,7 @@ from config import (
 CHAT_API_URL = os.getenv("CHAT_API_URL", "https://humble-illumination-production-713f.up.railway.app")
 CHAT_API_KEY = os.getenv("CHAT_API_KEY", "juan365chat")
 
+
 ALL_KPIS = {**KPI_SCORING, **KPI_MANUAL}
 MANUAL_KEYS = list(KPI_MANUAL.keys())
 
@@ -59,6 +62,39 @@ PARAM_TEXT = {
 }
 
 
+@st.cache_resource
+def _loader_pool():
+    """One pool per process (not per page execution) for the independent Sheets loaders."""
+    return ThreadPoolExecutor(max_workers=3)
+
+
+def _submit_load(loader, pooled=True):
+    """
+    Run a cached loader on the shared pool, concurrently with the P-tab load and
+    controls. No script run context is attached: with credentials present the
+    pooled loaders make no st.* calls (no spinner, errors returned), so nothing
+    from a worker can land on the page or in a stale rerun.
+    With pooled=False (no credentials) the loader runs here instead - it returns
+    empty at once, and its missing-credentials warning reaches the page.
+    """
+    if not pooled:
+        future = Future()
+        future.set_result(loader())
+        return future
+    return _loader_pool().submit(loader)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_reporting_scores(month=None):
+    """Fetch reporting scores from the Chat Listener API (cached; failures raise and are not cached)."""
+    report_params = {'key': CHAT_API_KEY}
+    if month:
+        report_params['month'] = month
+    resp = http_requests.get(f"{CHAT_API_URL}/api/reporting", params=report_params, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
 def score_color(score):
     if score >= 4:
         return "#22c55e"
@@ -203,6 +239,13 @@ def render_content(key_prefix="km"):
     if ss_manual not in st.session_state:
         st.session_state[ss_manual] = {}
 
+    # Start the loads that don't depend on the controls; results are collected where used
+    # Credentials are checked on the script thread; without them nothing is pooled
+    pooled = get_google_client(warn=False) is not None
+    accounts_future = _submit_load(load_updated_accounts_data, pooled)
+    assets_future = _submit_load(load_created_assets_data, pooled)
+    ab_future = _submit_load(load_ab_testing_data, pooled)
+
     # Filter agents excluded from reporting (deduplicate agents with multiple P-tabs like Jason)
     _seen = set()
     KPI_AGENTS = []
@@ -247,6 +290,7 @@ def render_content(key_prefix="km"):
             refresh_updated_accounts_data()
             refresh_created_assets_data()
             refresh_ab_testing_data()
+            load_reporting_scores.clear()
             st.rerun()
 
     # Date range filter (optional — overrides month selector when enabled)
@@ -275,22 +319,19 @@ def render_content(key_prefix="km"):
         selected_month_label = f"{date_from.strftime('%b %d')} – {date_to.strftime('%b %d, %Y')}"
 
     # Load Updated Accounts data (kept for backward compat)
-    accounts_data = load_updated_accounts_data()
+    accounts_data = accounts_future.result()
+    if accounts_data.get('error'):
+        st.error(accounts_data['error'])
 
     # Load Created Assets data for Account Dev scoring
-    created_assets_data = load_created_assets_data()
+    created_assets_data = assets_future.result()
 
     # Load A/B Testing data
-    ab_testing_data = load_ab_testing_data()
+    ab_testing_data = ab_future.result()
 
     # Fetch reporting scores - pass month param if selected
     try:
-        report_params = {'key': CHAT_API_KEY}
-        if selected_month:
-            report_params['month'] = selected_month
-        resp = http_requests.get(f"{CHAT_API_URL}/api/reporting", params=report_params, timeout=10)
-        resp.raise_for_status()
-        chat_reporting = resp.json()
+        chat_reporting = load_reporting_scores(selected_month)
     except Exception:
         chat_reporting = {}
 
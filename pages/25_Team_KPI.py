@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_team_channel_data, refresh_team_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio, category_sums
 
 # Team-to-channel mapping
 TEAM_CHANNEL_MAP = {
@@ -28,6 +29,17 @@ TEAM_COLORS = {
     'MIKA / JOMAR': '#a855f7',
 }
 
+TEAM_ORDER = list(TEAM_COLORS)
+
+# Additive per-team columns; derived ratios are recomputed from these
+TEAM_SUM_COLUMNS = ['cost', 'registrations', 'first_recharge', 'total_amount']
+
+
+def team_dtype(teams):
+    """Ordered categorical dtype for a team column: TEAM_ORDER first, any other teams after (sorted)"""
+    extra = sorted(set(teams.dropna().unique()) - set(TEAM_ORDER))
+    return pd.CategoricalDtype(TEAM_ORDER + extra, ordered=True)
+
 
 def score_badge(score):
     if score == 0:
@@ -117,20 +129,18 @@ def render_content(key_prefix="tk"):
         ]
         if not filtered.empty:
             # Map channels to teams
-            filtered['team'] = filtered['channel'].map(channel_team_map)
+            # Hash map lookup into int8 category codes; the sums then run on
+            # codes and come out in team display order
+            teams = filtered['channel'].map(channel_team_map)
+            filtered['team'] = teams.astype(team_dtype(teams))
             filtered = filtered[filtered['team'].notna()]
             if not filtered.empty:
-                base_df = filtered.groupby('team').agg({
-                    'cost': 'sum',
-                    'registrations': 'sum',
-                    'first_recharge': 'sum',
-                    'total_amount': 'sum',
-                }).reset_index()
+                base_df = category_sums(filtered, 'team', TEAM_SUM_COLUMNS)
                 # Recalculate derived columns
-                base_df['cpr'] = base_df.apply(lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-                base_df['cpfd'] = base_df.apply(lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-                base_df['roas'] = base_df.apply(lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-                base_df['arppu'] = base_df.apply(lambda x: x['total_amount'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+                base_df['cpr'] = safe_ratio(base_df['cost'], base_df['registrations'])
+                base_df['cpfd'] = safe_ratio(base_df['cost'], base_df['first_recharge'])
+                base_df['roas'] = safe_ratio(base_df['total_amount'], base_df['cost'])
+                base_df['arppu'] = safe_ratio(base_df['total_amount'], base_df['first_recharge'])
                 st.info(f"Showing data for **{date_from.strftime('%b %d')} – {date_to.strftime('%b %d, %Y')}**")
             else:
                 st.warning("No channels could be mapped to teams in selected date range.")
@@ -160,17 +170,14 @@ def render_content(key_prefix="tk"):
     st.markdown(mapping_html, unsafe_allow_html=True)
 
     # --- Aggregate by team ---
-    team_agg = base_df.groupby('team').agg({
-        'cost': 'sum',
-        'registrations': 'sum',
-        'first_recharge': 'sum',
-        'total_amount': 'sum',
-    }).reset_index()
-
-    team_agg['cpr'] = team_agg.apply(lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    team_agg['cpfd'] = team_agg.apply(lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-    team_agg['arppu'] = team_agg.apply(lambda x: x['total_amount'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-    team_agg['roas'] = team_agg.apply(lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+    if not isinstance(base_df['team'].dtype, pd.CategoricalDtype):
+        base_df['team'] = base_df['team'].astype(team_dtype(base_df['team']))
+    team_agg = category_sums(base_df, 'team', TEAM_SUM_COLUMNS)
+
+    team_agg['cpr'] = safe_ratio(team_agg['cost'], team_agg['registrations'])
+    team_agg['cpfd'] = safe_ratio(team_agg['cost'], team_agg['first_recharge'])
+    team_agg['arppu'] = safe_ratio(team_agg['total_amount'], team_agg['first_recharge'])
+    team_agg['roas'] = safe_ratio(team_agg['total_amount'], team_agg['cost'])
 
     # --- KPI Metrics Cards ---
     st.markdown('<div class="section-header"><h3>Team KPI Metrics</h3></div>', unsafe_allow_html=True)
@@ -181,21 +188,21 @@ def render_content(key_prefix="tk"):
         html += f'<th style="padding:8px;text-align:center;border:1px solid #334155">{col}</th>'
     html += '</tr>'
 
-    for _, r in team_agg.iterrows():
-        team = r['team']
+    for r in team_agg.itertuples(index=False):
+        team = r.team
         color = TEAM_COLORS.get(team, '#64748b')
         collab = st.session_state[ss_collab].get(team, 0)
 
         html += f'<tr style="background:#0f172a;color:#e2e8f0;border:1px solid #334155">'
         html += f'<td style="padding:8px;border:1px solid #334155;font-weight:bold;color:{color}">{team}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r["cost"]:,.0f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r["registrations"]:,.0f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r["first_recharge"]:,.0f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">₱{r["total_amount"]:,.0f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r["cpr"]:.2f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r["cpfd"]:.2f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">₱{r["arppu"]:.0f}</td>'
-        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r["roas"]:.2f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r.cost:,.0f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r.registrations:,.0f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r.first_recharge:,.0f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">₱{r.total_amount:,.0f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r.cpr:.2f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">${r.cpfd:.2f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">₱{r.arppu:.0f}</td>'
+        html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{r.roas:.2f}</td>'
         html += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{score_badge(collab)}</td>'
         html += '</tr>'
     html += '</table>'
@@ -205,8 +212,8 @@ def render_content(key_prefix="tk"):
     st.markdown("")
     st.markdown("**Manual Collaboration Scoring (1-4):**")
     cols = st.columns(len(team_agg))
-    for i, (_, r) in enumerate(team_agg.iterrows()):
-        team = r['team']
+    for i, r in enumerate(team_agg.itertuples(index=False)):
+        team = r.team
         with cols[i]:
             current = st.session_state[ss_collab].get(team, 0)
             val = st.selectbox(
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_team_channel_data, refresh_team_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio
 
 TEAM_COLORS = {
     'JASON / SHILA': '#3b82f6',
@@ -22,6 +23,47 @@ TEAM_COLORS = {
     'JP': '#f59e0b',
 }
 
+# Legend/trace order for the team-colored charts, instead of order of first appearance
+TEAM_CATEGORY_ORDERS = {'team': list(TEAM_COLORS)}
+
+
+# Built once per process rather than on every rerun; st.dataframe gets a
+# shallow copy because it adds index entries to the mapping it is given
+LEADERBOARD_COLUMN_CONFIG = {
+    "#": st.column_config.NumberColumn(width="small"),
+    "Channel": st.column_config.TextColumn(width="medium"),
+    "Team": st.column_config.TextColumn(width="medium"),
+    "Cost ($)": st.column_config.NumberColumn(format="$ %.2f"),
+    "Reg": st.column_config.NumberColumn(format="%d"),
+    "1st Rech": st.column_config.NumberColumn(format="%d"),
+    "Amount (₱)": st.column_config.NumberColumn(format="₱ %.0f"),
+    "CPR ($)": st.column_config.NumberColumn(format="$ %.2f"),
+    "CPFD ($)": st.column_config.NumberColumn(format="$ %.2f"),
+    "ROAS": st.column_config.NumberColumn(format="%.2f"),
+}
+
+
+@st.cache_data(ttl=120, show_spinner="Loading Team Channel data...")
+def load_prepared_team_channel_data(data):
+    """
+    load_team_channel_data() plus the channel display name ('short_name',
+    channel without the FB-FB-FB- prefix) on the overall and daily frames,
+    stripped once per load instead of on every rerun and chart. The 'team'
+    column (mapped from channel by the loader) is categorical on both frames,
+    so the team filter compares int8 codes on each without a channel lookup.
+    Keyed on the loaded data, so it never outlives the load it was built from.
+    """
+    data = dict(data)
+    for key in ('overall', 'daily'):
+        df = data.get(key, pd.DataFrame())
+        if not df.empty:
+            df = df.copy()
+            df['short_name'] = df['channel'].str.replace('FB-FB-FB-', '', regex=False)
+            if 'team' in df.columns:
+                df['team'] = df['team'].astype('category')
+            data[key] = df
+    return data
+
 
 def format_currency(v):
     return f"${v:,.2f}" if v else "$0.00"
@@ -36,10 +78,9 @@ def render_content(key_prefix="to"):
         st.warning("Channel ROI is disabled.")
         return
 
-    with st.spinner("Loading Team Channel data..."):
-        data = load_team_channel_data()
-        overall_df = data.get('overall', pd.DataFrame())
-        daily_df = data.get('daily', pd.DataFrame())
+    data = load_prepared_team_channel_data(load_team_channel_data())
+    overall_df = data.get('overall', pd.DataFrame())
+    daily_df = data.get('daily', pd.DataFrame())
 
     if overall_df.empty and daily_df.empty:
         st.error("No Team Channel data available. Check that the sheet exists and has data.")
@@ -48,7 +89,8 @@ def render_content(key_prefix="to"):
     # Inline controls
     ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([2, 1.5, 1.5, 1])
     with ctrl1:
-        teams = sorted(overall_df['team'].unique()) if not overall_df.empty else []
+        # Categories are the sorted distinct teams
+        teams = overall_df['team'].cat.categories if not overall_df.empty else []
         selected_team = st.selectbox("Team Filter", ["All Teams"] + list(teams), key=f"{key_prefix}_team")
     with ctrl4:
         if st.button("Refresh", type="primary", use_container_width=True, key=f"{key_prefix}_refresh"):
@@ -67,9 +109,11 @@ def render_content(key_prefix="to"):
         with ctrl3:
             end_date = st.date_input("To", value=max_date, min_value=min_date, max_value=max_date, key=f"{key_prefix}_to")
 
+        # Compare datetime64 values against day bounds - no per-row date objects
+        dates = daily_df['date']
         filtered_daily = daily_df[
-            (daily_df['date'].dt.date >= start_date) &
-            (daily_df['date'].dt.date <= end_date)
+            (dates >= pd.Timestamp(start_date)) &
+            (dates < pd.Timestamp(end_date) + pd.Timedelta(days=1))
         ]
     else:
         start_date = datetime.now().date() - timedelta(days=30)
@@ -77,12 +121,13 @@ def render_content(key_prefix="to"):
         filtered_daily = pd.DataFrame()
 
     # Apply team filter
-    filtered_overall = overall_df.copy()
+    # Read-only below (charts and the leaderboard copy before adding columns),
+    # so "All Teams" uses the loaded frame as-is
+    filtered_overall = overall_df
     if selected_team != "All Teams":
-        filtered_overall = filtered_overall[filtered_overall['team'] == selected_team]
+        filtered_overall = overall_df[overall_df['team'] == selected_team]
         if has_daily and not filtered_daily.empty:
-            team_channels = overall_df[overall_df['team'] == selected_team]['channel'].unique()
-            filtered_daily = filtered_daily[filtered_daily['channel'].isin(team_channels)]
+            filtered_daily = filtered_daily[filtered_daily['team'] == selected_team]
 
     # HEADER
     n_channels = len(filtered_overall) if not filtered_overall.empty else 0
@@ -130,9 +175,8 @@ def render_content(key_prefix="to"):
         cols = st.columns(3)
         for idx, (_, r) in enumerate(channel_df.iterrows()):
             team = r['team']
-            channel = r['channel']
+            short_name = r['short_name']
             color = TEAM_COLORS.get(team, '#64748b')
-            short_name = channel.replace('FB-FB-FB-', '')
 
             cpr = r['cost'] / r['registrations'] if r['registrations'] > 0 else 0
             cpfd = r['cost'] / r['first_recharge'] if r['first_recharge'] > 0 else 0
@@ -176,10 +220,9 @@ def render_content(key_prefix="to"):
 
     if not filtered_overall.empty:
         chart_df = filtered_overall.copy()
-        chart_df['short_name'] = chart_df['channel'].str.replace('FB-FB-FB-', '', regex=False)
-        chart_df['cpr'] = chart_df.apply(lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-        chart_df['cpfd'] = chart_df.apply(lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        chart_df['roas'] = chart_df.apply(lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+        chart_df['cpr'] = safe_ratio(chart_df['cost'], chart_df['registrations'])
+        chart_df['cpfd'] = safe_ratio(chart_df['cost'], chart_df['first_recharge'])
+        chart_df['roas'] = safe_ratio(chart_df['total_amount'], chart_df['cost'])
 
         inner_tab1, inner_tab2 = st.tabs(["Performance Metrics", "Daily Trends"])
 
@@ -189,7 +232,7 @@ def render_content(key_prefix="to"):
                 fig = px.bar(
                     chart_df.sort_values('cost', ascending=True),
                     x='cost', y='short_name', orientation='h',
-                    color='team', color_discrete_map=TEAM_COLORS,
+                    color='team', color_discrete_map=TEAM_COLORS, category_orders=TEAM_CATEGORY_ORDERS,
                     title='Cost by Channel ($)', text='cost'
                 )
                 fig.update_traces(texttemplate='$%{text:,.0f}', textposition='inside')
@@ -200,7 +243,7 @@ def render_content(key_prefix="to"):
                 fig = px.bar(
                     chart_df.sort_values('first_recharge', ascending=True),
                     x='first_recharge', y='short_name', orientation='h',
-                    color='team', color_discrete_map=TEAM_COLORS,
+                    color='team', color_discrete_map=TEAM_COLORS, category_orders=TEAM_CATEGORY_ORDERS,
                     title='1st Recharge by Channel', text='first_recharge'
                 )
                 fig.update_traces(texttemplate='%{text:,}', textposition='inside')
@@ -213,7 +256,7 @@ def render_content(key_prefix="to"):
                 fig = px.bar(
                     chart_df.sort_values('roas', ascending=True),
                     x='roas', y='short_name', orientation='h',
-                    color='team', color_discrete_map=TEAM_COLORS,
+                    color='team', color_discrete_map=TEAM_COLORS, category_orders=TEAM_CATEGORY_ORDERS,
                     title='ROAS by Channel', text='roas'
                 )
                 fig.update_traces(texttemplate='%{text:.2f}', textposition='inside')
@@ -224,7 +267,7 @@ def render_content(key_prefix="to"):
                 fig = px.bar(
                     chart_df.sort_values('cpfd', ascending=True),
                     x='cpfd', y='short_name', orientation='h',
-                    color='team', color_discrete_map=TEAM_COLORS,
+                    color='team', color_discrete_map=TEAM_COLORS, category_orders=TEAM_CATEGORY_ORDERS,
                     title='CPFD by Channel ($)', text='cpfd'
                 )
                 fig.update_traces(texttemplate='$%{text:.2f}', textposition='inside')
@@ -235,12 +278,8 @@ def render_content(key_prefix="to"):
         with inner_tab2:
             if has_daily and not filtered_daily.empty:
                 daily_agg = filtered_daily.copy()
-                daily_agg['short_name'] = daily_agg['channel'].str.replace('FB-FB-FB-', '', regex=False)
-                daily_agg['date_only'] = daily_agg['date'].dt.date
-                daily_agg['roas'] = daily_agg.apply(
-                    lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-                daily_agg['cpfd'] = daily_agg.apply(
-                    lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+                daily_agg['roas'] = safe_ratio(daily_agg['total_amount'], daily_agg['cost'])
+                daily_agg['cpfd'] = safe_ratio(daily_agg['cost'], daily_agg['first_recharge'])
 
                 metric_choice = st.selectbox("Select Metric",
                     ['cost', 'registrations', 'first_recharge', 'total_amount', 'roas', 'cpfd'],
@@ -250,7 +289,7 @@ def render_content(key_prefix="to"):
                     'total_amount': 'Amount (₱)', 'roas': 'ROAS', 'cpfd': 'CPFD ($)'}
 
                 fig = px.line(
-                    daily_agg, x='date_only', y=metric_choice, color='short_name',
+                    daily_agg, x='date', y=metric_choice, color='short_name',
                     title=f'{metric_labels.get(metric_choice, metric_choice)} Daily Trend',
                     markers=True,
                 )
@@ -265,10 +304,9 @@ def render_content(key_prefix="to"):
 
     if not filtered_overall.empty:
         lb = filtered_overall.copy()
-        lb['short_name'] = lb['channel'].str.replace('FB-FB-FB-', '', regex=False)
-        lb['cpr'] = lb.apply(lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-        lb['cpfd'] = lb.apply(lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        lb['roas'] = lb.apply(lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
+        lb['cpr'] = safe_ratio(lb['cost'], lb['registrations'])
+        lb['cpfd'] = safe_ratio(lb['cost'], lb['first_recharge'])
+        lb['roas'] = safe_ratio(lb['total_amount'], lb['cost'])
         lb = lb.sort_values('roas', ascending=False).reset_index(drop=True)
         lb['rank'] = range(1, len(lb) + 1)
 
@@ -279,18 +317,7 @@ def render_content(key_prefix="to"):
             display_lb,
             use_container_width=True,
             hide_index=True,
-            column_config={
-                "#": st.column_config.NumberColumn(width="small"),
-                "Channel": st.column_config.TextColumn(width="medium"),
-                "Team": st.column_config.TextColumn(width="medium"),
-                "Cost ($)": st.column_config.NumberColumn(format="$ %.2f"),
-                "Reg": st.column_config.NumberColumn(format="%d"),
-                "1st Rech": st.column_config.NumberColumn(format="%d"),
-                "Amount (₱)": st.column_config.NumberColumn(format="₱ %.0f"),
-                "CPR ($)": st.column_config.NumberColumn(format="$ %.2f"),
-                "CPFD ($)": st.column_config.NumberColumn(format="$ %.2f"),
-                "ROAS": st.column_config.NumberColumn(format="%.2f"),
-            },
+            column_config=dict(LEADERBOARD_COLUMN_CONFIG),
             key=f"{key_prefix}_leaderboard",
         )
 
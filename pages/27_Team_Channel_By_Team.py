@@ -4,6 +4,7 @@ Refactored for combined Team page with render_content().
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
@@ -14,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_team_channel_data, refresh_team_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS, KPI_PHP_USD_RATE
+from utils.metrics import safe_ratio, category_sums
 
 TEAM_COLORS = {
     'JASON / SHILA': '#3b82f6',
@@ -24,6 +26,104 @@ TEAM_COLORS = {
 
 TEAM_ORDER = ['JASON / SHILA', 'RON / ADRIAN', 'MIKA / JOMAR', 'JP']
 
+COUNT_COLUMNS = ['registrations', 'first_recharge']
+
+
+# Team Summary card, filled per team with str.format
+TEAM_CARD_HTML = """
+<div style="background:#0f172a; padding:1.5rem; border-radius:12px; border-left:5px solid {color}; margin-bottom:1rem; box-shadow:0 2px 8px rgba(0,0,0,0.3);">
+    <div style="display:flex; justify-content:space-between; align-items:center;">
+        <h3 style="margin:0; color:{color}; font-size:1.2rem;">{team}</h3>
+        <span style="background:{perf_color}; color:white; padding:4px 12px; border-radius:15px; font-size:0.75rem; font-weight:600;">{perf_badge}</span>
+    </div>
+    <p style="margin:4px 0 0 0; font-size:0.8rem; color:#94a3b8;">Channels: {channels}</p>
+    <hr style="margin:10px 0; border-color:#334155;">
+    <div style="display:grid; grid-template-columns:1fr 1fr; gap:8px; font-size:0.85rem; color:#e2e8f0;">
+        <div><span style="color:#94a3b8;">Cost:</span> <strong>${cost:,.2f}</strong></div>
+        <div><span style="color:#94a3b8;">1st Recharge:</span> <strong>{first_recharge:,}</strong></div>
+        <div><span style="color:#94a3b8;">Registrations:</span> <strong>{registrations:,}</strong></div>
+        <div><span style="color:#94a3b8;">Amount:</span> <strong>₱{total_amount:,.0f}</strong></div>
+        <div><span style="color:#94a3b8;">CPFD:</span> <strong>${cpfd:.2f}</strong></div>
+        <div><span style="color:#94a3b8;">ARPPU:</span> <strong>₱{arppu:.2f}</strong></div>
+        <div><span style="color:#94a3b8;">ROAS:</span> <strong style="color:{roas_color}">{roas:.2f}</strong></div>
+    </div>
+</div>
+"""
+
+
+def team_categorical(teams):
+    """
+    teams as an ordered Categorical in TEAM_ORDER (teams the sheet adds later
+    sort after, alphabetically), so sorts and groupbys follow the display
+    order without a per-row lookup and the column is stored as int8 codes.
+    """
+    extra = sorted(set(teams.dropna().unique()) - set(TEAM_ORDER))
+    return teams.astype(pd.CategoricalDtype(TEAM_ORDER + extra, ordered=True))
+
+
+# Leaderboard column types, created at import instead of per rerun
+# (passed as a copy - st.dataframe adds its index entry to the dict)
+LEADERBOARD_COLUMN_CONFIG = {
+    "#": st.column_config.NumberColumn(width="small"),
+    "Team": st.column_config.TextColumn(width="medium"),
+    "Channels": st.column_config.TextColumn(width="medium"),
+    "Cost ($)": st.column_config.NumberColumn(format="$ %.2f"),
+    "Reg": st.column_config.NumberColumn(format="%d"),
+    "1st Rech": st.column_config.NumberColumn(format="%d"),
+    "CPFD ($)": st.column_config.NumberColumn(format="$ %.2f"),
+    "Amount (₱)": st.column_config.NumberColumn(format="₱ %.0f"),
+    "ARPPU (₱)": st.column_config.NumberColumn(format="₱ %.2f"),
+    "ROAS": st.column_config.NumberColumn(format="%.2f"),
+}
+
+
+@st.cache_data(ttl=120, show_spinner="Loading Team Channel data...")
+def load_prepared_team_channel_data(data):
+    """
+    load_team_channel_data() plus this page's per-load prep, done once per
+    load instead of on every rerun: daily rows without a team dropped,
+    promo_team as the ordered team categorical, count columns as int32,
+    and the team -> channel
+    label map ('team_channel_labels'). Keyed on the loaded data, so it never
+    outlives the load it was built from.
+    """
+    data = dict(data)
+    daily_df = data.get('daily', pd.DataFrame())
+    if not daily_df.empty:
+        # daily_df already has 'team' column set by loader; alias to promo_team for
+        # legacy code below that groups/filters on that name.
+        daily_df = daily_df[daily_df['team'].notna()].copy()
+        daily_df['promo_team'] = team_categorical(daily_df['team'])
+        # Counts fit int32; cost/amount stay float64 since float32 drops cents
+        # on six-figure totals
+        daily_df[COUNT_COLUMNS] = daily_df[COUNT_COLUMNS].astype(np.int32)
+        data['daily'] = daily_df
+
+    # Channel labels from the dynamic channel->team mapping
+    team_ch_labels = {}
+    for ch, t in sorted((data.get('channel_to_team') or {}).items()):
+        team_ch_labels.setdefault(t, []).append(ch.replace('FB-FB-FB-', ''))
+    data['team_channel_labels'] = {t: ' / '.join(nums) for t, nums in team_ch_labels.items()}
+    return data
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def team_bar_figure(teams, values, colors, title, xaxis_title, text_fmt):
+    """
+    Horizontal per-team bar with an average line, returned as a plotly dict.
+    Cached on the small (team, value) tuples, so reruns with unchanged filters
+    skip building and validating the go.Figure.
+    """
+    fig = go.Figure(go.Bar(
+        y=list(teams), x=list(values),
+        orientation='h',
+        marker_color=list(colors),
+        text=[text_fmt.format(v) for v in values], textposition='inside', textfont=dict(color='white'),
+    ))
+    fig.add_vline(x=float(np.mean(values)) if values else 0, line_dash="dash", annotation_text="Avg")
+    fig.update_layout(title=title, height=380, xaxis_title=xaxis_title, showlegend=False)
+    return fig.to_dict()
+
 
 def format_currency(v):
     return f"${v:,.2f}" if v else "$0.00"
@@ -38,26 +138,19 @@ def render_content(key_prefix="tc"):
         st.warning("Channel ROI is disabled.")
         return
 
-    with st.spinner("Loading Team Channel data..."):
-        data = load_team_channel_data()
-        team_actual_df = data.get('team_actual', pd.DataFrame())
-        overall_df = data.get('overall', pd.DataFrame())
-        daily_df = data.get('daily', pd.DataFrame())
-        # channel->team map is built dynamically from the sheet's OVERALL section
-        # (see _build_channel_team_map_from_overall in channel_data_loader.py).
-        channel_to_team = data.get('channel_to_team', {}) or {}
+    data = load_prepared_team_channel_data(load_team_channel_data())
+    team_actual_df = data.get('team_actual', pd.DataFrame())
+    overall_df = data.get('overall', pd.DataFrame())
+    daily_df = data.get('daily', pd.DataFrame())
+    # channel->team map is built dynamically from the sheet's OVERALL section
+    # (see _build_channel_team_map_from_overall in channel_data_loader.py).
+    channel_to_team = data.get('channel_to_team', {}) or {}
+    ch_map = data['team_channel_labels']
 
     if overall_df.empty and daily_df.empty:
         st.error("No Team Channel data available. Check the sheet.")
         return
 
-    # daily_df already has 'team' column set by loader; alias to promo_team for
-    # legacy code below that groups/filters on that name.
-    if not daily_df.empty:
-        daily_df = daily_df.copy()
-        daily_df['promo_team'] = daily_df['team']
-        daily_df = daily_df[daily_df['promo_team'].notna()]
-
     # Inline controls
     ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([1.5, 1.5, 1, 1])
     with ctrl3:
@@ -96,9 +189,11 @@ def render_content(key_prefix="tc"):
         st.session_state[ss_start_key] = start_date
         st.session_state[ss_end_key] = end_date
 
+        # Compare datetime64 values against day bounds - no per-row date objects
+        dates = daily_df['date']
         filtered_daily = daily_df[
-            (daily_df['date'].dt.date >= start_date) &
-            (daily_df['date'].dt.date <= end_date)
+            (dates >= pd.Timestamp(start_date)) &
+            (dates < pd.Timestamp(end_date) + pd.Timedelta(days=1))
         ]
     else:
         start_date = datetime.now().date() - timedelta(days=30)
@@ -107,26 +202,17 @@ def render_content(key_prefix="tc"):
 
     # BUILD DATE-FILTERED TEAM AGGREGATES
     if has_daily and not filtered_daily.empty:
-        filtered_team_df = filtered_daily.groupby('promo_team').agg({
-            'cost': 'sum', 'registrations': 'sum', 'first_recharge': 'sum', 'total_amount': 'sum',
-        }).reset_index().rename(columns={'promo_team': 'team'})
-
-        filtered_team_df['cpr'] = filtered_team_df.apply(
-            lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-        filtered_team_df['cpfd'] = filtered_team_df.apply(
-            lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        filtered_team_df['arppu'] = filtered_team_df.apply(
-            lambda x: x['total_amount'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        filtered_team_df['roas'] = filtered_team_df.apply(
-            lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-
-        # Build channel labels from the dynamic channel->team mapping
-        team_ch_labels = {}
-        for ch, t in sorted(channel_to_team.items()):
-            num = ch.replace('FB-FB-FB-', '')
-            team_ch_labels.setdefault(t, []).append(num)
-        ch_map = {t: ' / '.join(nums) for t, nums in team_ch_labels.items()}
-        filtered_team_df['channel_source'] = filtered_team_df['team'].map(ch_map).fillna('')
+        filtered_team_df = category_sums(
+            filtered_daily, 'promo_team', ['cost', 'registrations', 'first_recharge', 'total_amount'],
+        ).rename(columns={'promo_team': 'team'})
+
+        filtered_team_df['cpr'] = safe_ratio(filtered_team_df['cost'], filtered_team_df['registrations'])
+        filtered_team_df['cpfd'] = safe_ratio(filtered_team_df['cost'], filtered_team_df['first_recharge'])
+        filtered_team_df['arppu'] = safe_ratio(filtered_team_df['total_amount'], filtered_team_df['first_recharge'])
+        filtered_team_df['roas'] = safe_ratio(filtered_team_df['total_amount'], filtered_team_df['cost'])
+
+        # team is categorical here; map as plain labels so fillna('') isn't a new category
+        filtered_team_df['channel_source'] = filtered_team_df['team'].astype(object).map(ch_map).fillna('')
 
         filtered_overall = filtered_daily.groupby('channel').agg({
             'cost': 'sum', 'registrations': 'sum', 'first_recharge': 'sum', 'total_amount': 'sum',
@@ -134,14 +220,10 @@ def render_content(key_prefix="tc"):
         filtered_overall['team'] = filtered_overall['channel'].map(channel_to_team)
     else:
         filtered_team_df = team_actual_df.copy() if not team_actual_df.empty else pd.DataFrame(columns=['team', 'cost', 'registrations', 'first_recharge', 'total_amount', 'cpfd', 'arppu', 'roas'])
-        team_ch_labels = {}
-        for ch, t in sorted(channel_to_team.items()):
-            num = ch.replace('FB-FB-FB-', '')
-            team_ch_labels.setdefault(t, []).append(num)
-        ch_map = {t: ' / '.join(nums) for t, nums in team_ch_labels.items()}
         if 'team' in filtered_team_df.columns:
             filtered_team_df['channel_source'] = filtered_team_df['team'].map(ch_map).fillna('')
-        filtered_overall = overall_df.copy()
+        # Read-only below; the channel breakdown copies before adding metrics
+        filtered_overall = overall_df
 
     # HEADER
     date_label = f"{start_date.strftime('%b %d')} – {end_date.strftime('%b %d, %Y')}" if has_daily else ""
@@ -189,71 +271,56 @@ def render_content(key_prefix="tc"):
     # TEAM CARDS
     st.subheader("Team Summary")
     team_sorted = filtered_team_df.copy()
-    team_sorted['sort_order'] = team_sorted['team'].apply(
-        lambda x: TEAM_ORDER.index(x) if x in TEAM_ORDER else 99)
-    team_sorted = team_sorted.sort_values('sort_order').reset_index(drop=True)
+    if not isinstance(team_sorted['team'].dtype, pd.CategoricalDtype):
+        # category_sums() output is already the team categorical in code order;
+        # only the team_actual fallback (plain labels) needs converting and sorting
+        team_sorted['team'] = team_categorical(team_sorted['team'])
+        team_sorted = team_sorted.sort_values('team', kind='stable').reset_index(drop=True)
+
+    # Performance badge per team, picked column-wise before the card loop
+    roas_tiers = [team_sorted['roas'] >= 1, team_sorted['roas'] >= 0.4, team_sorted['roas'] >= 0.25]
+    team_sorted['perf_badge'] = np.select(roas_tiers, ['🏆 Top', '⭐ Good', '📈 Active'], default='⚠️ Low')
+    team_sorted['perf_color'] = np.select(roas_tiers, ['#28a745', '#ffc107', '#17a2b8'], default='#dc3545')
+    team_sorted['roas_color'] = np.select(roas_tiers[:2], ['#22c55e', '#eab308'], default='#ef4444')
 
     cols = st.columns(2)
-    for idx, (_, r) in enumerate(team_sorted.iterrows()):
-        team = r['team']
+    for idx, r in enumerate(team_sorted.itertuples(index=False)):
+        team = r.team
         color = TEAM_COLORS.get(team, '#64748b')
 
-        if r['roas'] >= 1:
-            perf_badge, perf_color = '🏆 Top', '#28a745'
-        elif r['roas'] >= 0.4:
-            perf_badge, perf_color = '⭐ Good', '#ffc107'
-        elif r['roas'] >= 0.25:
-            perf_badge, perf_color = '📈 Active', '#17a2b8'
-        else:
-            perf_badge, perf_color = '⚠️ Low', '#dc3545'
-
         with cols[idx % 2]:
-            st.markdown(f"""
-            <div style="background:#0f172a; padding:1.5rem; border-radius:12px; border-left:5px solid {color}; margin-bottom:1rem; box-shadow:0 2px 8px rgba(0,0,0,0.3);">
-                <div style="display:flex; justify-content:space-between; align-items:center;">
-                    <h3 style="margin:0; color:{color}; font-size:1.2rem;">{team}</h3>
-                    <span style="background:{perf_color}; color:white; padding:4px 12px; border-radius:15px; font-size:0.75rem; font-weight:600;">{perf_badge}</span>
-                </div>
-                <p style="margin:4px 0 0 0; font-size:0.8rem; color:#94a3b8;">Channels: {r['channel_source']}</p>
-                <hr style="margin:10px 0; border-color:#334155;">
-                <div style="display:grid; grid-template-columns:1fr 1fr; gap:8px; font-size:0.85rem; color:#e2e8f0;">
-                    <div><span style="color:#94a3b8;">Cost:</span> <strong>${r['cost']:,.2f}</strong></div>
-                    <div><span style="color:#94a3b8;">1st Recharge:</span> <strong>{int(r['first_recharge']):,}</strong></div>
-                    <div><span style="color:#94a3b8;">Registrations:</span> <strong>{int(r['registrations']):,}</strong></div>
-                    <div><span style="color:#94a3b8;">Amount:</span> <strong>₱{r['total_amount']:,.0f}</strong></div>
-                    <div><span style="color:#94a3b8;">CPFD:</span> <strong>${r['cpfd']:.2f}</strong></div>
-                    <div><span style="color:#94a3b8;">ARPPU:</span> <strong>₱{r['arppu']:.2f}</strong></div>
-                    <div><span style="color:#94a3b8;">ROAS:</span> <strong style="color:{'#22c55e' if r['roas'] >= 1 else '#eab308' if r['roas'] >= 0.4 else '#ef4444'}">{r['roas']:.2f}</strong></div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(TEAM_CARD_HTML.format(
+                team=team, color=color, perf_color=r.perf_color, perf_badge=r.perf_badge,
+                channels=r.channel_source, cost=r.cost, first_recharge=int(r.first_recharge),
+                registrations=int(r.registrations), total_amount=r.total_amount,
+                cpfd=r.cpfd, arppu=r.arppu, roas=r.roas, roas_color=r.roas_color,
+            ), unsafe_allow_html=True)
 
     # PER-CHANNEL BREAKDOWN BY TEAM (columns D-I)
     st.divider()
     st.subheader("Channel Breakdown by Team")
 
-    for team in TEAM_ORDER:
-        if filtered_overall.empty:
-            break
-        if 'team' in filtered_overall.columns:
-            team_ch = filtered_overall[filtered_overall['team'] == team].copy()
+    # Derived metrics per channel, then one split by team instead of a filter scan per team
+    channels_by_team = {}
+    if not filtered_overall.empty:
+        # Sorted by cost once; each team's split keeps that order
+        overall_ch = filtered_overall.sort_values('cost', ascending=False)
+        overall_ch['cpfd'] = safe_ratio(overall_ch['cost'], overall_ch['first_recharge'])
+        overall_ch['arppu'] = safe_ratio(overall_ch['total_amount'], overall_ch['first_recharge'])
+        overall_ch['roas'] = safe_ratio(overall_ch['total_amount'], overall_ch['cost'])
+        if 'team' in overall_ch.columns:
+            team_keys = overall_ch['team']
         else:
-            team_channels = [ch for ch, t in channel_to_team.items() if t == team]
-            team_ch = filtered_overall[filtered_overall['channel'].isin(team_channels)].copy()
-        if team_ch.empty:
+            team_keys = overall_ch['channel'].map(channel_to_team)
+        channels_by_team = dict(tuple(overall_ch.groupby(team_keys, sort=False)))
+
+    for team in TEAM_ORDER:
+        team_ch = channels_by_team.get(team)
+        if team_ch is None or team_ch.empty:
             continue
 
         color = TEAM_COLORS.get(team, '#64748b')
 
-        # Calculate derived metrics per channel
-        team_ch['cpfd'] = team_ch.apply(
-            lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        team_ch['arppu'] = team_ch.apply(
-            lambda x: x['total_amount'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
-        team_ch['roas'] = team_ch.apply(
-            lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-        team_ch = team_ch.sort_values('cost', ascending=False)
-
         # Team header
         st.markdown(f"<h4 style='color:{color}; margin-bottom:0'>{team}</h4>", unsafe_allow_html=True)
 
@@ -269,9 +336,9 @@ def render_content(key_prefix="tc"):
         team_total_fr = 0
         team_total_amt = 0
 
-        for _, ch in team_ch.iterrows():
-            short = ch['channel'].replace('FB-FB-FB-', '')
-            ch_roas = ch['roas']
+        for ch in team_ch.itertuples(index=False):
+            short = ch.channel.replace('FB-FB-FB-', '')
+            ch_roas = ch.roas
             if ch_roas >= 1:
                 roas_style = 'color:#22c55e;font-weight:bold'
             elif ch_roas >= 0.4:
@@ -281,19 +348,19 @@ def render_content(key_prefix="tc"):
 
             tbl += f'<tr style="background:#0f172a;color:#e2e8f0;border:1px solid #334155">'
             tbl += f'<td style="padding:8px;border:1px solid #334155;font-weight:bold">{short}</td>'
-            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">${ch["cost"]:,.2f}</td>'
-            tbl += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{int(ch["registrations"]):,}</td>'
-            tbl += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{int(ch["first_recharge"]):,}</td>'
-            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">₱{ch["total_amount"]:,.0f}</td>'
-            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">₱{ch["arppu"]:,.0f}</td>'
-            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">${ch["cpfd"]:.2f}</td>'
+            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">${ch.cost:,.2f}</td>'
+            tbl += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{int(ch.registrations):,}</td>'
+            tbl += f'<td style="padding:8px;text-align:center;border:1px solid #334155">{int(ch.first_recharge):,}</td>'
+            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">₱{ch.total_amount:,.0f}</td>'
+            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">₱{ch.arppu:,.0f}</td>'
+            tbl += f'<td style="padding:8px;text-align:right;border:1px solid #334155">${ch.cpfd:.2f}</td>'
             tbl += f'<td style="padding:8px;text-align:center;border:1px solid #334155;{roas_style}">{ch_roas:.2f}</td>'
             tbl += '</tr>'
 
-            team_total_cost += ch['cost']
-            team_total_reg += int(ch['registrations'])
-            team_total_fr += int(ch['first_recharge'])
-            team_total_amt += ch['total_amount']
+            team_total_cost += ch.cost
+            team_total_reg += int(ch.registrations)
+            team_total_fr += int(ch.first_recharge)
+            team_total_amt += ch.total_amount
 
         # Subtotal row
         sub_cpfd = team_total_cost / team_total_fr if team_total_fr > 0 else 0
@@ -317,89 +384,42 @@ def render_content(key_prefix="tc"):
     st.divider()
     st.subheader("Team Comparison")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['cost'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"${v:,.0f}" for v in team_sorted['cost']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['cost'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='Total Cost ($)', height=380, xaxis_title="USD", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_cost")
-    with col2:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['first_recharge'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"{int(v):,}" for v in team_sorted['first_recharge']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['first_recharge'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='1st Recharge Count', height=380, xaxis_title="Count", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_fr")
-
-    col1, col2 = st.columns(2)
-    with col1:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['roas'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"{v:.2f}" for v in team_sorted['roas']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['roas'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='ROAS', height=380, xaxis_title="Ratio", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_roas")
-    with col2:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['cpfd'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"${v:.2f}" for v in team_sorted['cpfd']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['cpfd'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='CPFD ($)', height=380, xaxis_title="USD", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_cpfd")
-
-    col1, col2 = st.columns(2)
-    with col1:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['registrations'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"{int(v):,}" for v in team_sorted['registrations']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['registrations'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='Registrations', height=380, xaxis_title="Count", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_reg")
-    with col2:
-        fig = go.Figure(go.Bar(
-            y=team_sorted['team'], x=team_sorted['cpr'],
-            orientation='h',
-            marker_color=[TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']],
-            text=[f"${v:.2f}" for v in team_sorted['cpr']], textposition='inside', textfont=dict(color='white'),
-        ))
-        fig.add_vline(x=team_sorted['cpr'].mean(), line_dash="dash", annotation_text="Avg")
-        fig.update_layout(title='CPR ($)', height=380, xaxis_title="USD", showlegend=False)
-        st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_cmp_cpr")
+    # One color per team bar, looked up once for all six charts
+    team_bar_colors = [TEAM_COLORS.get(t, '#64748b') for t in team_sorted['team']]
+
+    comparison_charts = [
+        ('cost', 'Total Cost ($)', 'USD', '${:,.0f}', 'cmp_cost'),
+        ('first_recharge', '1st Recharge Count', 'Count', '{:,.0f}', 'cmp_fr'),
+        ('roas', 'ROAS', 'Ratio', '{:.2f}', 'cmp_roas'),
+        ('cpfd', 'CPFD ($)', 'USD', '${:.2f}', 'cmp_cpfd'),
+        ('registrations', 'Registrations', 'Count', '{:,.0f}', 'cmp_reg'),
+        ('cpr', 'CPR ($)', 'USD', '${:.2f}', 'cmp_cpr'),
+    ]
+    bar_teams = tuple(team_sorted['team'].astype(str))
+    for i in range(0, len(comparison_charts), 2):
+        for col, (metric, title, xaxis_title, text_fmt, chart_key) in zip(st.columns(2), comparison_charts[i:i + 2]):
+            with col:
+                fig = team_bar_figure(bar_teams, tuple(team_sorted[metric].tolist()), tuple(team_bar_colors),
+                                      title, xaxis_title, text_fmt)
+                st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_{chart_key}")
 
     # Radar chart
     st.subheader("Team Performance Radar")
     metrics = ['cost', 'registrations', 'first_recharge', 'total_amount', 'roas']
     metric_labels = {'cost': 'Cost', 'registrations': 'Reg', 'first_recharge': '1st Rech',
                      'total_amount': 'Amount', 'roas': 'ROAS'}
+    theta = [metric_labels[m] for m in metrics]
 
-    radar_df = team_sorted.copy()
-    for col in metrics:
-        max_val = radar_df[col].max()
-        radar_df[col + '_norm'] = (radar_df[col] / max_val * 100) if max_val > 0 else 0
+    # Each metric as a % of its best team, one matrix divide over all metrics
+    values = team_sorted[metrics].to_numpy(dtype=np.float64)
+    maxes = values.max(axis=0, initial=0)
+    norms = np.where(maxes > 0, values / np.where(maxes > 0, maxes, 1) * 100, 0)
 
     fig = go.Figure()
-    for _, r in radar_df.iterrows():
-        team = r['team']
+    for team, norm_row in zip(team_sorted['team'], norms):
         fig.add_trace(go.Scatterpolar(
-            r=[r.get(f'{m}_norm', 0) for m in metrics],
-            theta=[metric_labels.get(m, m) for m in metrics],
+            r=norm_row.tolist(),
+            theta=theta,
             fill='toself',
             name=team,
             line_color=TEAM_COLORS.get(team, '#64748b'),
@@ -415,12 +435,12 @@ def render_content(key_prefix="tc"):
     st.subheader("Daily Trends by Team")
 
     if has_daily and not filtered_daily.empty:
-        daily_by_team = filtered_daily.groupby(['date', 'promo_team']).agg({
-            'cost': 'sum', 'registrations': 'sum', 'first_recharge': 'sum', 'total_amount': 'sum',
-        }).reset_index()
-        daily_by_team['date_only'] = daily_by_team['date'].dt.date
-        daily_by_team['cpfd'] = daily_by_team.apply(
-            lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+        # Column selection + .sum() runs one cython pass over the four columns
+        # instead of agg({...})'s per-column dispatch
+        daily_by_team = filtered_daily.groupby(['date', 'promo_team'], observed=True)[
+            ['cost', 'registrations', 'first_recharge', 'total_amount']
+        ].sum().reset_index()
+        daily_by_team['cpfd'] = safe_ratio(daily_by_team['cost'], daily_by_team['first_recharge'])
 
         metric_choice = st.selectbox("Select Metric",
             ['cost', 'registrations', 'first_recharge', 'total_amount', 'cpfd'],
@@ -430,9 +450,11 @@ def render_content(key_prefix="tc"):
             'total_amount': 'Amount (₱)', 'cpfd': 'CPFD ($)'}
 
         fig = px.line(
-            daily_by_team, x='date_only', y=metric_choice, color='promo_team',
+            daily_by_team, x='date', y=metric_choice, color='promo_team',
             title=f'{metric_labels_full.get(metric_choice, metric_choice)} Trend by Team',
             markers=True, color_discrete_map=TEAM_COLORS,
+            # promo_team is the ordered team categorical; hand plotly that order
+            category_orders={'promo_team': list(daily_by_team['promo_team'].cat.categories)},
         )
         fig.update_layout(height=400, legend=dict(orientation='h', yanchor='bottom', y=-0.3))
         st.plotly_chart(fig, use_container_width=True, key=f"{key_prefix}_trend_chart")
@@ -443,11 +465,11 @@ def render_content(key_prefix="tc"):
     st.divider()
     st.subheader("Team Leaderboard")
 
-    lb = team_sorted.sort_values('roas', ascending=False).reset_index(drop=True)
-    lb['rank'] = range(1, len(lb) + 1)
-
-    display_lb = lb[['rank', 'team', 'channel_source', 'cost', 'registrations', 'first_recharge',
-                      'cpfd', 'total_amount', 'arppu', 'roas']].copy()
+    # Sort just the shown columns
+    display_lb = team_sorted[['team', 'channel_source', 'cost', 'registrations', 'first_recharge',
+                              'cpfd', 'total_amount', 'arppu', 'roas']]
+    display_lb = display_lb.sort_values('roas', ascending=False, kind='stable').reset_index(drop=True)
+    display_lb.insert(0, 'rank', np.arange(1, len(display_lb) + 1))
     display_lb.columns = ['#', 'Team', 'Channels', 'Cost ($)', 'Reg', '1st Rech',
                            'CPFD ($)', 'Amount (₱)', 'ARPPU (₱)', 'ROAS']
 
@@ -455,18 +477,7 @@ def render_content(key_prefix="tc"):
         display_lb,
         use_container_width=True,
         hide_index=True,
-        column_config={
-            "#": st.column_config.NumberColumn(width="small"),
-            "Team": st.column_config.TextColumn(width="medium"),
-            "Channels": st.column_config.TextColumn(width="medium"),
-            "Cost ($)": st.column_config.NumberColumn(format="$ %.2f"),
-            "Reg": st.column_config.NumberColumn(format="%d"),
-            "1st Rech": st.column_config.NumberColumn(format="%d"),
-            "CPFD ($)": st.column_config.NumberColumn(format="$ %.2f"),
-            "Amount (₱)": st.column_config.NumberColumn(format="₱ %.0f"),
-            "ARPPU (₱)": st.column_config.NumberColumn(format="₱ %.2f"),
-            "ROAS": st.column_config.NumberColumn(format="%.2f"),
-        },
+        column_config=dict(LEADERBOARD_COLUMN_CONFIG),
         key=f"{key_prefix}_lb",
     )
 
@@ -22,6 +22,7 @@ from config import (
     EXCLUDED_FROM_REPORTING,
     SIDEBAR_HIDE_CSS,
 )
+from utils.metrics import safe_ratio
 
 KPI_AGENTS = [t for t in AGENT_PERFORMANCE_TABS if t['agent'].upper() not in EXCLUDED_FROM_REPORTING]
 
@@ -72,12 +73,11 @@ def build_weekly_agent_df(daily_df):
     agg['arppu'] = agg['arppu'].fillna(0)
 
     # Derived metrics
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    cpd = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['roas'] = agg.apply(
-        lambda r: r['arppu'] / KPI_PHP_USD_RATE / (r['cost'] / r['ftd']) if r['ftd'] > 0 and r['cost'] > 0 else 0, axis=1)
-    agg['cvr'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    # cpa > 0 exactly when ftd > 0 and cost > 0
+    agg['roas'] = safe_ratio(agg['arppu'] / KPI_PHP_USD_RATE, agg['cpa'])
+    agg['cvr'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
 
     # Scores
     for metric in ['cpa', 'roas', 'cvr', 'ctr']:
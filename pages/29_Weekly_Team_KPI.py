@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import re
 from channel_data_loader import load_team_channel_data, refresh_team_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio
 
 # Team mapping + colors (same as page 25)
 TEAM_CHANNEL_MAP = {
@@ -66,10 +67,10 @@ def build_weekly_team_df(daily_df, channel_team_map=None):
     ).reset_index()
 
     # Derived metrics
-    agg['cpr'] = agg.apply(lambda r: r['cost'] / r['registrations'] if r['registrations'] > 0 else 0, axis=1)
-    agg['cpfd'] = agg.apply(lambda r: r['cost'] / r['first_recharge'] if r['first_recharge'] > 0 else 0, axis=1)
-    agg['arppu'] = agg.apply(lambda r: r['total_amount'] / r['first_recharge'] if r['first_recharge'] > 0 else 0, axis=1)
-    agg['roas'] = agg.apply(lambda r: r['total_amount'] / r['cost'] if r['cost'] > 0 else 0, axis=1)
+    agg['cpr'] = safe_ratio(agg['cost'], agg['registrations'])
+    agg['cpfd'] = safe_ratio(agg['cost'], agg['first_recharge'])
+    agg['arppu'] = safe_ratio(agg['total_amount'], agg['first_recharge'])
+    agg['roas'] = safe_ratio(agg['total_amount'], agg['cost'])
 
     # Week labels + day counts
     agg['days'] = (agg['date_end'] - agg['date_start']).dt.days + 1
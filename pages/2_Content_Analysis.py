@@ -12,7 +12,7 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import AGENTS, SIDEBAR_HIDE_CSS
+from config import AGENTS, AGENT_NAMES, SIDEBAR_HIDE_CSS
 from data_loader import load_agent_content_data, get_date_range
 
 # Apply shared sidebar hide CSS
@@ -58,7 +58,7 @@ st.sidebar.header("Filters")
 
 selected_agent = st.sidebar.selectbox(
     "Select Agent",
-    ['All Agents'] + [a['name'] for a in AGENTS]
+    ['All Agents'] + list(AGENT_NAMES)
 )
 
 # Data source toggle
@@ -467,7 +467,7 @@ with tab3:
         st.subheader("📊 Theme Distribution by Agent")
 
         agent_themes = []
-        for agent in [a['name'] for a in AGENTS]:
+        for agent in AGENT_NAMES:
             agent_df = df[df['agent_name'] == agent]
             agent_theme_counts = {theme: 0 for theme in themes}
 
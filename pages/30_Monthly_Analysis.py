@@ -21,6 +21,7 @@ from config import (
     EXCLUDED_FROM_REPORTING,
     SIDEBAR_HIDE_CSS,
 )
+from utils.metrics import safe_ratio
 
 AGENTS_LIST = [t['agent'] for t in AGENT_PERFORMANCE_TABS if t['agent'].upper() not in EXCLUDED_FROM_REPORTING]
 
@@ -55,6 +56,13 @@ def build_monthly_data(daily_df):
     df = df.dropna(subset=['date'])
     df['month_key'] = df['date'].dt.to_period('M').astype(str)
 
+    # ARPPU is the last non-zero value per agent per month: with zeros masked
+    # out and rows in date order, that is the groupby 'last' (which skips NaN),
+    # so it rides along in the same pass as the sums
+    arppu = pd.to_numeric(df['arppu'], errors='coerce')
+    df['arppu_nz'] = arppu.where(arppu > 0)
+    df = df.sort_values('date', kind='stable')
+
     agg = df.groupby(['agent', 'month_key']).agg(
         cost=('cost', 'sum'),
         register=('register', 'sum'),
@@ -62,30 +70,22 @@ def build_monthly_data(daily_df):
         impressions=('impressions', 'sum'),
         clicks=('clicks', 'sum'),
         days=('date', 'nunique'),
+        arppu=('arppu_nz', 'last'),
     ).reset_index()
-
-    # ARPPU: last non-zero value per agent per month
-    arppu_rows = []
-    for (agent, mk), grp in df.groupby(['agent', 'month_key']):
-        grp_sorted = grp.sort_values('date')
-        arppu_col = pd.to_numeric(grp_sorted['arppu'], errors='coerce').fillna(0)
-        nonzero = arppu_col[arppu_col > 0]
-        arppu_rows.append({'agent': agent, 'month_key': mk, 'arppu': nonzero.iloc[-1] if len(nonzero) > 0 else 0})
-    agg = agg.merge(pd.DataFrame(arppu_rows), on=['agent', 'month_key'], how='left')
     agg['arppu'] = agg['arppu'].fillna(0)
 
     # Derived metrics
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['cpr'] = agg.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-    agg['conv_rate'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
-    agg['roas'] = agg.apply(
-        lambda r: r['arppu'] / KPI_PHP_USD_RATE / (r['cost'] / r['ftd']) if r['ftd'] > 0 and r['cost'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    agg['cpr'] = safe_ratio(agg['cost'], agg['register'])
+    agg['conv_rate'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
+    agg['roas'] = safe_ratio(agg['arppu'] / KPI_PHP_USD_RATE, agg['cpa'])
 
     # Team assignment
     agg['team'] = agg['agent'].map(TEAM_MAP).fillna('Unknown')
 
-    return agg.sort_values(['agent', 'month_key'])
+    # groupby output is already ordered by (agent, month_key)
+    return agg
 
 
 def build_monthly_channel_data(daily_df):
@@ -109,9 +109,9 @@ def build_monthly_channel_data(daily_df):
         clicks=('clicks', 'sum'),
     ).reset_index()
 
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['conv_rate'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    agg['conv_rate'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
     agg['team'] = agg['channel_clean'].map(CHANNEL_TEAM_MAP).fillna('Unknown')
 
     return agg
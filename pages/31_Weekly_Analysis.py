@@ -22,6 +22,7 @@ from config import (
     EXCLUDED_FROM_REPORTING,
     SIDEBAR_HIDE_CSS,
 )
+from utils.metrics import safe_ratio
 
 st.set_page_config(page_title="Weekly Analysis", page_icon="W", layout="wide")
 st.markdown(SIDEBAR_HIDE_CSS, unsafe_allow_html=True)
@@ -102,12 +103,11 @@ def build_weekly_data(daily_df):
     agg['arppu'] = agg['arppu'].fillna(0)
 
     # Derived metrics
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['cpr'] = agg.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-    agg['conv_rate'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
-    agg['roas'] = agg.apply(
-        lambda r: r['arppu'] / KPI_PHP_USD_RATE / (r['cost'] / r['ftd']) if r['ftd'] > 0 and r['cost'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    agg['cpr'] = safe_ratio(agg['cost'], agg['register'])
+    agg['conv_rate'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
+    agg['roas'] = safe_ratio(agg['arppu'] / KPI_PHP_USD_RATE, agg['cpa'])
 
     agg['team'] = agg['agent'].map(TEAM_MAP).fillna('Unknown')
     agg['week_label'] = agg.apply(lambda r: week_label(r['week_start'], r['week_end']), axis=1)
@@ -138,9 +138,9 @@ def build_weekly_channel_data(daily_df):
         clicks=('clicks', 'sum'),
     ).reset_index()
 
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['conv_rate'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    agg['conv_rate'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
     agg['team'] = agg['channel_clean'].map(CHANNEL_TEAM_MAP).fillna('Unknown')
 
     return agg
@@ -20,6 +20,7 @@ from config import (
     EXCLUDED_FROM_REPORTING,
     SIDEBAR_HIDE_CSS,
 )
+from utils.metrics import safe_ratio
 
 st.set_page_config(page_title="Daily Analysis", page_icon="D", layout="wide")
 st.markdown(SIDEBAR_HIDE_CSS, unsafe_allow_html=True)
@@ -101,12 +102,11 @@ def build_daily_data(daily_df):
     agg['arppu'] = agg['arppu'].fillna(0)
 
     # Derived metrics
-    agg['cpa'] = agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    agg['cpr'] = agg.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-    agg['conv_rate'] = agg.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    agg['ctr'] = agg.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
-    agg['roas'] = agg.apply(
-        lambda r: r['arppu'] / KPI_PHP_USD_RATE / (r['cost'] / r['ftd']) if r['ftd'] > 0 and r['cost'] > 0 else 0, axis=1)
+    agg['cpa'] = safe_ratio(agg['cost'], agg['ftd'])
+    agg['cpr'] = safe_ratio(agg['cost'], agg['register'])
+    agg['conv_rate'] = safe_ratio(agg['ftd'], agg['register'], 100)
+    agg['ctr'] = safe_ratio(agg['clicks'], agg['impressions'], 100)
+    agg['roas'] = safe_ratio(agg['arppu'] / KPI_PHP_USD_RATE, agg['cpa'])
 
     # Ensure ALL agents appear for every date (fill missing with zeros)
     # dedupe — multiple P-tabs can map to the same agent (e.g. P11-Jason2 + P12-Jason both → "Jason")
@@ -310,6 +310,11 @@ def render_teams(daily, sel_date, prev_date):
 
     prev_data = daily[daily['date'] == prev_date] if prev_date else pd.DataFrame()
 
+    # Split both days by team once; the summary and member loops look teams up
+    # instead of filtering the day's rows per team
+    teams_today = dict(tuple(date_data.groupby('team', sort=False)))
+    teams_prev = dict(tuple(prev_data.groupby('team', sort=False))) if not prev_data.empty else {}
+
     # Team summary
     show_metrics = ['cost', 'register', 'ftd', 'cpa', 'conv_rate', 'roas']
 
@@ -320,10 +325,10 @@ def render_teams(daily, sel_date, prev_date):
     html += '</tr>'
 
     for team in TEAM_NAMES:
-        team_data = date_data[date_data['team'] == team]
-        if team_data.empty:
+        team_data = teams_today.get(team)
+        if team_data is None:
             continue
-        prev_team = prev_data[prev_data['team'] == team] if not prev_data.empty else pd.DataFrame()
+        prev_team = teams_prev.get(team)
 
         vals = {
             'cost': team_data['cost'].sum(),
@@ -335,7 +340,7 @@ def render_teams(daily, sel_date, prev_date):
         vals['roas'] = (team_data['arppu'].mean() / KPI_PHP_USD_RATE / vals['cpa']) if vals['cpa'] > 0 else 0
 
         prev_vals = {}
-        if not prev_team.empty:
+        if prev_team is not None:
             prev_vals['cost'] = prev_team['cost'].sum()
             prev_vals['register'] = prev_team['register'].sum()
             prev_vals['ftd'] = prev_team['ftd'].sum()
@@ -361,10 +366,12 @@ def render_teams(daily, sel_date, prev_date):
     st.markdown("#### Team Members")
     member_metrics = ['cost', 'ftd', 'cpa', 'conv_rate', 'roas']
     for team in TEAM_NAMES:
-        team_agents = date_data[date_data['team'] == team]
-        if team_agents.empty:
+        team_agents = teams_today.get(team)
+        if team_agents is None:
             continue
-        prev_team = prev_data[prev_data['team'] == team] if not prev_data.empty else pd.DataFrame()
+        # First previous-day row per agent, looked up by label in the row loop
+        prev_team = teams_prev.get(team)
+        prev_by_agent = prev_team.drop_duplicates('agent').set_index('agent') if prev_team is not None else None
 
         with st.expander(f"{team} ({len(team_agents)} agents)", expanded=True):
             html = '<table style="width:100%;border-collapse:collapse;margin:4px 0">'
@@ -374,8 +381,7 @@ def render_teams(daily, sel_date, prev_date):
             html += '</tr>'
 
             for _, row in team_agents.sort_values('ftd', ascending=False).iterrows():
-                prev_row = prev_team[prev_team['agent'] == row['agent']] if not prev_team.empty else pd.DataFrame()
-                prev = prev_row.iloc[0] if not prev_row.empty else None
+                prev = prev_by_agent.loc[row['agent']] if prev_by_agent is not None and row['agent'] in prev_by_agent.index else None
 
                 html += '<tr style="background:#ffffff;color:#1e293b">'
                 html += f'<td style="{TD};font-weight:600;text-align:left">{row["agent"]}</td>'
@@ -406,9 +412,9 @@ def render_trends(daily, dates):
         register=('register', 'sum'), clicks=('clicks', 'sum'),
         impressions=('impressions', 'sum'),
     ).reset_index().sort_values('date')
-    overall['cpa'] = overall.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-    overall['conv_rate'] = overall.apply(lambda r: r['ftd'] / r['register'] * 100 if r['register'] > 0 else 0, axis=1)
-    overall['ctr'] = overall.apply(lambda r: r['clicks'] / r['impressions'] * 100 if r['impressions'] > 0 else 0, axis=1)
+    overall['cpa'] = safe_ratio(overall['cost'], overall['ftd'])
+    overall['conv_rate'] = safe_ratio(overall['ftd'], overall['register'], 100)
+    overall['ctr'] = safe_ratio(overall['clicks'], overall['impressions'], 100)
     overall['date_label'] = overall['date'].dt.strftime('%b %d')
 
     # Cost (line) + FTD (bar) dual axis
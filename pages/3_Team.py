@@ -4,27 +4,20 @@ import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import SIDEBAR_HIDE_CSS
+from config import COMBINED_PAGE_CSS
 
 st.set_page_config(page_title="Team", page_icon="👥", layout="wide")
 
-st.markdown("""
-<style>
-    .section-header {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-        color: white; padding: 15px; border-radius: 10px; margin: 20px 0 10px 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-st.markdown(SIDEBAR_HIDE_CSS, unsafe_allow_html=True)
+st.markdown(COMBINED_PAGE_CSS, unsafe_allow_html=True)
 
 # Import render functions
 st._is_recharge_import = True
 import importlib.util
 
-
+@st.cache_resource(show_spinner=False)
 def _load_render(filename):
+    """Load render_content from a page file without triggering main().
+    Cached per process so reruns reuse the module instead of re-executing it."""
     path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
     spec = importlib.util.spec_from_file_location(filename.replace('.py', ''), path)
     mod = importlib.util.module_from_spec(spec)
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_fb_channel_data, load_google_channel_data, refresh_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio
 
 st.set_page_config(page_title="Recharge Statistics", page_icon="💰", layout="wide")
 
@@ -280,11 +281,11 @@ def main():
 
         def _add_derived_cols(agg_df):
             """Add CPR, Cost/FTD, Conv%, ROAS, ARPPU to an aggregated df."""
-            agg_df['cpr'] = agg_df.apply(lambda r: r['cost'] / r['register'] if r['register'] > 0 else 0, axis=1)
-            agg_df['cost_ftd'] = agg_df.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-            agg_df['conv_rate'] = agg_df.apply(lambda r: (r['ftd'] / r['register'] * 100) if r['register'] > 0 else 0, axis=1)
-            agg_df['arppu'] = agg_df.apply(lambda r: r['ftd_recharge'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
-            agg_df['roas'] = agg_df.apply(lambda r: (r['arppu'] / 57.7 / r['cost_ftd']) if r['cost_ftd'] > 0 else 0, axis=1)
+            agg_df['cpr'] = safe_ratio(agg_df['cost'], agg_df['register'])
+            agg_df['cost_ftd'] = safe_ratio(agg_df['cost'], agg_df['ftd'])
+            agg_df['conv_rate'] = safe_ratio(agg_df['ftd'], agg_df['register'], 100)
+            agg_df['arppu'] = safe_ratio(agg_df['ftd_recharge'], agg_df['ftd'])
+            agg_df['roas'] = safe_ratio(agg_df['arppu'] / 57.7, agg_df['cost_ftd'])
             return agg_df
 
         def _weekly_agg(daily_df):
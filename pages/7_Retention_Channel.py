@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_fb_channel_data, load_google_channel_data, refresh_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio
 
 _PAGE_CSS = """
 <style>
@@ -109,22 +110,23 @@ def render_content(fb_df, google_df, show_fb, show_google, date_from, date_to,
     # Daily trend
     st.markdown('<div class="section-header"><h3>DAILY TREND</h3></div>', unsafe_allow_html=True)
 
+    # Day buckets stay datetime64 (floor) rather than object datetime.date values
     chart_data = []
     if show_fb:
-        fb_daily = fb_df.groupby(fb_df['date'].dt.date).agg({'cost': 'sum', 'ftd': 'sum', 'ftd_recharge': 'sum'}).reset_index()
+        fb_daily = fb_df.groupby(fb_df['date'].dt.floor('D')).agg({'cost': 'sum', 'ftd': 'sum', 'ftd_recharge': 'sum'}).reset_index()
         fb_daily['channel'] = 'Facebook'
         fb_daily.columns = ['date', 'cost', 'ftd', 'ftd_recharge', 'channel']
         chart_data.append(fb_daily)
 
     if show_google:
-        g_daily = google_df.groupby(google_df['date'].dt.date).agg({'cost': 'sum', 'ftd': 'sum', 'ftd_recharge': 'sum'}).reset_index()
+        g_daily = google_df.groupby(google_df['date'].dt.floor('D')).agg({'cost': 'sum', 'ftd': 'sum', 'ftd_recharge': 'sum'}).reset_index()
         g_daily['channel'] = 'Google'
         g_daily.columns = ['date', 'cost', 'ftd', 'ftd_recharge', 'channel']
         chart_data.append(g_daily)
 
     if chart_data:
         combined = pd.concat(chart_data, ignore_index=True)
-        combined['cost_ftd'] = combined.apply(lambda x: x['cost'] / x['ftd'] if x['ftd'] > 0 else 0, axis=1)
+        combined['cost_ftd'] = safe_ratio(combined['cost'], combined['ftd'])
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -177,7 +179,7 @@ def render_content(fb_df, google_df, show_fb, show_google, date_from, date_to,
 
     if weekly_data:
         weekly_combined = pd.concat(weekly_data, ignore_index=True).sort_values('week_sort')
-        weekly_combined['cost_ftd'] = weekly_combined.apply(lambda x: x['cost'] / x['ftd'] if x['ftd'] > 0 else 0, axis=1)
+        weekly_combined['cost_ftd'] = safe_ratio(weekly_combined['cost'], weekly_combined['ftd'])
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -220,7 +222,7 @@ def render_content(fb_df, google_df, show_fb, show_google, date_from, date_to,
 
     if monthly_data:
         monthly_combined = pd.concat(monthly_data, ignore_index=True).sort_values('month')
-        monthly_combined['cost_ftd'] = monthly_combined.apply(lambda x: x['cost'] / x['ftd'] if x['ftd'] > 0 else 0, axis=1)
+        monthly_combined['cost_ftd'] = safe_ratio(monthly_combined['cost'], monthly_combined['ftd'])
 
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -331,14 +333,17 @@ def main():
         st.subheader("Channel Filter")
         channel_filter = st.selectbox("Select Channel", ["All", "Facebook", "Google"])
 
+    # One half-open [From, To + 1 day) window shared by the daily and roll-back frames
+    range_start = pd.Timestamp(date_from)
+    range_end = pd.Timestamp(date_to) + pd.Timedelta(days=1)
     if has_fb:
-        fb_df = fb_df[(fb_df['date'].dt.date >= date_from) & (fb_df['date'].dt.date <= date_to)]
+        fb_df = fb_df[(fb_df['date'] >= range_start) & (fb_df['date'] < range_end)]
     if has_google:
-        google_df = google_df[(google_df['date'].dt.date >= date_from) & (google_df['date'].dt.date <= date_to)]
+        google_df = google_df[(google_df['date'] >= range_start) & (google_df['date'] < range_end)]
     if not fb_rb_df.empty:
-        fb_rb_df = fb_rb_df[(fb_rb_df['date'].dt.date >= date_from) & (fb_rb_df['date'].dt.date <= date_to)]
+        fb_rb_df = fb_rb_df[(fb_rb_df['date'] >= range_start) & (fb_rb_df['date'] < range_end)]
     if not google_rb_df.empty:
-        google_rb_df = google_rb_df[(google_rb_df['date'].dt.date >= date_from) & (google_rb_df['date'].dt.date <= date_to)]
+        google_rb_df = google_rb_df[(google_rb_df['date'] >= range_start) & (google_rb_df['date'] < range_end)]
 
     show_fb = channel_filter in ["All", "Facebook"] and has_fb and not fb_df.empty
     show_google = channel_filter in ["All", "Google"] and has_google and not google_df.empty
@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from channel_data_loader import load_team_channel_data, refresh_team_channel_data
 from config import CHANNEL_ROI_ENABLED, SIDEBAR_HIDE_CSS
+from utils.metrics import safe_ratio
 
 st.set_page_config(page_title="Team Channel Performance", page_icon="📊", layout="wide")
 
@@ -133,10 +134,8 @@ def render_team_comparison(overall_df):
         'total_amount': 'sum',
     }).reset_index()
 
-    team_agg['cpr'] = team_agg.apply(
-        lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    team_agg['cpfd'] = team_agg.apply(
-        lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+    team_agg['cpr'] = safe_ratio(team_agg['cost'], team_agg['registrations'])
+    team_agg['cpfd'] = safe_ratio(team_agg['cost'], team_agg['first_recharge'])
 
     # Bar chart for key metrics
     col1, col2 = st.columns(2)
@@ -204,10 +203,8 @@ def render_channel_breakdown(overall_df):
         'arppu': 'mean',
     }).reset_index()
 
-    channel_agg['cpr'] = channel_agg.apply(
-        lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    channel_agg['cpfd'] = channel_agg.apply(
-        lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+    channel_agg['cpr'] = safe_ratio(channel_agg['cost'], channel_agg['registrations'])
+    channel_agg['cpfd'] = safe_ratio(channel_agg['cost'], channel_agg['first_recharge'])
 
     col1, col2 = st.columns(2)
 
@@ -282,12 +279,9 @@ def render_daily_trends(daily_df):
         'total_amount': 'sum',
     }).reset_index()
 
-    daily['roas'] = daily.apply(
-        lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-    daily['cpr'] = daily.apply(
-        lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    daily['cpfd'] = daily.apply(
-        lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+    daily['roas'] = safe_ratio(daily['total_amount'], daily['cost'])
+    daily['cpr'] = safe_ratio(daily['cost'], daily['registrations'])
+    daily['cpfd'] = safe_ratio(daily['cost'], daily['first_recharge'])
 
     col1, col2 = st.columns(2)
 
@@ -367,12 +361,9 @@ def render_weekly_summary(daily_df):
         'total_amount': 'sum',
     }).reset_index()
 
-    weekly['roas'] = weekly.apply(
-        lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-    weekly['cpr'] = weekly.apply(
-        lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    weekly['cpfd'] = weekly.apply(
-        lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+    weekly['roas'] = safe_ratio(weekly['total_amount'], weekly['cost'])
+    weekly['cpr'] = safe_ratio(weekly['cost'], weekly['registrations'])
+    weekly['cpfd'] = safe_ratio(weekly['cost'], weekly['first_recharge'])
 
     col1, col2 = st.columns(2)
 
@@ -441,12 +432,9 @@ def render_monthly_summary(daily_df):
         'total_amount': 'sum',
     }).reset_index()
 
-    monthly['roas'] = monthly.apply(
-        lambda x: x['total_amount'] / x['cost'] if x['cost'] > 0 else 0, axis=1)
-    monthly['cpr'] = monthly.apply(
-        lambda x: x['cost'] / x['registrations'] if x['registrations'] > 0 else 0, axis=1)
-    monthly['cpfd'] = monthly.apply(
-        lambda x: x['cost'] / x['first_recharge'] if x['first_recharge'] > 0 else 0, axis=1)
+    monthly['roas'] = safe_ratio(monthly['total_amount'], monthly['cost'])
+    monthly['cpr'] = safe_ratio(monthly['cost'], monthly['registrations'])
+    monthly['cpfd'] = safe_ratio(monthly['cost'], monthly['first_recharge'])
 
     col1, col2 = st.columns(2)
 
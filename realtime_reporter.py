@@ -45,13 +45,14 @@ def get_latest_date_data():
             print("[WARNING] No P-tab daily data available")
             return None, None
 
-        # Get latest date
-        daily_df = daily_df.copy()
-        daily_df['date_only'] = pd.to_datetime(daily_df['date']).dt.date
-        latest_date = daily_df['date_only'].max()
+        # Get latest date - compared as datetime64 days rather than per-row
+        # date objects, and without copying the whole frame first
+        days = pd.to_datetime(daily_df['date']).dt.floor('D')
+        latest_day = days.max()
+        latest_date = latest_day.date()
 
         # Filter for latest date
-        latest_data = daily_df[daily_df['date_only'] == latest_date]
+        latest_data = daily_df[(days == latest_day).to_numpy()]
 
         # Exclude boss accounts
         if EXCLUDED_PERSONS:
@@ -35,6 +35,7 @@ from config import (
     TELEGRAM_MENTIONS,
     EXCLUDED_FROM_DAILY_MENTIONS,
 )
+from utils.metrics import safe_ratio
 from telegram_reporter import TelegramReporter
 from realtime_reporter import generate_dashboard_screenshot, generate_dashboard_screenshots_3part
 
@@ -251,7 +252,7 @@ def build_album_caption(daily_df, target_date):
 
     # Top performer by FTD + best CPA
     agent_agg = t1.groupby('agent').agg(ftd=('ftd', 'sum'), cost=('cost', 'sum')).reset_index()
-    agent_agg['cpa'] = agent_agg.apply(lambda r: r['cost'] / r['ftd'] if r['ftd'] > 0 else 0, axis=1)
+    agent_agg['cpa'] = safe_ratio(agent_agg['cost'], agent_agg['ftd'])
     top_ftd = agent_agg.sort_values('ftd', ascending=False).iloc[0] if len(agent_agg) > 0 else None
     best_cpa = agent_agg[agent_agg['cpa'] > 0].sort_values('cpa').iloc[0] if (agent_agg['cpa'] > 0).any() else None
 
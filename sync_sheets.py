@@ -188,8 +188,8 @@ def sync_content_data(gc, spreadsheet, agent_config, session):
             print(f"  Agent {agent_name} not found in database")
             return 0
 
-        count = 0
-        # Process data rows (starting from row 2, row 1 is header)
+        # Collect valid rows first (starting from row 2, row 1 is header)
+        pending = []
         for row in data[1:]:
             if not row or len(row) < 3:
                 continue
@@ -198,24 +198,35 @@ def sync_content_data(gc, spreadsheet, agent_config, session):
             if not date:
                 continue
 
-            content_type = row[1] if len(row) > 1 else None
             primary_content = row[2] if len(row) > 2 else None
 
             if not primary_content:
                 continue
 
-            # Compute content hash
-            content_hash = analyzer.compute_hash(primary_content)
+            pending.append((row, date, primary_content))
 
-            # Check if exact record exists (same agent, date, hash)
-            existing = session.query(AdContent).filter_by(
-                agent_id=agent.id,
-                date=date,
-                content_hash=content_hash
-            ).first()
+        # Compute content hashes in one batch
+        content_hashes = analyzer.compute_hashes([content for _, _, content in pending])
 
-            if existing:
-                continue  # Skip duplicates
+        # Existing (date, hash) pairs for this agent in one SELECT instead of a query per row
+        existing = set()
+        if pending:
+            existing = {
+                (row_date, bytes(row_hash))
+                for row_date, row_hash in session.query(AdContent.date, AdContent.content_hash).filter(
+                    AdContent.agent_id == agent.id,
+                    AdContent.content_hash.in_(set(content_hashes))
+                )
+            }
+
+        count = 0
+        for (row, date, primary_content), content_hash in zip(pending, content_hashes):
+            content_type = row[1] if len(row) > 1 else None
+
+            # Skip exact duplicates (same agent, date, hash), including repeats within this sheet
+            if (date, content_hash) in existing:
+                continue
+            existing.add((date, content_hash))
 
             # Create new record
             record = AdContent(
@@ -6,6 +6,20 @@ import os
 import requests
 import streamlit as st
 
+# orjson encodes the (often ~10 KB HTML) report payloads much faster than stdlib json
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
 
 def get_telegram_config():
     """Get Telegram credentials from Streamlit secrets or environment"""
@@ -58,7 +72,7 @@ class TelegramReporter:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=30)
+            response = requests.post(url, data=_dumps(payload), headers=JSON_HEADERS, timeout=30)
             result = response.json()
 
             if not result.get('ok'):
@@ -104,8 +118,6 @@ class TelegramReporter:
         Returns:
             dict: Telegram API response
         """
-        import json as _json
-
         url = f"{self.base_url}/sendMediaGroup"
 
         media = []
@@ -126,7 +138,7 @@ class TelegramReporter:
 
             response = requests.post(
                 url,
-                data={"chat_id": self.chat_id, "media": _json.dumps(media)},
+                data={"chat_id": self.chat_id, "media": _dumps(media).decode('utf-8')},
                 files=files,
                 timeout=60,
             )
@@ -0,0 +1,50 @@
+"""
+Metric helpers for BINGO365 Monitoring
+Derived ad metrics (CPR, CPFD, ARPPU, ROAS, CTR...) computed column-wise
+"""
+import numpy as np
+import pandas as pd
+
+
+def safe_ratio(num, den, scale=1.0):
+    """
+    num / den * scale element-wise, 0 where den is not positive.
+    One masked np.divide over the columns instead of a row-wise apply.
+
+    Args:
+        num, den: Series (or array-likes) of equal length
+        scale: multiplier, e.g. 100 for percentages
+
+    Returns:
+        float64 ndarray
+    """
+    num = np.asarray(num, dtype=np.float64)
+    den = np.asarray(den, dtype=np.float64)
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0) * scale
+
+
+def category_sums(df, key_col, value_cols):
+    """
+    Per-category sums of value_cols for a categorical key_col, one np.bincount
+    over the category codes per column instead of a generic groupby.
+
+    Matches groupby(key_col, observed=True)[value_cols].sum(): categories with
+    no rows and rows with a missing key are dropped, NaN values count as 0,
+    integer columns come back as int64 (narrow inputs can't overflow) and
+    rows come out in category order.
+
+    Returns:
+        DataFrame with key_col (same categorical dtype) and one column per value_col
+    """
+    key = df[key_col]
+    codes = key.cat.codes.to_numpy()
+    has_key = codes >= 0
+    codes = codes[has_key]
+    n = len(key.cat.categories)
+    sums = {}
+    for col in value_cols:
+        values = df[col].to_numpy()[has_key]
+        total = np.bincount(codes, weights=np.nan_to_num(values.astype(np.float64)), minlength=n)
+        sums[col] = total.astype(np.int64) if np.issubdtype(values.dtype, np.integer) else total
+    out = pd.DataFrame({key_col: pd.Categorical(key.cat.categories, dtype=key.dtype), **sums})
+    return out[np.bincount(codes, minlength=n) > 0].reset_index(drop=True)
@@ -47,13 +47,17 @@ class ContentAnalyzer:
             'game': ['game', 'laro', 'bingo', 'slots'],
         }
 
-    def compute_hash(self, text: str) -> str:
-        """Compute hash for content deduplication"""
+    def compute_hash(self, text: str) -> bytes:
+        """Compute hash (raw 32-byte SHA256 digest) for content deduplication"""
         if not text:
-            return ""
+            return b""
         # Normalize text before hashing
         normalized = self.normalize_text(text)
-        return hashlib.sha256(normalized.encode()).hexdigest()
+        return hashlib.sha256(normalized.encode()).digest()
+
+    def compute_hashes(self, texts: List[str]) -> List[bytes]:
+        """Compute content hashes for a batch of texts (same values as compute_hash)"""
+        return [self.compute_hash(t) for t in texts]
 
     def normalize_text(self, text: str) -> str:
         """Normalize text for comparison"""
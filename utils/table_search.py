@@ -0,0 +1,170 @@
+"""
+Table search helpers for BINGO365 Monitoring
+Filters display tables by a free-text search across all columns
+and by filter-widget selections
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# pyarrow ships with streamlit; fall back to pandas string ops if it is missing
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    USE_ARROW = True
+except ImportError:
+    USE_ARROW = False
+
+
+# Joins the columns of a row into one haystack; never typed into a search box,
+# so a match can't span two cells
+HAYSTACK_SEP = '\x1f'
+
+
+def build_search_table(df):
+    """
+    Build an Arrow table with one 'haystack' column - each row's stringified
+    cells joined by HAYSTACK_SEP and lowercased once here - so a search is a
+    single plain (case-sensitive, non-regex) substring kernel.
+    Returns None when pyarrow is unavailable.
+    """
+    if not USE_ARROW:
+        return None
+    columns = [pa.array(df[col].astype(str).tolist(), type=pa.string()) for col in df.columns]
+    if not columns:
+        return pa.table({'haystack': pa.array([''] * len(df), type=pa.string())})
+    if len(columns) == 1:
+        haystack = columns[0]
+    else:
+        haystack = pc.binary_join_element_wise(*columns, HAYSTACK_SEP)
+    return pa.table({'haystack': pc.utf8_lower(haystack)})
+
+
+# Rows sent to the browser unless the user asks for all of them
+DISPLAY_ROW_LIMIT = 2000
+
+
+def column_config_for(df):
+    """Explicit Text/Number column types for st.dataframe, so object columns aren't re-inferred."""
+    return {
+        col: st.column_config.NumberColumn(col) if pd.api.types.is_numeric_dtype(df[col])
+        else st.column_config.TextColumn(col)
+        for col in df.columns
+    }
+
+
+def stripped_value_mask(series, values):
+    """
+    Boolean mask of rows whose stripped value is in values. Works on the
+    categorical codes: the strip runs once per distinct value and the per-row
+    test is an integer isin instead of an object-dtype comparison.
+    """
+    cat = series.astype('category')
+    keep = np.flatnonzero(cat.cat.categories.astype(str).str.strip().isin(list(values)))
+    return np.isin(cat.cat.codes.to_numpy(), keep)
+
+
+@st.cache_resource(max_entries=16, ttl=600, show_spinner=False)
+def cached_search_table(df):
+    """
+    build_search_table(df) memoized on the frame's content hash, so reruns
+    triggered by typing in a search box reuse the stringified columns.
+    Arrow tables are immutable, so sharing them across sessions is safe.
+    """
+    return build_search_table(df)
+
+
+@st.cache_resource(max_entries=16, ttl=600, show_spinner=False)
+def cached_display_table(df):
+    """
+    df converted to an Arrow table once, so st.dataframe gets Arrow directly and
+    search results are a table.filter() instead of re-serializing a pandas slice.
+    Returns None when pyarrow is unavailable or a column can't be converted.
+    """
+    if not USE_ARROW:
+        return None
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def search_rows_mask(df, search, search_table=None):
+    """
+    Boolean mask of rows where any column contains the search text (case-insensitive).
+    Uses one Arrow match_substring pass over the joined, lowercased haystack when available,
+    otherwise a vectorized str.contains per column - never a per-row apply.
+
+    Args:
+        df: DataFrame to search
+        search: literal text to look for
+        search_table: optional prebuilt build_search_table(df); defaults to the
+            cached table for df
+    """
+    if not search:
+        return np.zeros(len(df), dtype=bool)
+
+    if USE_ARROW:
+        if df.shape[1] == 0 or HAYSTACK_SEP in search:
+            return np.zeros(len(df), dtype=bool)
+        table = search_table if search_table is not None else cached_search_table(df)
+        # Haystack is pre-lowercased; ignore_case=True would route through the regex engine
+        mask = pc.match_substring(table.column('haystack'), search.lower())
+        return np.asarray(mask, dtype=bool)
+
+    mask = np.zeros(len(df), dtype=bool)
+    for col in df.columns:
+        mask |= df[col].astype(str).str.contains(search, case=False, regex=False, na=False).to_numpy()
+    return mask
+
+
+def filter_rows_containing(df, search, search_table=None):
+    """Return the rows of df matching search in any column (all rows if search is empty)"""
+    if not search:
+        return df
+    return df[search_rows_mask(df, search, search_table)]
+
+
+@st.fragment
+def render_searchable_table(display_df, total_records, key_prefix, table_key, height=500):
+    """
+    Search box + dataframe + caption as a fragment, so typing in the search box
+    reruns only this block instead of the whole page (loaders, charts).
+    text_input only commits on Enter/blur, so there is no per-keystroke rerun to debounce.
+
+    Args:
+        display_df: formatted DataFrame to show
+        total_records: record count for the "Showing X of Y" caption
+        key_prefix: widget key prefix of the calling page
+        table_key: key suffix for the dataframe widget
+    """
+    search = st.text_input("Search", placeholder="Type to search across all columns...", key=f"{key_prefix}_search")
+
+    table = cached_display_table(display_df)
+    if table is not None:
+        if search:
+            # Reruns from other widgets keep the same term - reuse the last filtered
+            # table for this (cached) base table instead of rescanning it
+            last_key = f"{key_prefix}_{table_key}_last_search"
+            last = st.session_state.get(last_key)
+            if last is not None and last[0] == search and last[1] is table:
+                table = last[2]
+            else:
+                filtered = table.filter(pa.array(search_rows_mask(display_df, search)))
+                st.session_state[last_key] = (search, table, filtered)
+                table = filtered
+        shown = table.num_rows
+    else:
+        table = filter_rows_containing(display_df, search)
+        shown = len(table)
+
+    # Large results only ship the first DISPLAY_ROW_LIMIT rows unless asked for all
+    truncated = False
+    if shown > DISPLAY_ROW_LIMIT and not st.checkbox(f"Show all {shown:,} rows", key=f"{key_prefix}_{table_key}_all"):
+        table = table.head(DISPLAY_ROW_LIMIT) if isinstance(table, pd.DataFrame) else table.slice(0, DISPLAY_ROW_LIMIT)
+        truncated = True
+
+    st.dataframe(table, use_container_width=True, hide_index=True, height=height,
+                 column_config=column_config_for(display_df), key=f"{key_prefix}_{table_key}")
+    st.caption(f"Showing {shown} of {total_records} records"
+               + (f" (first {DISPLAY_ROW_LIMIT:,} displayed)" if truncated else ""))